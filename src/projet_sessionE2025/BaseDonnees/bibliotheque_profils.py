@@ -0,0 +1,312 @@
+import os
+import struct
+
+import numpy as np
+
+from projet_sessionE2025.BaseDonnees.gestion_base import Dossier_data
+from projet_sessionE2025.BaseDonnees.index_profils import indexer_fichier
+
+"""
+Module : bibliotheque_profils
+
+Lecture/écriture des coordonnées de profils, au format texte .dat (XFOIL) et dans une bibliothèque binaire.
+
+Fichiers .dat
+    ``lire_dat`` et ``ecrire_dat`` sont les seules fonctions qui analysent ou produisent le format .dat
+    (nom sur la première ligne, puis un couple x y par ligne ; le format Lednicer est aussi accepté en lecture) ;
+    elles remplacent les lectures manuelles ligne par ligne de l'application.
+
+Bibliothèque binaire (.bin)
+    Tous les profils d'une bibliothèque (UIUC, AirfoilTools...) sont rangés dans un seul fichier :
+
+    - en-tête fixe : signature, version, type des coordonnées (float32/float64), nombre de profils,
+      nombre total de points, position de la table ;
+    - bloc des coordonnées : les tableaux (N, 2) de tous les profils, bout à bout ;
+    - table : pour chaque profil, son nom, l'indice de son premier point et son nombre de points.
+
+    Le fichier est ouvert avec ``np.memmap`` : l'ouverture ne lit que l'en-tête et la table, et chaque profil
+    est une vue sans copie sur le fichier. Le chargement d'une bibliothèque de plusieurs milliers de profils
+    prend quelques millisecondes et une mémoire constante.
+
+    Un ajout n'écrit qu'après la fin du fichier (nouvelles coordonnées, puis nouvelle table), puis réécrit
+    l'en-tête en dernier : une interruption en cours d'ajout laisse la bibliothèque précédente intacte.
+    L'ancienne table reste en place dans le bloc des coordonnées, sans être référencée (``ecrire_bibliotheque``
+    produit un fichier compact). Remplacer un profil suit le même chemin : ses nouvelles coordonnées sont
+    ajoutées et sa ligne de la table pointe vers elles.
+"""
+
+fichier_bibliotheque = os.path.join(Dossier_data, "bibliotheque_profils.bin")
+
+_SIGNATURE = b"PROFBIB1"
+_ENTETE = struct.Struct("<8sIIQQQ")  # signature, version, octets par valeur, nb profils, nb points, position table
+_VERSION = 1
+_TAILLE_NOM = 64
+_DTYPE_TABLE = np.dtype([("nom", f"S{_TAILLE_NOM}"), ("debut", "<u8"), ("n", "<u4"), ("_reserve", "<u4")])
+
+
+def analyser_dat(texte):
+    """
+    Analyse le contenu d'un fichier de coordonnées au format Selig ou Lednicer.
+
+    Format Selig : nom, puis les points du bord de fuite à l'extrados jusqu'au bord d'attaque et retour par
+    l'intrados. Format Lednicer : nom, ligne « nb_extrados nb_intrados », puis extrados et intrados décrits
+    tous deux du bord d'attaque vers le bord de fuite ; il est converti dans l'ordre Selig.
+    Les lignes non numériques (nom, lignes vides) sont ignorées.
+
+    Args:
+        texte (str): Contenu du fichier.
+
+    Returns:
+        tuple[str, np.ndarray]: (nom lu sur la première ligne, coordonnées float64 (N, 2) dans l'ordre Selig).
+    """
+    nom = ""
+    valeurs = []
+    for i, ligne in enumerate(texte.splitlines()):
+        parties = ligne.split()
+        if len(parties) == 2:
+            try:
+                valeurs.append((float(parties[0]), float(parties[1])))
+                continue
+            except ValueError:
+                pass
+        if i == 0:
+            nom = ligne.strip()
+    coords = np.asarray(valeurs, dtype=np.float64).reshape(-1, 2)
+
+    # Lednicer : la première ligne numérique donne le nombre de points de chaque surface
+    if len(coords) and coords[0, 0] > 1.5 and coords[0, 1] > 1.5:
+        n_extrados, n_intrados = int(coords[0, 0]), int(coords[0, 1])
+        extrados = coords[1:1 + n_extrados]
+        intrados = coords[1 + n_extrados:1 + n_extrados + n_intrados]
+        if len(intrados) and np.allclose(intrados[0], extrados[0]):
+            intrados = intrados[1:]  # bord d'attaque commun aux deux surfaces
+        coords = np.vstack((extrados[::-1], intrados))
+    return nom, coords
+
+
+def lire_dat(chemin):
+    """
+    Lit un fichier de coordonnées .dat (format Selig ou Lednicer, voir ``analyser_dat``).
+
+    Args:
+        chemin (str): Fichier .dat.
+
+    Returns:
+        tuple[str, np.ndarray]: (nom lu sur la première ligne, coordonnées float64 (N, 2)).
+    """
+    with open(chemin, "r", encoding="utf-8", errors="ignore") as f:
+        return analyser_dat(f.read())
+
+
+def ecrire_dat(chemin, coordonnees, nom="profil", corde=1.0, indexer=True):
+    """
+    Écrit des coordonnées au format .dat compatible XFOIL/AirfoilTools et les déclare à l'index de la base.
+
+    Args:
+        chemin (str): Fichier de sortie.
+        coordonnees (array-like): Coordonnées (N, 2), dans l'ordre du contour.
+        nom (str, optional): Nom écrit en première ligne.
+        corde (float, optional): Les coordonnées sont divisées par cette valeur (ramenées à une corde unité).
+        indexer (bool, optional): Déclare le fichier à l'index et au catalogue (False pour un import par lot,
+            qui les met à jour en une seule fois).
+
+    Returns:
+        str: Chemin du fichier écrit.
+    """
+    coords = np.asarray(coordonnees, dtype=np.float64).reshape(-1, 2) / corde
+    np.savetxt(chemin, coords, fmt="%.6f", header=str(nom), comments="")
+    if indexer:
+        indexer_fichier(chemin)
+    return chemin
+
+
+def _vers_nom(nom):
+    code = str(nom).encode("utf-8")
+    if len(code) > _TAILLE_NOM:
+        raise ValueError(f"Nom de profil trop long pour la bibliothèque ({_TAILLE_NOM} octets max) : {nom}")
+    return code
+
+
+def ecrire_bibliotheque(chemin, profils, dtype=np.float64):
+    """
+    Crée (ou remplace) une bibliothèque binaire de profils.
+
+    Args:
+        chemin (str): Fichier .bin de sortie.
+        profils (dict | iterable): {nom: coordonnées (N, 2)} ou couples (nom, coordonnées).
+        dtype (np.dtype, optional): np.float32 (fichier deux fois plus petit) ou np.float64.
+
+    Returns:
+        str: Chemin du fichier écrit.
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in (np.dtype(np.float32), np.dtype(np.float64)):
+        raise ValueError("La bibliothèque stocke des coordonnées float32 ou float64 uniquement.")
+
+    with open(chemin, "wb") as f:
+        f.write(_ENTETE.pack(_SIGNATURE, _VERSION, dtype.itemsize, 0, 0, _ENTETE.size))
+    BibliothequeProfils(chemin).ajouter(profils)
+    return chemin
+
+
+class BibliothequeProfils:
+    """
+    Bibliothèque binaire de profils lue par projection mémoire.
+
+    Attributes:
+        chemin (str): Fichier .bin.
+        noms (list[str]): Noms des profils, dans l'ordre du fichier.
+
+    Example:
+        >>> bib = BibliothequeProfils.depuis_dossier("uiuc/", "data/uiuc.bin", dtype=np.float32)
+        >>> coords = bib["naca2412"]          # vue (N, 2) sans copie
+        >>> bib.exporter_dat("naca2412", "naca2412.dat")
+    """
+    def __init__(self, chemin=None):
+        self.chemin = chemin or fichier_bibliotheque
+        self._ouvrir()
+
+    def _ouvrir(self):
+        with open(self.chemin, "rb") as f:
+            signature, version, octets, n_profils, n_points, position_table = _ENTETE.unpack(f.read(_ENTETE.size))
+        if signature != _SIGNATURE or version != _VERSION:
+            raise ValueError(f"Fichier de bibliothèque de profils invalide : {self.chemin}")
+
+        self.dtype = np.dtype("<f4" if octets == 4 else "<f8")
+        self._position_table = position_table
+        self._n_points = n_points
+
+        # Projections mémoire : rien n'est lu tant qu'un profil n'est pas consulté
+        self._coordonnees = (np.memmap(self.chemin, dtype=self.dtype, mode="r", offset=_ENTETE.size,
+                                       shape=(n_points, 2)) if n_points else np.empty((0, 2), self.dtype))
+        self._table = (np.memmap(self.chemin, dtype=_DTYPE_TABLE, mode="r", offset=position_table,
+                                 shape=(n_profils,)) if n_profils else np.empty(0, _DTYPE_TABLE))
+        self.noms = [n.decode("utf-8") for n in self._table["nom"]]
+        self._positions = {nom: i for i, nom in enumerate(self.noms)}
+
+    def __len__(self):
+        return len(self.noms)
+
+    def __contains__(self, nom):
+        return nom in self._positions
+
+    def __iter__(self):
+        return iter(self.noms)
+
+    def __getitem__(self, nom):
+        """
+        Args:
+            nom (str): Nom du profil.
+
+        Returns:
+            np.ndarray: Vue (N, 2) en lecture seule sur le fichier (aucune copie).
+        """
+        ligne = self._table[self._positions[nom]]
+        debut = int(ligne["debut"])
+        return self._coordonnees[debut:debut + int(ligne["n"])]
+
+    def airfoil(self, nom):
+        """
+        Args:
+            nom (str): Nom du profil.
+
+        Returns:
+            Airfoil: Profil construit à partir de la bibliothèque.
+        """
+        from projet_sessionE2025.airfoil.Airfoil import Airfoil
+        return Airfoil(nom, self[nom])
+
+    def exporter_dat(self, nom, chemin):
+        """
+        Écrit un profil de la bibliothèque au format .dat pour XFOIL.
+
+        Args:
+            nom (str): Nom du profil.
+            chemin (str): Fichier .dat de sortie.
+
+        Returns:
+            str: Chemin du fichier écrit.
+        """
+        return ecrire_dat(chemin, self[nom], nom)
+
+    def ajouter(self, profils, remplacer=False):
+        """
+        Ajoute des profils en fin de bibliothèque (les coordonnées existantes ne sont pas réécrites).
+
+        Args:
+            profils (dict | iterable): {nom: coordonnées (N, 2)} ou couples (nom, coordonnées).
+            remplacer (bool, optional): Si True, un profil déjà présent pointe désormais vers ses nouvelles
+                coordonnées (les anciennes restent dans le fichier sans être référencées).
+
+        Raises:
+            ValueError: Si un nom est en double, trop long, ou déjà présent sans ``remplacer``.
+        """
+        elements = list(profils.items()) if isinstance(profils, dict) else list(profils)
+        noms = [nom for nom, _ in elements]
+        for nom in noms:
+            _vers_nom(nom)
+        if len(set(noms)) != len(noms) or (not remplacer and any(nom in self._positions for nom in noms)):
+            raise ValueError("Profil déjà présent dans la bibliothèque.")
+
+        nouvelles = np.zeros(sum(nom not in self._positions for nom in noms), dtype=_DTYPE_TABLE)
+        taille_point = 2 * self.dtype.itemsize
+
+        # Libère les projections avant d'écrire dans le fichier
+        table_existante = np.array(self._table)
+        positions = self._positions
+        self._coordonnees = self._table = None
+
+        with open(self.chemin, "r+b") as f:
+            # Les nouvelles coordonnées commencent au premier point entier après la fin du fichier :
+            # les coordonnées et la table en vigueur ne sont pas touchées tant que l'en-tête n'est pas réécrit.
+            fin = f.seek(0, os.SEEK_END)
+            debut = -(-(fin - _ENTETE.size) // taille_point)
+            f.seek(_ENTETE.size + debut * taille_point)
+            i = 0
+            for nom, coordonnees in elements:
+                coords = np.ascontiguousarray(coordonnees, dtype=self.dtype).reshape(-1, 2)
+                f.write(coords.tobytes())
+                if nom in positions:
+                    table_existante[positions[nom]] = (_vers_nom(nom), debut, len(coords), 0)
+                else:
+                    nouvelles[i] = (_vers_nom(nom), debut, len(coords), 0)
+                    i += 1
+                debut += len(coords)
+
+            position_table = f.tell()
+            table = np.concatenate([table_existante, nouvelles])
+            f.write(table.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+            # En-tête en dernier : il bascule d'un coup vers les nouvelles coordonnées et la nouvelle table
+            f.seek(0)
+            f.write(_ENTETE.pack(_SIGNATURE, _VERSION, self.dtype.itemsize, len(table), debut, position_table))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._ouvrir()
+
+    @classmethod
+    def depuis_dossier(cls, dossier, chemin=None, dtype=np.float64, extension=".dat"):
+        """
+        Construit une bibliothèque à partir de tous les fichiers .dat d'un dossier.
+
+        Args:
+            dossier (str): Dossier contenant les fichiers .dat.
+            chemin (str, optional): Fichier .bin de sortie (par défaut data/bibliotheque_profils.bin).
+            dtype (np.dtype, optional): Type des coordonnées stockées.
+            extension (str, optional): Extension des fichiers à importer.
+
+        Returns:
+            BibliothequeProfils: Bibliothèque ouverte.
+        """
+        chemin = chemin or fichier_bibliotheque
+        profils = []
+        for nom_fichier in sorted(os.listdir(dossier)):
+            if nom_fichier.lower().endswith(extension):
+                _, coords = lire_dat(os.path.join(dossier, nom_fichier))
+                if len(coords):
+                    profils.append((os.path.splitext(nom_fichier)[0], coords))
+        ecrire_bibliotheque(chemin, profils, dtype)
+        return cls(chemin)
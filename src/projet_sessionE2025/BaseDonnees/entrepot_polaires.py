@@ -0,0 +1,246 @@
+import os
+import uuid
+import shutil
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from projet_sessionE2025.BaseDonnees.gestion_base import Dossier_data
+
+"""
+Module : entrepot_polaires
+
+Stockage colonnaire de toutes les polaires (XFOIL et AirfoilTools) dans un seul jeu de données Parquet.
+
+Chaque ligne est un point de polaire : profil, Reynolds, Mach, source, alpha, CL, CD, CDp, CM, Top_Xtr,
+Bot_Xtr, ainsi que la finesse CL/CD précalculée. Le jeu de données est partitionné par source
+(data/polaires_parquet/source=xfoil/...) et interrogé avec pyarrow.dataset : les filtres (plage de Reynolds,
+de Mach, finesse minimale...) sont poussés jusqu'aux statistiques des fichiers Parquet, si bien qu'une
+requête sur toute la base est un seul balayage au lieu de l'ouverture de milliers de fichiers .txt.
+
+L'ingestion est incrémentale : un fichier déjà ingéré et inchangé (même date de modification) est ignoré ;
+un fichier modifié (polaire recalculée) remplace ses anciennes lignes, ou les supprime s'il ne contient plus
+aucun point. Les écritures sont sérialisées par un verrou propre au dossier, partagé par toutes les instances.
+"""
+
+dossier_polaires_parquet = os.path.join(Dossier_data, "polaires_parquet")
+
+COLONNES_POLAIRE = ["alpha", "CL", "CD", "CDp", "CM", "Top_Xtr", "Bot_Xtr"]
+
+SCHEMA_POLAIRES = pa.schema(
+    [("profil", pa.string()), ("fichier", pa.string()), ("mtime", pa.float64()),
+     ("reynolds", pa.float64()), ("mach", pa.float64())]
+    + [(c, pa.float64()) for c in COLONNES_POLAIRE]
+    + [("finesse", pa.float64()), ("source", pa.string())]
+)
+
+_PARTITIONNEMENT = ds.partitioning(pa.schema([("source", pa.string())]), flavor="hive")
+
+_verrous_dossiers = {}
+_verrou_registre = threading.Lock()
+
+
+def _verrou_dossier(dossier):
+    """
+    Verrou d'écriture d'un jeu de données, commun à toutes les instances pointant vers le même dossier.
+    """
+    with _verrou_registre:
+        return _verrous_dossiers.setdefault(os.path.abspath(dossier), threading.Lock())
+
+
+def lire_points_polaire(chemin):
+    """
+    Lit le tableau de points d'une polaire XFOIL/AirfoilTools.
+
+    Args:
+        chemin (str): Fichier polaire (.txt).
+
+    Returns:
+        np.ndarray | None: Tableau (n, 7) dans l'ordre de COLONNES_POLAIRE (NaN pour une colonne absente),
+        ou None si le fichier ne contient aucun point.
+    """
+    colonnes = None
+    valeurs = []
+    with open(chemin, "r", encoding="utf-8", errors="ignore") as f:
+        for ligne in f:
+            parties = ligne.split()
+            if colonnes is None:
+                if parties and parties[0].lower() == "alpha":
+                    colonnes = parties
+                continue
+            if len(parties) != len(colonnes):
+                continue
+            try:
+                valeurs.append([float(p) for p in parties])
+            except ValueError:
+                continue  # ligne de séparation "------"
+
+    if not valeurs:
+        return None
+
+    brut = np.asarray(valeurs, dtype=np.float64)
+    position = {nom.lower(): i for i, nom in enumerate(colonnes)}
+    points = np.full((len(brut), len(COLONNES_POLAIRE)), np.nan)
+    for j, nom in enumerate(COLONNES_POLAIRE):
+        if nom.lower() in position:
+            points[:, j] = brut[:, position[nom.lower()]]
+    return points
+
+
+class EntrepotPolaires:
+    """
+    Jeu de données Parquet partitionné regroupant toutes les polaires.
+
+    Attributes:
+        dossier (str): Racine du jeu de données.
+    """
+    def __init__(self, dossier=None):
+        self.dossier = dossier or dossier_polaires_parquet
+        self._verrou = _verrou_dossier(self.dossier)
+        os.makedirs(self.dossier, exist_ok=True)
+
+    def _jeu(self):
+        return ds.dataset(self.dossier, format="parquet", schema=SCHEMA_POLAIRES, partitioning=_PARTITIONNEMENT)
+
+    def _ecrire(self, table, dossier, comportement="overwrite_or_ignore"):
+        # Trié par Reynolds : les statistiques min/max des groupes de lignes restent sélectives
+        table = table.sort_by([("reynolds", "ascending"), ("profil", "ascending"), ("alpha", "ascending")])
+        ds.write_dataset(table, dossier, format="parquet", partitioning=_PARTITIONNEMENT,
+                         basename_template=f"lot-{uuid.uuid4().hex}-{{i}}.parquet",
+                         existing_data_behavior=comportement)
+
+    def fichiers_ingeres(self):
+        """
+        Returns:
+            dict: Fichier polaire -> date de modification au moment de son ingestion.
+        """
+        table = self._jeu().to_table(columns=["fichier", "mtime"])
+        if table.num_rows == 0:
+            return {}
+        uniques = table.group_by(["fichier"]).aggregate([("mtime", "max")])
+        return dict(zip(uniques["fichier"].to_pylist(), uniques["mtime_max"].to_pylist()))
+
+    def ingerer(self, polaires):
+        """
+        Ajoute des polaires au jeu de données (un seul fichier Parquet par lot et par source).
+
+        Args:
+            polaires (iterable[dict]): Descriptions avec les clés ``fichier``, ``profil``, ``source``,
+                ``reynolds`` et ``mach``.
+
+        Returns:
+            int: Nombre de points ingérés.
+        """
+        with self._verrou:
+            deja = self.fichiers_ingeres()
+            morceaux = []
+            a_remplacer = []
+            for polaire in polaires:
+                fichier = os.path.abspath(polaire["fichier"])
+                if not os.path.exists(fichier):
+                    continue
+                mtime = os.path.getmtime(fichier)
+                if fichier in deja:
+                    if deja[fichier] == mtime:
+                        continue
+                    a_remplacer.append(fichier)
+
+                points = lire_points_polaire(fichier)
+                if points is None:
+                    continue  # polaire recalculée sans aucun point : ses anciennes lignes sont seulement retirées
+                n = len(points)
+                colonnes = {
+                    "profil": [polaire["profil"]] * n,
+                    "fichier": [fichier] * n,
+                    "mtime": np.full(n, mtime),
+                    "reynolds": np.full(n, np.nan if polaire.get("reynolds") is None else polaire["reynolds"]),
+                    "mach": np.full(n, np.nan if polaire.get("mach") is None else polaire["mach"]),
+                }
+                colonnes.update({nom: points[:, j] for j, nom in enumerate(COLONNES_POLAIRE)})
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    colonnes["finesse"] = points[:, 1] / points[:, 2]
+                colonnes["source"] = [polaire.get("source") or "inconnue"] * n
+                morceaux.append(pa.table(colonnes, schema=SCHEMA_POLAIRES))
+
+            nouveau = pa.concat_tables(morceaux) if morceaux else SCHEMA_POLAIRES.empty_table()
+
+            if a_remplacer:
+                # Polaires recalculées : on réécrit le jeu sans leurs anciennes lignes
+                anciens = self._jeu().to_table(filter=~ds.field("fichier").isin(a_remplacer))
+                self._remplacer(pa.concat_tables([anciens, nouveau]))
+            elif morceaux:
+                self._ecrire(nouveau, self.dossier)
+            return nouveau.num_rows
+
+    def _remplacer(self, table):
+        """
+        Réécrit entièrement le jeu de données dans un dossier temporaire, puis l'échange avec l'ancien.
+
+        L'ancien jeu est d'abord renommé à côté, et n'est supprimé qu'une fois le nouveau en place : si l'échange
+        échoue, il est remis à sa place.
+        """
+        temporaire = f"{self.dossier}.tmp-{uuid.uuid4().hex}"
+        try:
+            self._ecrire(table, temporaire, comportement="error")
+            os.makedirs(temporaire, exist_ok=True)  # un jeu vide n'écrit aucun fichier
+        except BaseException:
+            shutil.rmtree(temporaire, ignore_errors=True)
+            raise
+        ancien = f"{self.dossier}.old-{uuid.uuid4().hex}"
+        os.replace(self.dossier, ancien)
+        try:
+            os.replace(temporaire, self.dossier)
+        except BaseException:
+            os.replace(ancien, self.dossier)
+            shutil.rmtree(temporaire, ignore_errors=True)
+            raise
+        shutil.rmtree(ancien, ignore_errors=True)
+
+    def compacter(self):
+        """
+        Regroupe tous les lots ingérés en un minimum de fichiers Parquet (à lancer de temps en temps).
+        """
+        with self._verrou:
+            self._remplacer(self._jeu().to_table())
+
+    def requete(self, reynolds_min=None, reynolds_max=None, mach_min=None, mach_max=None, finesse_min=None,
+                profils=None, sources=None, colonnes=None):
+        """
+        Sélectionne des points de polaires ; les filtres sont évalués par pyarrow au niveau des fichiers Parquet.
+
+        Args:
+            reynolds_min, reynolds_max (float, optional): Plage de Reynolds.
+            mach_min, mach_max (float, optional): Plage de Mach.
+            finesse_min (float, optional): Finesse CL/CD minimale.
+            profils (list[str], optional): Profils retenus.
+            sources (list[str], optional): Sources retenues ('xfoil', 'importee').
+            colonnes (list[str], optional): Colonnes à lire (toutes par défaut).
+
+        Returns:
+            pd.DataFrame: Points sélectionnés.
+
+        Example:
+            >>> EntrepotPolaires().requete(reynolds_min=2e5, reynolds_max=1e6, finesse_min=80)
+        """
+        conditions = []
+        if reynolds_min is not None:
+            conditions.append(ds.field("reynolds") >= reynolds_min)
+        if reynolds_max is not None:
+            conditions.append(ds.field("reynolds") <= reynolds_max)
+        if mach_min is not None:
+            conditions.append(ds.field("mach") >= mach_min)
+        if mach_max is not None:
+            conditions.append(ds.field("mach") <= mach_max)
+        if finesse_min is not None:
+            conditions.append(ds.field("finesse") >= finesse_min)
+        if profils is not None:
+            conditions.append(ds.field("profil").isin(list(profils)))
+        if sources is not None:
+            conditions.append(ds.field("source").isin(list(sources)))
+
+        filtre = None
+        for condition in conditions:
+            filtre = condition if filtre is None else filtre & condition
+        return self._jeu().to_table(filter=filtre, columns=colonnes).to_pandas()
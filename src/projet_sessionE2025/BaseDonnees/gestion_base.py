@@ -1,8 +1,9 @@
 # ce module sert à etablir une data BaseDonnees avec des profils déjà manipuler et de la manipuler
 import os
+import sqlite3
 import pandas as pd
+from contextlib import closing
 from datetime import datetime
-import os
 
 # chemins globaux pour l'organisation des fichiers
 
@@ -24,14 +25,39 @@ polaires_importees = os.path.join(Dossier_data, "polaires_importees")
 profils_givre = os.path.join(Dossier_data, "profils_givre")
 
 
+def famille_profil(nom_profil):
+    """
+    Déduit la famille d'un profil à partir de son nom ('naca2412-il' -> 'naca4', 'n23012' -> 'naca5').
+
+    Args:
+        nom_profil (str): Nom du profil.
+
+    Returns:
+        str: 'naca4', 'naca5' ou 'autre'.
+    """
+    code = nom_profil.lower()
+    for prefixe in ("naca", "n"):
+        if code.startswith(prefixe):
+            code = code[len(prefixe):]
+            break
+    chiffres = len(code) - len(code.lstrip("0123456789"))
+    return {4: "naca4", 5: "naca5"}.get(chiffres, "autre")
+
+
 class GestionBase:
     """
-    Classe pour gérer la BaseDonnees de données centrale des profils d'ailes elle crée automatiquement un dossier 'data/' et
-    un fichier CSV qui contient un historique des profils enregistrés.
+    Classe pour gérer la BaseDonnees de données centrale des profils d'ailes. Elle crée automatiquement un dossier 'data/'
+    et un catalogue SQLite (data/catalogue_profils.sqlite) qui recense les profils et leurs polaires.
+
+    Le catalogue remplace l'ancien registre donnees_profils.csv (migré automatiquement au premier lancement) :
+    - tables ``profils`` et ``polaires`` indexées sur le nom, le type, la famille, le Reynolds et le Mach ;
+    - chaque écriture est une transaction, et le mode WAL permet plusieurs sessions Streamlit simultanées
+      (lectures concurrentes, écritures sérialisées par SQLite).
     """
     def __init__(self):
         self.chemin_dossier = Dossier_data
-        self.chemin_fichier = os.path.join(self.chemin_dossier, "donnees_profils.csv")
+        self.chemin_fichier = os.path.join(self.chemin_dossier, "donnees_profils.csv")  # ancien registre (migration)
+        self.chemin_catalogue = os.path.join(self.chemin_dossier, "catalogue_profils.sqlite")
         self.colonnes = [
           "nom_profil",
           "type_profil",  # importé ou manuel
@@ -44,16 +70,157 @@ class GestionBase:
         self._initialiser_fichier()
         self._creer_dossiers_utiles()
 
+    def _connexion(self):
+        """
+        Ouvre une connexion au catalogue ; à utiliser avec ``with`` pour une transaction (commit ou rollback).
+        Une connexion par appel : l'objet reste utilisable depuis plusieurs threads.
+        """
+        connexion = sqlite3.connect(self.chemin_catalogue, timeout=30)
+        connexion.row_factory = sqlite3.Row
+        connexion.execute("PRAGMA foreign_keys = ON")
+        return connexion
+
     def _initialiser_fichier(self):
 
         """
-        Creé le dossier 'data' et le fichier 'donnees_profils.csv' s'ils n'existent pas.
+        Creé le dossier 'data' et le catalogue SQLite s'ils n'existent pas, puis migre l'ancien CSV.
         """
         os.makedirs(self.chemin_dossier, exist_ok=True)  # on crée le dossier que il n'est pas déja présent
+        nouveau = not os.path.exists(self.chemin_catalogue)
+
+        with closing(self._connexion()) as connexion, connexion:
+            connexion.execute("PRAGMA journal_mode = WAL")
+            connexion.executescript("""
+                CREATE TABLE IF NOT EXISTS profils (
+                    id INTEGER PRIMARY KEY,
+                    nom_profil TEXT NOT NULL UNIQUE,
+                    type_profil TEXT,
+                    famille TEXT,
+                    date_creation TEXT,
+                    fichier_coord_csv TEXT,
+                    fichier_coord_dat TEXT,
+                    empreinte TEXT
+                );
+                CREATE TABLE IF NOT EXISTS polaires (
+                    id INTEGER PRIMARY KEY,
+                    profil_id INTEGER NOT NULL REFERENCES profils(id) ON DELETE CASCADE,
+                    fichier TEXT NOT NULL UNIQUE,
+                    source TEXT,
+                    reynolds REAL,
+                    mach REAL,
+                    date_creation TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_profils_type ON profils(type_profil);
+                CREATE INDEX IF NOT EXISTS idx_profils_famille ON profils(famille);
+                CREATE INDEX IF NOT EXISTS idx_polaires_conditions ON polaires(reynolds, mach);
+                CREATE INDEX IF NOT EXISTS idx_polaires_mach ON polaires(mach);
+                CREATE INDEX IF NOT EXISTS idx_polaires_profil ON polaires(profil_id);
+                CREATE TABLE IF NOT EXISTS evaluations (
+                    profil_id INTEGER NOT NULL REFERENCES profils(id) ON DELETE CASCADE,
+                    mission TEXT NOT NULL,
+                    empreinte TEXT,
+                    finesse REAL,
+                    alpha REAL,
+                    cm REAL,
+                    epaisseur REAL,
+                    marge_decrochage REAL,
+                    source TEXT,
+                    date_creation TEXT,
+                    PRIMARY KEY (profil_id, mission)
+                );
+            """)
+            # Catalogues créés avant l'ajout de l'empreinte géométrique
+            colonnes = [ligne["name"] for ligne in connexion.execute("PRAGMA table_info(profils)")]
+            if "empreinte" not in colonnes:
+                connexion.execute("ALTER TABLE profils ADD COLUMN empreinte TEXT")
+            connexion.execute("CREATE INDEX IF NOT EXISTS idx_profils_empreinte ON profils(empreinte)")
 
-        if not os.path.exists(self.chemin_fichier):  # dans ce cas on creer un tableau vide avec les bonnes colonnes
-            df = pd.DataFrame(columns=self.colonnes)
-            df.to_csv(self.chemin_fichier, index=False)
+        if nouveau:
+            self.migrer_csv()
+            self.synchroniser_index()
+
+    def migrer_csv(self):
+        """
+        Importe les lignes de l'ancien registre donnees_profils.csv dans le catalogue (une seule transaction).
+
+        Returns:
+            int: Nombre de profils importés.
+        """
+        if not os.path.exists(self.chemin_fichier):
+            return 0
+        df = pd.read_csv(self.chemin_fichier)
+        if df.empty:
+            return 0
+
+        df = df.astype(object).where(pd.notna(df), None)
+        with closing(self._connexion()) as connexion, connexion:
+            for ligne in df.to_dict("records"):
+                self._ecrire_profil(connexion, ligne["nom_profil"], ligne.get("type_profil"),
+                                    ligne.get("fichier_coord_csv"), ligne.get("fichier_coord_dat"),
+                                    ligne.get("date_creation"))
+                for colonne in ("fichier_polaire_txt", "fichier_polaire_csv"):
+                    if ligne.get(colonne):
+                        self._ecrire_polaire(connexion, ligne["nom_profil"], ligne[colonne], None, None, None)
+        print(f"[INFO] {len(df)} profil(s) migré(s) depuis {self.chemin_fichier}")
+        return len(df)
+
+    def synchroniser_index(self, index=None):
+        """
+        Enregistre dans le catalogue tous les fichiers connus de l'index des dossiers data/ (une transaction).
+
+        Args:
+            index (IndexProfils, optional): Index à utiliser (par défaut l'index partagé).
+        """
+        from projet_sessionE2025.BaseDonnees.index_profils import index_defaut
+        index = index or index_defaut()
+        with closing(self._connexion()) as connexion, connexion:
+            for slug, entree in index.entrees().items():
+                self._ecrire_entree(connexion, slug, entree, index.dossier)
+
+    def synchroniser_entree(self, slug, entree, dossier=None):
+        """
+        Enregistre (ou met à jour) un profil de l'index et ses polaires dans le catalogue.
+
+        Args:
+            slug (str): Nom du profil.
+            entree (dict): Entrée de l'index (chemins relatifs à ``dossier``).
+            dossier (str, optional): Dossier data/ de référence.
+        """
+        with closing(self._connexion()) as connexion, connexion:
+            self._ecrire_entree(connexion, slug, entree, dossier or self.chemin_dossier)
+
+    def _ecrire_entree(self, connexion, slug, entree, dossier):
+        coordonnees = {ext: os.path.join(dossier, chemin) for ext, chemin in entree["coordonnees"].items()}
+        self._ecrire_profil(connexion, slug, entree["type"], coordonnees.get("csv"), coordonnees.get("dat"))
+        for polaire in entree["polaires"]:
+            self._ecrire_polaire(connexion, slug, os.path.join(dossier, polaire["fichier"]), polaire["source"],
+                                 polaire.get("reynolds"), polaire.get("mach"))
+
+    @staticmethod
+    def _ecrire_profil(connexion, nom_profil, type_profil, fichier_coord_csv=None, fichier_coord_dat=None,
+                       date_creation=None, empreinte=None):
+        # Insertion ou mise à jour sans écraser les champs déjà renseignés par des valeurs vides
+        connexion.execute("""
+            INSERT INTO profils (nom_profil, type_profil, famille, date_creation, fichier_coord_csv, fichier_coord_dat,
+                                 empreinte)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(nom_profil) DO UPDATE SET
+                type_profil = COALESCE(excluded.type_profil, profils.type_profil),
+                fichier_coord_csv = COALESCE(excluded.fichier_coord_csv, profils.fichier_coord_csv),
+                fichier_coord_dat = COALESCE(excluded.fichier_coord_dat, profils.fichier_coord_dat),
+                empreinte = COALESCE(excluded.empreinte, profils.empreinte)
+        """, (nom_profil, type_profil, famille_profil(nom_profil),
+              date_creation or datetime.now().strftime("%d/%m/%Y %H:%M:%S"), fichier_coord_csv, fichier_coord_dat,
+              empreinte))
+
+    @staticmethod
+    def _ecrire_polaire(connexion, nom_profil, fichier, source, reynolds, mach):
+        connexion.execute("""
+            INSERT INTO polaires (profil_id, fichier, source, reynolds, mach, date_creation)
+            VALUES ((SELECT id FROM profils WHERE nom_profil = ?), ?, ?, ?, ?, ?)
+            ON CONFLICT(fichier) DO UPDATE SET
+                source = excluded.source, reynolds = excluded.reynolds, mach = excluded.mach
+        """, (nom_profil, fichier, source, reynolds, mach, datetime.now().strftime("%d/%m/%Y %H:%M:%S")))
 
     def _creer_dossiers_utiles(self):
 
@@ -98,148 +265,338 @@ class GestionBase:
     #
     #     return None
 
-    # def ajouter_profil(self, nom_profil, type_profil,
-    #                    fichier_coord_csv=None, fichier_coord_dat=None,
-    #                    fichier_polaire_txt=None, fichier_polaire_csv=None):
-    #
-    #     """
-    #     Ajoute un nouveau profil à la BaseDonnees de données avec les chemins associés aux fichiersgénérés
-    #
-    #     :param nom_profil: nom du profil
-    #     :param type_profil: manuel ou importé et givre
-    #     :param fichier_coord_csv: chemin vers le fichier csv des coordonnées
-    #     :param fichier_coord_dat: chemins vers le fichier .dat de XFOIL
-    #     :param fichier_polaire_txt:chemin vers le fichier texte , résultats de XFOIL
-    #     :param fichier_polaire_csv: chemin vers le fichier csv des polaires de AirfoilTools
-    #     """
-    #
-    #     df = pd.read_csv(self.chemin_fichier)
-    #
-    #     # on déplace chaque fichier dans son sous-dossier
-    #
-    #     if type_profil == "manuel":
-    #         dossier_coords = "profils_manuels"
-    #     elif type_profil == "importé":
-    #         dossier_coords = "profils_importes"
-    #     elif type_profil == "givre":
-    #         dossier_coords = "profils_givre"
-    #     else:
-    #         dossier_coords = "profils_importes"  # par défaut
-    #     chemin_coord_csv = self._deplacer_fichier(fichier_coord_csv, dossier_coords)
-    #     chemin_coord_dat = self._deplacer_fichier(fichier_coord_dat, dossier_coords)
-    #     chemin_polaire_txt = self._deplacer_fichier(fichier_polaire_txt, "polaires_importees")
-    #     chemin_polaire_csv = self._deplacer_fichier(fichier_polaire_csv, "polaires_xfoil")
-    #
-    #
-    #     # création d'un dictionnaire pour la nouvelle ligne
-    #
-    #     nouvelle_entree = {
-    #         "nom_profil": nom_profil,
-    #         "type_profil": type_profil,
-    #         "date_creation": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),  # afin de standarisé la date stocké
-    #         "fichier_coord_csv": chemin_coord_csv,
-    #         "fichier_coord_dat": chemin_coord_dat,
-    #         "fichier_polaire_txt": chemin_polaire_txt,
-    #         "fichier_polaire_csv": chemin_polaire_csv
-    #     }
-    #
-    #     df = pd.concat([df, pd.DataFrame([nouvelle_entree])],ignore_index=True)  # on ajoute la nouvelle entree a la BaseDonnees de donnée
-    #     df.to_csv(self.chemin_fichier, index=False)  # on retire les index automatique
-    #     #print(f"[info] Profil '{nom_profil}' ajouté à la BaseDonnees de données.")
+    def ajouter_profil(self, nom_profil, type_profil,
+                       fichier_coord_csv=None, fichier_coord_dat=None,
+                       fichier_polaire_txt=None, fichier_polaire_csv=None, reynolds=None, mach=None):
 
+        """
+        Ajoute (ou met à jour) un profil dans le catalogue avec les chemins associés aux fichiers générés,
+        en une seule transaction.
 
-    # def afficher_base(self):
-    #     """
-    #     Affiche le contenu actuel de la BaseDonnees de données
-    #     """
-    #     df = pd.read_csv(self.chemin_fichier)
-    #     print(df)
-    #
-    #
-    # def charger_base(self):
-    #     """
-    #     Charge et retourne la BaseDonnees de données des profils sous forme de DataFrame.
-    #     """
-    #     return pd.read_csv(self.chemin_fichier)
+        Args:
+            nom_profil (str): Nom du profil.
+            type_profil (str): 'manuel', 'importe' ou 'givre'.
+            fichier_coord_csv (str, optional): Fichier CSV des coordonnées.
+            fichier_coord_dat (str, optional): Fichier .dat pour XFOIL.
+            fichier_polaire_txt (str, optional): Polaire texte (XFOIL ou AirfoilTools).
+            fichier_polaire_csv (str, optional): Polaire CSV.
+            reynolds (float, optional): Reynolds des polaires fournies.
+            mach (float, optional): Mach des polaires fournies.
+        """
+        with closing(self._connexion()) as connexion, connexion:
+            self._ecrire_profil(connexion, nom_profil, type_profil, fichier_coord_csv, fichier_coord_dat)
+            for fichier in (fichier_polaire_txt, fichier_polaire_csv):
+                if fichier:
+                    self._ecrire_polaire(connexion, nom_profil, fichier, type_profil, reynolds, mach)
 
+    def ajouter_profils_lot(self, profils, type_profil="importe"):
+        """
+        Enregistre un lot de profils dans le catalogue en une seule transaction (import en masse).
 
-    # def supprimer_profil(self, nom_profil):
-    #     """
-    #     Supprime un profil de la BaseDonnees de données et ses fichiers associers
-    #     :param nom_profil: Nom du profil à supprimer
-    #     """
-    #     df = pd.read_csv(self.chemin_fichier)
-    #
-    #     #On verifie si le profil est dans la BaseDonnees
-    #     filtre = df["nom_profil"] == nom_profil
-    #     if not filtre.any():
-    #         print(f"[alerte] Aucun profil nommé '{nom_profil}' trouvé dans la BaseDonnees.")
-    #         return False
-    #
-    #     #recuperation des fichiers à supprimer
-    #     fichiers_a_supprimer = df.loc[filtre,[   # pour selectionner les bonnes lignes et colonnes
-    #          "fichier_coord_csv",
-    #          "fichier_coord_dat",
-    #          "fichier_polaire_txt",
-    #          "fichier_polaire_csv"
-    #     ]].values.flatten() #retourne un tableau NumPy et le rend unidimensionnel
-    #
-    #     for chemin in fichiers_a_supprimer:
-    #         if isinstance(chemin, str) and os.path.exists(chemin):   #pour verifier que la variable chemin est bien un chemin de fichier valide
-    #             try:
-    #                 os.remove(chemin)
-    #             except Exception as e:
-    #                 print(f"[alerte] Erreur lors de la suppression du fichier '{chemin}': {e}")
-    #
-    #
-    #     #mise à jour de la BaseDonnees
-    #     df = df[~filtre]
-    #     df.to_csv(self.chemin_fichier, index=False)
-    #     print(f"[info] Profil '{nom_profil}' supprimé de la BaseDonnees et fichiers associés supprimés")
+        Args:
+            profils (iterable[dict]): Profils avec les clés ``nom_profil``, ``fichier_coord_dat`` et,
+                optionnellement, ``fichier_coord_csv`` et ``empreinte``.
+            type_profil (str, optional): Type commun aux profils du lot.
 
+        Returns:
+            int: Nombre de profils enregistrés.
+        """
+        n = 0
+        with closing(self._connexion()) as connexion, connexion:
+            for profil in profils:
+                self._ecrire_profil(connexion, profil["nom_profil"], type_profil, profil.get("fichier_coord_csv"),
+                                    profil.get("fichier_coord_dat"), empreinte=profil.get("empreinte"))
+                n += 1
+        return n
 
-    #rechercher si un profil existe deja
+    def empreintes(self):
+        """
+        Returns:
+            dict: Empreinte géométrique -> nom du profil, pour les profils qui en ont une.
+        """
+        with closing(self._connexion()) as connexion:
+            lignes = connexion.execute("SELECT empreinte, nom_profil FROM profils WHERE empreinte IS NOT NULL")
+            return {ligne["empreinte"]: ligne["nom_profil"] for ligne in lignes}
 
-    # def profil_existe(self, nom_profil):
-    #     """
-    #     Vérifie si un profil existe deja dans la BaseDonnees de données
-    #     :param nom_profil: Nom du profil a rechercher
-    #     :return: True s'il est present falsie sinon
-    #     """
-    #
-    #     df = pd.read_csv(self.chemin_fichier)
-    #     return nom_profil in df ["nom_profil"].values
+    def ajouter_polaire(self, nom_profil, fichier, source="xfoil", reynolds=None, mach=None):
+        """
+        Associe une polaire à un profil du catalogue (le profil est créé s'il n'existe pas).
+
+        Args:
+            nom_profil (str): Nom du profil.
+            fichier (str): Fichier polaire.
+            source (str, optional): 'xfoil' ou 'importee'.
+            reynolds (float, optional): Nombre de Reynolds.
+            mach (float, optional): Nombre de Mach.
+        """
+        with closing(self._connexion()) as connexion, connexion:
+            self._ecrire_profil(connexion, nom_profil, None)
+            self._ecrire_polaire(connexion, nom_profil, fichier, source, reynolds, mach)
+
+    def profil(self, nom_profil):
+        """
+        Recherche exacte d'un profil par son nom (index unique, O(log n)).
+
+        Args:
+            nom_profil (str): Nom exact du profil.
+
+        Returns:
+            dict | None: Ligne du catalogue, ou None.
+        """
+        with closing(self._connexion()) as connexion:
+            ligne = connexion.execute("SELECT * FROM profils WHERE nom_profil = ?", (nom_profil,)).fetchone()
+        return dict(ligne) if ligne else None
+
+    def chercher_profil(self, nom_profil):
+        """
+        Recherche un profil en testant les variantes de son nom (nacaXXXX-il, nXXXX...) en une seule requête.
+
+        Args:
+            nom_profil (str): Nom saisi (ex : '2412').
+
+        Returns:
+            dict | None: Ligne du catalogue de la variante la plus prioritaire présente, ou None.
+        """
+        variantes = self.chercher_nom(nom_profil)
+        marqueurs = ",".join("?" * len(variantes))
+        with closing(self._connexion()) as connexion:
+            lignes = connexion.execute(f"SELECT * FROM profils WHERE nom_profil IN ({marqueurs})", variantes).fetchall()
+        if not lignes:
+            return None
+        priorite = {nom: i for i, nom in enumerate(variantes)}
+        return dict(min(lignes, key=lambda l: priorite[l["nom_profil"]]))
+
+    def lister_profils(self, types=None, avec_coordonnees=True):
+        """
+        Liste les noms de profils du catalogue.
+
+        Args:
+            types (iterable, optional): Types acceptés ('importe', 'manuel', 'givre'), tous par défaut.
+            avec_coordonnees (bool, optional): Ne garde que les profils ayant un fichier .dat.
+
+        Returns:
+            list[str]: Noms triés.
+        """
+        requete = "SELECT nom_profil FROM profils WHERE 1 = 1"
+        parametres = []
+        if types is not None:
+            types = list(types)
+            requete += f" AND type_profil IN ({','.join('?' * len(types))})"
+            parametres += types
+        if avec_coordonnees:
+            requete += " AND fichier_coord_dat IS NOT NULL"
+        with closing(self._connexion()) as connexion:
+            return [l[0] for l in connexion.execute(requete + " ORDER BY nom_profil", parametres)]
+
+    def fichiers_coordonnees(self, types=None):
+        """
+        Fichiers .dat des profils du catalogue, en une seule requête.
+
+        Args:
+            types (iterable, optional): Types acceptés ('importe', 'manuel', 'givre'), tous par défaut.
+
+        Returns:
+            dict: Nom du profil -> chemin du fichier .dat.
+        """
+        requete = "SELECT nom_profil, fichier_coord_dat FROM profils WHERE fichier_coord_dat IS NOT NULL"
+        parametres = []
+        if types is not None:
+            types = list(types)
+            requete += f" AND type_profil IN ({','.join('?' * len(types))})"
+            parametres += types
+        with closing(self._connexion()) as connexion:
+            return {l[0]: l[1] for l in connexion.execute(requete + " ORDER BY nom_profil", parametres)}
+
+    def evaluations(self, mission):
+        """
+        Évaluations déjà enregistrées pour une condition de mission (voir classement_profils).
+
+        Args:
+            mission (str): Clé de la condition de mission.
+
+        Returns:
+            pd.DataFrame: Colonnes nom_profil, empreinte, finesse, alpha, cm, epaisseur, marge_decrochage, source.
+        """
+        with closing(self._connexion()) as connexion:
+            return pd.read_sql_query("""
+                SELECT p.nom_profil, e.empreinte, e.finesse, e.alpha, e.cm, e.epaisseur, e.marge_decrochage, e.source
+                FROM evaluations e JOIN profils p ON p.id = e.profil_id
+                WHERE e.mission = ? ORDER BY p.nom_profil
+            """, connexion, params=(mission,))
+
+    def enregistrer_evaluations(self, mission, evaluations):
+        """
+        Enregistre (ou remplace) les évaluations d'un lot de profils pour une condition de mission,
+        en une seule transaction.
+
+        Args:
+            mission (str): Clé de la condition de mission.
+            evaluations (iterable[dict]): Clés nom_profil, empreinte, finesse, alpha, cm, epaisseur,
+                marge_decrochage et source.
+        """
+        date = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        with closing(self._connexion()) as connexion, connexion:
+            connexion.executemany("""
+                INSERT OR REPLACE INTO evaluations (profil_id, mission, empreinte, finesse, alpha, cm, epaisseur,
+                                                    marge_decrochage, source, date_creation)
+                VALUES ((SELECT id FROM profils WHERE nom_profil = ?), ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(e["nom_profil"], mission, e["empreinte"], e["finesse"], e["alpha"], e["cm"], e["epaisseur"],
+                   e["marge_decrochage"], e["source"], date) for e in evaluations])
+
+    def profils_par_famille(self, famille):
+        """
+        Args:
+            famille (str): 'naca4', 'naca5' ou 'autre'.
+
+        Returns:
+            list[dict]: Profils de la famille, triés par nom.
+        """
+        with closing(self._connexion()) as connexion:
+            lignes = connexion.execute("SELECT * FROM profils WHERE famille = ? ORDER BY nom_profil", (famille,))
+            return [dict(l) for l in lignes]
+
+    def polaires_par_conditions(self, reynolds_min=None, reynolds_max=None, mach_min=None, mach_max=None,
+                                nom_profil=None):
+        """
+        Recherche les polaires calculées dans une plage de conditions (index sur Reynolds et Mach).
+
+        Args:
+            reynolds_min, reynolds_max (float, optional): Bornes du Reynolds.
+            mach_min, mach_max (float, optional): Bornes du Mach.
+            nom_profil (str, optional): Restreint la recherche à un profil.
+
+        Returns:
+            pd.DataFrame: Colonnes nom_profil, type_profil, famille, fichier, source, reynolds, mach.
+        """
+        conditions, parametres = [], []
+        for colonne, operateur, valeur in (("reynolds", ">=", reynolds_min), ("reynolds", "<=", reynolds_max),
+                                           ("mach", ">=", mach_min), ("mach", "<=", mach_max),
+                                           ("nom_profil", "=", nom_profil)):
+            if valeur is not None:
+                conditions.append(f"{colonne} {operateur} ?")
+                parametres.append(valeur)
+        requete = """
+            SELECT p.nom_profil, p.type_profil, p.famille, q.fichier, q.source, q.reynolds, q.mach
+            FROM polaires q JOIN profils p ON p.id = q.profil_id
+        """
+        if conditions:
+            requete += " WHERE " + " AND ".join(conditions)
+        with closing(self._connexion()) as connexion:
+            return pd.read_sql_query(requete + " ORDER BY p.nom_profil, q.reynolds", connexion, params=parametres)
+
+    def ingerer_polaires(self, dossier_parquet=None):
+        """
+        Ingère toutes les polaires du catalogue dans le jeu de données Parquet (seules les nouvelles
+        ou celles modifiées depuis la dernière ingestion sont relues).
+
+        Args:
+            dossier_parquet (str, optional): Racine du jeu de données (par défaut data/polaires_parquet).
+
+        Returns:
+            int: Nombre de points ingérés.
+        """
+        from projet_sessionE2025.BaseDonnees.entrepot_polaires import EntrepotPolaires
+        with closing(self._connexion()) as connexion:
+            polaires = [dict(l) for l in connexion.execute("""
+                SELECT q.fichier, p.nom_profil AS profil, q.source, q.reynolds, q.mach
+                FROM polaires q JOIN profils p ON p.id = q.profil_id
+            """)]
+        return EntrepotPolaires(dossier_parquet).ingerer(polaires)
+
+    def requete_polaires(self, dossier_parquet=None, **filtres):
+        """
+        Interroge le jeu de données Parquet des polaires (voir ``EntrepotPolaires.requete``).
+
+        Args:
+            dossier_parquet (str, optional): Racine du jeu de données.
+            **filtres: reynolds_min, reynolds_max, mach_min, mach_max, finesse_min, profils, sources, colonnes.
+
+        Returns:
+            pd.DataFrame: Points de polaires sélectionnés.
+
+        Example:
+            >>> GestionBase().requete_polaires(reynolds_min=2e5, reynolds_max=1e6, finesse_min=80)
+        """
+        from projet_sessionE2025.BaseDonnees.entrepot_polaires import EntrepotPolaires
+        return EntrepotPolaires(dossier_parquet).requete(**filtres)
+
+    def afficher_base(self):
+        """
+        Affiche le contenu actuel de la BaseDonnees de données
+        """
+        print(self.charger_base())
+
+    def charger_base(self):
+        """
+        Charge et retourne la BaseDonnees de données des profils sous forme de DataFrame.
+        """
+        with closing(self._connexion()) as connexion:
+            return pd.read_sql_query("SELECT * FROM profils ORDER BY nom_profil", connexion)
+
+    def supprimer_profil(self, nom_profil):
+        """
+        Supprime un profil du catalogue (et ses polaires) ainsi que ses fichiers associés.
+
+        Args:
+            nom_profil (str): Nom du profil à supprimer.
+
+        Returns:
+            bool: False si le profil n'existe pas.
+        """
+        with closing(self._connexion()) as connexion, connexion:
+            ligne = connexion.execute("SELECT * FROM profils WHERE nom_profil = ?", (nom_profil,)).fetchone()
+            if ligne is None:
+                print(f"[alerte] Aucun profil nommé '{nom_profil}' trouvé dans la BaseDonnees.")
+                return False
+            fichiers = [ligne["fichier_coord_csv"], ligne["fichier_coord_dat"]]
+            fichiers += [l[0] for l in connexion.execute("SELECT fichier FROM polaires WHERE profil_id = ?",
+                                                         (ligne["id"],))]
+            connexion.execute("DELETE FROM profils WHERE id = ?", (ligne["id"],))
+
+        for chemin in fichiers:
+            if isinstance(chemin, str) and os.path.exists(chemin):
+                try:
+                    os.remove(chemin)
+                except Exception as e:
+                    print(f"[alerte] Erreur lors de la suppression du fichier '{chemin}': {e}")
+        print(f"[info] Profil '{nom_profil}' supprimé de la BaseDonnees et fichiers associés supprimés")
+        return True
+
+    def profil_existe(self, nom_profil):
+        """
+        Vérifie si un profil existe deja dans la BaseDonnees de données.
+
+        Args:
+            nom_profil (str): Nom du profil à rechercher.
+
+        Returns:
+            bool: True s'il est présent, False sinon.
+        """
+        return self.profil(nom_profil) is not None
 
     def chercher_nom(self, nom_profil):
+        """
+        Retourne les variantes possibles d'un nom de profil (nacaXXXX-il, nXXXX...), par ordre de priorité.
+
+        Args:
+            nom_profil (str): Nom saisi.
+
+        Returns:
+            list[str]: Variantes du nom.
+        """
+        from projet_sessionE2025.BaseDonnees.index_profils import variantes_nom
+        return variantes_nom(nom_profil)
 
-        # Nettoyage de l'entrée utilisateur
-        code_naca = nom_profil.strip().lower()
-        suffixes = ['', '-il', '-sa', '-sm', 'h-sa', 'sm-il', '-jf', 'a-il']
-        prefixes = ['naca', 'n']
-        lettres_variante = ['h', 'sm']
-
-        # On retire tous les préfixes pour garder le cœur numérique
-        code_brut = code_naca.replace("naca", "").replace("n", "")
-        essais = set()
-
-        # 1. Patterns classiques
-        for prefix in prefixes:
-            for suffix in suffixes:
-                essais.add(f"{prefix}{code_brut}{suffix}")
-        essais.add(code_brut)  # Ex : '2412' ou '22112'
-
-        # 2. Si code brut 4 ou 5 chiffres, on tente des variantes avec 'h', 'sm'
-        if code_brut.isdigit() and len(code_brut) in (4, 5):
-            for prefix in prefixes:
-                for lettre in lettres_variante:
-                    for suffix in suffixes:
-                        essais.add(f"{prefix}{code_brut}{lettre}{suffix}")
-            for lettre in lettres_variante:
-                essais.add(f"{code_brut}{lettre}")
-                for suffix in suffixes:
-                    essais.add(f"{code_brut}{lettre}{suffix}")
-
-        # 3. On tente aussi le code NACA original (en cas d'entrée custom)
-        essais.add(code_naca)
-
-        return essais
\ No newline at end of file
+    def trouver_profil(self, nom_profil):
+        """
+        Recherche un profil de la base grâce à l'index des fichiers (sans parcourir les dossiers).
+
+        Args:
+            nom_profil (str): Nom saisi (ex : 'naca2412').
+
+        Returns:
+            tuple[str | None, str | None]: (fichier .dat des coordonnées, fichier polaire), None si absent.
+        """
+        from projet_sessionE2025.BaseDonnees.index_profils import index_defaut
+        index = index_defaut()
+        return index.chemin_coordonnees(nom_profil), index.chemin_polaire(nom_profil)
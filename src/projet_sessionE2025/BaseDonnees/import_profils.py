@@ -0,0 +1,270 @@
+import os
+import sys
+import hashlib
+import tarfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from projet_sessionE2025.BaseDonnees.gestion_base import GestionBase, profils_importes
+from projet_sessionE2025.BaseDonnees.index_profils import index_defaut
+from projet_sessionE2025.BaseDonnees.bibliotheque_profils import (analyser_dat, ecrire_dat, BibliothequeProfils,
+                                                                  ecrire_bibliotheque)
+
+"""
+Module : import_profils
+
+Import en masse d'une base de profils (AirfoilTools, UIUC...) fournie sous forme de dossier ou d'archive tar
+de fichiers .dat, sans accès réseau.
+
+Étapes :
+1. lecture et normalisation des fichiers en parallèle (un processus par cœur) :
+   ordre Selig (format Lednicer converti, sens de parcours corrigé), bord d'attaque à l'origine, corde unité
+   alignée sur l'axe x, bord de fuite fermé ;
+2. suppression des doublons par empreinte géométrique (dans le lot et par rapport au catalogue) ;
+3. écriture des .dat normalisés dans data/profils_importes, puis mise à jour de l'index et du catalogue
+   SQLite en une seule transaction.
+
+Utilisation en ligne de commande :
+
+    projet-import-profils chemin/vers/coord_seligFmt/ --workers 8
+    projet-import-profils uiuc.tar.gz --bibliotheque data/uiuc.bin
+"""
+
+DECIMALES_EMPREINTE = 5
+
+
+def _nom_source(chemin):
+    """'coord_seligFmt/NACA 2412.dat' -> 'naca-2412'"""
+    return "-".join(os.path.splitext(os.path.basename(chemin))[0].lower().split())
+
+
+def normaliser_contour(coordonnees, fermer_bord_fuite=True):
+    """
+    Ramène un contour de profil à la forme standard utilisée par la base.
+
+    - ordre Selig : départ au bord de fuite, extrados, bord d'attaque, intrados (sens trigonométrique) ;
+    - bord d'attaque (point le plus éloigné du bord de fuite) à l'origine, corde unité le long de l'axe x ;
+    - bord de fuite fermé : l'écart entre les deux extrémités est résorbé par un cisaillement linéaire en x
+      de chaque surface, qui laisse le bord d'attaque inchangé.
+
+    Args:
+        coordonnees (array-like): Coordonnées (N, 2).
+        fermer_bord_fuite (bool, optional): Ferme le bord de fuite.
+
+    Returns:
+        np.ndarray: Coordonnées normalisées (N', 2).
+
+    Raises:
+        ValueError: Si le contour contient moins de 5 points distincts ou une corde nulle.
+    """
+    coords = np.asarray(coordonnees, dtype=np.float64).reshape(-1, 2)
+    coords = coords[np.isfinite(coords).all(axis=1)]
+    if len(coords) > 1:
+        distincts = np.concatenate(([True], np.any(np.diff(coords, axis=0) != 0, axis=1)))
+        coords = coords[distincts]
+    if len(coords) > 2 and np.allclose(coords[0], coords[-1]) and np.argmax(coords[:, 0]) not in (0, len(coords) - 1):
+        coords = coords[:-1]  # contour fermé qui ne démarre pas au bord de fuite
+    if len(coords) < 5:
+        raise ValueError("Contour de moins de 5 points.")
+
+    # Départ au bord de fuite (abscisse maximale)
+    i_bf = int(np.argmax(coords[:, 0]))
+    if i_bf not in (0, len(coords) - 1):
+        coords = np.roll(coords, -i_bf, axis=0)
+
+    # Sens trigonométrique (aire signée positive) = extrados parcouru en premier
+    x, y = coords[:, 0], coords[:, 1]
+    if np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y) < 0:
+        coords = coords[::-1]
+
+    bord_fuite = 0.5 * (coords[0] + coords[-1])
+    i_ba = int(np.argmax(np.linalg.norm(coords - bord_fuite, axis=1)))
+    corde = bord_fuite - coords[i_ba]
+    longueur = np.hypot(*corde)
+    if longueur == 0:
+        raise ValueError("Corde nulle.")
+
+    # Translation, rotation et mise à l'échelle en une seule opération
+    cos, sin = corde / longueur
+    rotation = np.array([[cos, -sin], [sin, cos]])
+    coords = (coords - coords[i_ba]) @ rotation / longueur
+
+    if fermer_bord_fuite:
+        y_milieu = 0.5 * (coords[0, 1] + coords[-1, 1])
+        x = coords[:, 0]
+        coords[:i_ba + 1, 1] -= x[:i_ba + 1] * (coords[0, 1] - y_milieu)
+        coords[i_ba + 1:, 1] -= x[i_ba + 1:] * (coords[-1, 1] - y_milieu)
+        coords[0] = coords[-1] = (1.0, 0.0)
+
+    coords[i_ba] = (0.0, 0.0)
+    return coords
+
+
+def empreinte_contour(coordonnees, decimales=DECIMALES_EMPREINTE):
+    """
+    Empreinte d'un contour normalisé, calculée sur ses coordonnées arrondies.
+
+    Deux fichiers décrivant le même profil avec les mêmes points (à ``decimales`` près) ont la même empreinte ;
+    un même profil rediscrétisé avec d'autres points n'est pas considéré comme un doublon. À ne pas confondre
+    avec ``cache_polaires.empreinte_geometrie``, clé du cache XFOIL calculée sur le fichier .dat brut.
+
+    Args:
+        coordonnees (np.ndarray): Coordonnées normalisées (N, 2).
+        decimales (int, optional): Précision retenue.
+
+    Returns:
+        str: Empreinte hexadécimale.
+    """
+    arrondi = np.round(np.asarray(coordonnees, dtype=np.float64), decimales) + 0.0  # -0.0 -> 0.0
+    return hashlib.blake2b(np.ascontiguousarray(arrondi).tobytes(), digest_size=16).hexdigest()
+
+
+def _traiter(element):
+    """
+    Lit et normalise un fichier (exécuté dans un processus de travail).
+
+    Args:
+        element (tuple): (nom, contenu du fichier ou None, chemin du fichier ou None).
+
+    Returns:
+        dict: Clés ``nom``, ``titre``, ``coordonnees``, ``empreinte``, ou ``nom`` et ``erreur``.
+    """
+    nom, texte, chemin = element
+    try:
+        if texte is None:
+            with open(chemin, "r", encoding="utf-8", errors="ignore") as f:
+                texte = f.read()
+        titre, coords = analyser_dat(texte)
+        coords = normaliser_contour(coords)
+        return {"nom": nom, "titre": titre or nom, "coordonnees": coords, "empreinte": empreinte_contour(coords)}
+    except (OSError, ValueError) as e:
+        return {"nom": nom, "erreur": str(e)}
+
+
+def _elements_source(source, extension=".dat"):
+    """
+    Liste les fichiers à importer d'un dossier (parcours récursif) ou d'une archive tar (.tar, .tar.gz...).
+
+    Returns:
+        list[tuple]: Éléments transmis à ``_traiter``.
+    """
+    elements = []
+    if os.path.isdir(source):
+        for racine, _, fichiers in os.walk(source):
+            for nom_fichier in sorted(fichiers):
+                if nom_fichier.lower().endswith(extension):
+                    elements.append((_nom_source(nom_fichier), None, os.path.join(racine, nom_fichier)))
+    elif os.path.isfile(source) and tarfile.is_tarfile(source):
+        # Les membres sont lus ici : les processus de travail ne reçoivent que du texte
+        with tarfile.open(source, "r:*") as archive:
+            for membre in archive:
+                if membre.isfile() and membre.name.lower().endswith(extension):
+                    contenu = archive.extractfile(membre).read().decode("utf-8", errors="ignore")
+                    elements.append((_nom_source(membre.name), contenu, None))
+    else:
+        raise ValueError(f"Source introuvable ou non reconnue (dossier ou archive tar attendu) : {source}")
+    return elements
+
+
+def importer_profils(source, dossier=None, workers=None, bibliotheque=None, remplacer=False):
+    """
+    Importe en masse les fichiers .dat d'un dossier ou d'une archive tar dans la base.
+
+    Args:
+        source (str): Dossier ou archive tar contenant les fichiers .dat (Selig ou Lednicer).
+        dossier (str, optional): Dossier de destination des .dat normalisés (par défaut data/profils_importes).
+        workers (int, optional): Nombre de processus (par défaut le nombre de cœurs).
+        bibliotheque (str, optional): Bibliothèque binaire (.bin) à compléter avec les profils importés.
+        remplacer (bool, optional): Réécrit les profils dont le nom existe déjà dans le catalogue.
+
+    Returns:
+        dict: ``importes`` (noms), ``doublons`` ({nom: profil identique}), ``existants`` (noms ignorés)
+        et ``erreurs`` ({nom: message}).
+
+    Example:
+        >>> rapport = importer_profils("coord_seligFmt/", workers=8)
+        >>> len(rapport["importes"]), len(rapport["doublons"])
+    """
+    dossier = dossier or profils_importes
+    os.makedirs(dossier, exist_ok=True)
+    elements = _elements_source(source)
+    rapport = {"importes": [], "doublons": {}, "existants": [], "erreurs": {}}
+    if not elements:
+        return rapport
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executeur:
+        resultats = list(executeur.map(_traiter, elements, chunksize=max(1, len(elements) // (4 * workers))))
+
+    gestion = GestionBase()
+    empreintes = gestion.empreintes()
+    existants = set(gestion.lister_profils(avec_coordonnees=False))
+
+    retenus = []
+    for resultat in resultats:
+        nom = resultat["nom"]
+        if "erreur" in resultat:
+            rapport["erreurs"][nom] = resultat["erreur"]
+        elif resultat["empreinte"] in empreintes:
+            rapport["doublons"][nom] = empreintes[resultat["empreinte"]]
+        elif nom in existants and not remplacer:
+            rapport["existants"].append(nom)
+        else:
+            empreintes[resultat["empreinte"]] = nom
+            existants.add(nom)
+            retenus.append(resultat)
+
+    # Écriture des fichiers, puis index et catalogue mis à jour une seule fois pour tout le lot
+    profils = []
+    for resultat in retenus:
+        chemin = os.path.join(dossier, f"{resultat['nom']}_coord_profil.dat")
+        ecrire_dat(chemin, resultat["coordonnees"], resultat["titre"], indexer=False)
+        profils.append({"nom_profil": resultat["nom"], "fichier_coord_dat": chemin,
+                        "empreinte": resultat["empreinte"]})
+    index_defaut().ajouter_fichiers([p["fichier_coord_dat"] for p in profils])
+    gestion.ajouter_profils_lot(profils)
+    rapport["importes"] = [p["nom_profil"] for p in profils]
+
+    if bibliotheque and retenus:
+        nouveaux = [(r["nom"], r["coordonnees"]) for r in retenus]
+        if os.path.exists(bibliotheque):
+            bib = BibliothequeProfils(bibliotheque)
+            # Avec ``remplacer``, les profils réécrits dans la base le sont aussi dans la bibliothèque
+            bib.ajouter([(nom, c) for nom, c in nouveaux if remplacer or nom not in bib], remplacer=remplacer)
+        else:
+            ecrire_bibliotheque(bibliotheque, nouveaux)
+
+    return rapport
+
+
+def main(argv=None):
+    """
+    Point d'entrée en ligne de commande (``projet-import-profils``).
+    """
+    parser = argparse.ArgumentParser(description="Import en masse de fichiers de profils .dat (Selig/Lednicer).")
+    parser.add_argument("source", help="Dossier ou archive tar contenant les fichiers .dat")
+    parser.add_argument("--dossier", default=None, help="Dossier de destination (défaut : data/profils_importes)")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument("--bibliotheque", default=None, help="Bibliothèque binaire .bin à compléter")
+    parser.add_argument("--remplacer", action="store_true", help="Réécrit les profils déjà présents dans la base")
+    args = parser.parse_args(argv)
+
+    try:
+        rapport = importer_profils(args.source, dossier=args.dossier, workers=args.workers,
+                                   bibliotheque=args.bibliotheque, remplacer=args.remplacer)
+    except ValueError as e:
+        print(f"[ERREUR] {e}")
+        return 1
+
+    print(f"[OK] {len(rapport['importes'])} profil(s) importé(s)")
+    print(f"[INFO] {len(rapport['doublons'])} doublon(s) géométrique(s), "
+          f"{len(rapport['existants'])} déjà présent(s), {len(rapport['erreurs'])} erreur(s)")
+    for nom, message in sorted(rapport["erreurs"].items()):
+        print(f"[ERREUR] {nom} : {message}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
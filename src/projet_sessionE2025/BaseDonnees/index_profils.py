@@ -0,0 +1,431 @@
+import os
+import re
+import json
+import sqlite3
+import threading
+
+from projet_sessionE2025.BaseDonnees.gestion_base import Dossier_data, GestionBase
+
+"""
+Module : index_profils
+
+Résolution des noms de profils et index persistant des fichiers de la base de données.
+
+- ``variantes_nom`` est l'unique générateur des variantes de noms AirfoilTools (nacaXXXX-il, nXXXX,
+  XXXXh-sa...) ; il est partagé par le résolveur AirfoilTools, Aerodynamique et GestionBase.
+- ``IndexProfils`` associe à chaque nom de profil (slug) ses fichiers de coordonnées, ses polaires et
+  les Reynolds de celles-ci. Il est construit une fois en parcourant data/, conservé dans
+  data/index_profils.json, puis tenu à jour à chaque fichier enregistré : une recherche ne coûte plus
+  que quelques accès à un dictionnaire au lieu de dizaines d'appels os.path.exists ou HTTP.
+
+Si un dossier de data/ a été modifié hors de l'application (date de modification différente de celle
+mémorisée), l'index est reconstruit automatiquement au chargement.
+"""
+
+# Dossier de données -> (catégorie, rôle)
+DOSSIERS_INDEXES = {
+    "profils_importes": ("importe", "coordonnees"),
+    "profils_manuels": ("manuel", "coordonnees"),
+    "profils_givre": ("givre", "coordonnees"),
+    "polaires_importees": ("importee", "polaire"),
+    "polaires_xfoil": ("xfoil", "polaire"),
+}
+
+# Suffixes de noms de fichiers -> suffixe ajouté au slug
+_MOTIFS_FICHIERS = [
+    (re.compile(r"^(?P<slug>.+)_coord_profil\.(?P<ext>dat|csv)$"), ""),
+    (re.compile(r"^(?P<slug>.+)_coord_givre\.(?P<ext>dat|csv)$"), "-givre"),
+    (re.compile(r"^(?P<slug>.+)_coef_aero_givre\.(?P<ext>txt)$"), "-givre"),
+    (re.compile(r"^(?P<slug>.+)_coef_aero\.(?P<ext>txt)$"), ""),
+    (re.compile(r"^(?P<slug>.+)\.(?P<ext>txt)$"), ""),
+]
+
+_MOTIF_REYNOLDS = re.compile(r"Re\s*=\s*([\d.]+)\s*e\s*([+-]?\d+)")
+_MOTIF_MACH = re.compile(r"Mach\s*=\s*([\d.]+)")
+
+
+def variantes_nom(nom_profil):
+    """
+    Génère les noms possibles d'un profil, du plus probable au moins probable.
+
+    Args:
+        nom_profil (str): Nom saisi (ex : '2412', 'NACA23012', 'naca0012h-sa').
+
+    Returns:
+        list[str]: Variantes sans doublon, dans l'ordre de priorité.
+    """
+    code_naca = nom_profil.strip().lower()
+    suffixes = ['', '-il', '-sa', '-sm', 'h-sa', 'sm-il', '-jf', 'a-il']
+    prefixes = ['naca', 'n']
+    lettres_variante = ['h', 'sm']
+
+    # On retire tous les préfixes pour garder le cœur numérique
+    code_brut = code_naca.replace("naca", "").replace("n", "")
+
+    # 1. Le nom exact saisi, puis la convention la plus fréquente d'AirfoilTools (nacaXXXX-il)
+    essais = [code_naca, f"naca{code_brut}-il", f"naca{code_brut}"]
+
+    # 2. Patterns classiques
+    for prefix in prefixes:
+        for suffix in suffixes:
+            essais.append(f"{prefix}{code_brut}{suffix}")
+    essais.append(code_brut)  # Ex : '2412' ou '22112'
+
+    # 3. Si code brut 4 ou 5 chiffres, variantes avec 'h', 'sm'
+    if code_brut.isdigit() and len(code_brut) in (4, 5):
+        for prefix in prefixes:
+            for lettre in lettres_variante:
+                for suffix in suffixes:
+                    essais.append(f"{prefix}{code_brut}{lettre}{suffix}")
+        for lettre in lettres_variante:
+            essais.append(f"{code_brut}{lettre}")
+            for suffix in suffixes:
+                essais.append(f"{code_brut}{lettre}{suffix}")
+
+    return list(dict.fromkeys(e for e in essais if e))
+
+
+def analyser_nom_fichier(nom_fichier):
+    """
+    Extrait le slug et l'extension d'un nom de fichier de la base.
+
+    Args:
+        nom_fichier (str): Nom de fichier (ex : 'naca2412-il_coef_aero.txt').
+
+    Returns:
+        tuple[str, str] | None: (slug, extension), ou None si le fichier n'est pas reconnu.
+    """
+    for motif, suffixe in _MOTIFS_FICHIERS:
+        correspondance = motif.match(nom_fichier)
+        if correspondance:
+            return correspondance.group("slug").lower() + suffixe, correspondance.group("ext")
+    return None
+
+
+def lire_conditions(chemin):
+    """
+    Lit le Reynolds et le Mach dans l'en-tête d'une polaire XFOIL/AirfoilTools
+    ("Mach =   0.000     Re =     0.100 e 6").
+
+    Args:
+        chemin (str): Fichier polaire.
+
+    Returns:
+        tuple[float | None, float | None]: (Reynolds, Mach), None pour une valeur introuvable.
+    """
+    try:
+        with open(chemin, "r", encoding="utf-8", errors="ignore") as f:
+            for _, ligne in zip(range(20), f):
+                correspondance = _MOTIF_REYNOLDS.search(ligne)
+                if correspondance:
+                    reynolds = float(correspondance.group(1)) * 10 ** int(correspondance.group(2))
+                    mach = _MOTIF_MACH.search(ligne)
+                    return reynolds, float(mach.group(1)) if mach else None
+    except OSError:
+        pass
+    return None, None
+
+
+class IndexProfils:
+    """
+    Index persistant slug -> fichiers de coordonnées et polaires.
+
+    Chaque entrée a la forme :
+    ``{"type": "importe", "coordonnees": {"dat": ..., "csv": ...},
+    "polaires": [{"fichier": ..., "source": "xfoil", "reynolds": 100000.0, "mach": 0.0}]}``
+    où les chemins sont relatifs au dossier data/.
+
+    Attributes:
+        dossier (str): Dossier data/ indexé.
+        fichier (str): Fichier JSON de l'index.
+        reconstruit (bool): True si l'index a été reconstruit depuis les dossiers lors de son chargement.
+    """
+    def __init__(self, dossier=None, fichier=None):
+        self.dossier = os.path.abspath(dossier or Dossier_data)
+        self.fichier = fichier or os.path.join(self.dossier, "index_profils.json")
+        self._verrou = threading.RLock()
+        self._entrees = {}
+        self._dates = {}
+        self.reconstruit = False
+        self.charger()
+
+    # ------------------------------------------------------------------ persistance
+    def _dates_dossiers(self):
+        dates = {}
+        for nom_dossier in DOSSIERS_INDEXES:
+            chemin = os.path.join(self.dossier, nom_dossier)
+            dates[nom_dossier] = os.path.getmtime(chemin) if os.path.isdir(chemin) else None
+        return dates
+
+    def charger(self):
+        """
+        Charge l'index depuis le disque, ou le reconstruit s'il est absent ou périmé.
+        """
+        with self._verrou:
+            try:
+                with open(self.fichier, "r", encoding="utf-8") as f:
+                    contenu = json.load(f)
+                self._entrees = contenu["profils"]
+                self._dates = contenu["dossiers"]
+            except (OSError, ValueError, KeyError):
+                self.reconstruire()
+                return
+
+            if self._dates != self._dates_dossiers():
+                self.reconstruire()
+
+    def sauvegarder(self):
+        """
+        Écrit l'index sur le disque (remplacement atomique).
+        """
+        with self._verrou:
+            os.makedirs(os.path.dirname(self.fichier), exist_ok=True)
+            temporaire = f"{self.fichier}.tmp"
+            with open(temporaire, "w", encoding="utf-8") as f:
+                json.dump({"dossiers": self._dates, "profils": self._entrees}, f, indent=1, sort_keys=True)
+            os.replace(temporaire, self.fichier)
+
+    def reconstruire(self):
+        """
+        Reconstruit entièrement l'index en parcourant les dossiers de data/.
+        """
+        with self._verrou:
+            self._entrees = {}
+            for nom_dossier in DOSSIERS_INDEXES:
+                chemin_dossier = os.path.join(self.dossier, nom_dossier)
+                if not os.path.isdir(chemin_dossier):
+                    continue
+                for nom_fichier in os.listdir(chemin_dossier):
+                    self._indexer(nom_dossier, nom_fichier)
+            self._dates = self._dates_dossiers()
+            self.sauvegarder()
+            self.reconstruit = True
+
+    # ------------------------------------------------------------------ mise à jour
+    def _indexer(self, nom_dossier, nom_fichier):
+        """Ajoute un fichier à l'index en mémoire ; retourne son slug, ou None s'il n'est pas reconnu."""
+        categorie, role = DOSSIERS_INDEXES[nom_dossier]
+        analyse = analyser_nom_fichier(nom_fichier)
+        if analyse is None:
+            return None
+        slug, extension = analyse
+        relatif = os.path.join(nom_dossier, nom_fichier)
+
+        if role == "coordonnees":
+            entree = self._entrees.setdefault(slug, {"type": categorie, "coordonnees": {}, "polaires": []})
+            entree["type"] = categorie
+            entree["coordonnees"][extension] = relatif
+        elif extension == "txt":
+            entree = self._entrees.setdefault(slug, {"type": None, "coordonnees": {}, "polaires": []})
+            reynolds, mach = lire_conditions(os.path.join(self.dossier, relatif))
+            entree["polaires"] = [p for p in entree["polaires"] if p["fichier"] != relatif]
+            entree["polaires"].append({"fichier": relatif, "source": categorie, "reynolds": reynolds, "mach": mach})
+        else:
+            return None
+        return slug
+
+    def ajouter_fichier(self, chemin):
+        """
+        Met à jour l'index après l'enregistrement d'un fichier dans data/.
+
+        Les fichiers situés hors des dossiers indexés sont ignorés.
+
+        Args:
+            chemin (str): Chemin du fichier enregistré.
+
+        Returns:
+            str | None: Slug du profil concerné, ou None si le fichier n'a pas été indexé.
+        """
+        return self.ajouter_fichiers([chemin])[0]
+
+    def ajouter_fichiers(self, chemins):
+        """
+        Met à jour l'index pour un lot de fichiers enregistrés dans data/ (une seule écriture de l'index).
+
+        Args:
+            chemins (iterable[str]): Chemins des fichiers enregistrés.
+
+        Returns:
+            list[str | None]: Slug de chaque fichier, ou None s'il n'a pas été indexé.
+        """
+        slugs = []
+        with self._verrou:
+            for chemin in chemins:
+                chemin = os.path.abspath(chemin)
+                nom_dossier = os.path.basename(os.path.dirname(chemin))
+                if os.path.dirname(os.path.dirname(chemin)) != self.dossier or nom_dossier not in DOSSIERS_INDEXES:
+                    slugs.append(None)
+                    continue
+                slug = self._indexer(nom_dossier, os.path.basename(chemin))
+                if slug is not None:
+                    self._dates[nom_dossier] = os.path.getmtime(os.path.dirname(chemin))
+                slugs.append(slug)
+            if any(slug is not None for slug in slugs):
+                self.sauvegarder()
+        return slugs
+
+    # ------------------------------------------------------------------ recherche
+    def resoudre(self, nom_profil):
+        """
+        Trouve le slug indexé correspondant à un nom saisi (en testant ses variantes par priorité).
+
+        Args:
+            nom_profil (str): Nom saisi (ex : '2412').
+
+        Returns:
+            str | None: Slug indexé, ou None si le profil n'est pas dans la base.
+        """
+        with self._verrou:
+            for variante in variantes_nom(nom_profil):
+                if variante in self._entrees:
+                    return variante
+        return None
+
+    def entree(self, nom_profil):
+        """
+        Args:
+            nom_profil (str): Nom saisi.
+
+        Returns:
+            dict | None: Entrée de l'index (chemins relatifs à data/), ou None.
+        """
+        slug = self.resoudre(nom_profil)
+        return None if slug is None else self._entrees[slug]
+
+    def chemin_coordonnees(self, nom_profil, extension="dat"):
+        """
+        Args:
+            nom_profil (str): Nom saisi.
+            extension (str, optional): 'dat' ou 'csv'.
+
+        Returns:
+            str | None: Chemin absolu du fichier de coordonnées, ou None.
+        """
+        entree = self.entree(nom_profil)
+        if entree is None or extension not in entree["coordonnees"]:
+            return None
+        return os.path.join(self.dossier, entree["coordonnees"][extension])
+
+    def chemin_polaire(self, nom_profil, reynolds=None, sources=("importee", "xfoil")):
+        """
+        Retourne une polaire du profil, en privilégiant l'ordre des sources.
+
+        Args:
+            nom_profil (str): Nom saisi.
+            reynolds (float, optional): Si fourni, seule une polaire à ce Reynolds (à 1 % près) est retenue.
+            sources (tuple, optional): Sources acceptées, par ordre de préférence.
+
+        Returns:
+            str | None: Chemin absolu de la polaire, ou None.
+        """
+        entree = self.entree(nom_profil)
+        if entree is None:
+            return None
+        for source in sources:
+            for polaire in entree["polaires"]:
+                if polaire["source"] != source:
+                    continue
+                if reynolds is not None and (polaire["reynolds"] is None
+                                             or abs(polaire["reynolds"] - reynolds) > 0.01 * reynolds):
+                    continue
+                return os.path.join(self.dossier, polaire["fichier"])
+        return None
+
+    def reynolds_disponibles(self, nom_profil):
+        """
+        Args:
+            nom_profil (str): Nom saisi.
+
+        Returns:
+            list[float]: Reynolds des polaires connues du profil, triés.
+        """
+        entree = self.entree(nom_profil)
+        if entree is None:
+            return []
+        return sorted({p["reynolds"] for p in entree["polaires"] if p["reynolds"] is not None})
+
+    def entrees(self):
+        """
+        Returns:
+            dict: Copie de toutes les entrées de l'index, par slug.
+        """
+        with self._verrou:
+            return json.loads(json.dumps(self._entrees))
+
+    def entree_slug(self, slug):
+        """
+        Args:
+            slug (str): Slug exact (sans résolution des variantes).
+
+        Returns:
+            dict | None: Copie de l'entrée, ou None.
+        """
+        with self._verrou:
+            entree = self._entrees.get(slug)
+            return None if entree is None else json.loads(json.dumps(entree))
+
+    def slugs(self, type_profil=None):
+        """
+        Args:
+            type_profil (str, optional): Filtre sur le type ('importe', 'manuel', 'givre').
+
+        Returns:
+            list[str]: Slugs indexés, triés.
+        """
+        with self._verrou:
+            return sorted(s for s, e in self._entrees.items() if type_profil is None or e["type"] == type_profil)
+
+
+_index_defaut = None
+_gestion_defaut = None
+_verrou_defaut = threading.Lock()
+
+
+def _gestion():
+    """
+    GestionBase partagée par l'indexation (créée au premier appel) : le catalogue n'est ouvert et vérifié
+    qu'une fois, et non à chaque fichier enregistré.
+    """
+    global _gestion_defaut
+    if _gestion_defaut is None:
+        # Construite hors du verrou : un catalogue neuf se synchronise avec index_defaut() dès sa création
+        gestion = GestionBase()
+        with _verrou_defaut:
+            if _gestion_defaut is None:
+                _gestion_defaut = gestion
+    return _gestion_defaut
+
+
+def index_defaut():
+    """
+    Retourne l'index partagé de l'application (chargé au premier appel).
+
+    Returns:
+        IndexProfils: Index du dossier data/ du paquet.
+    """
+    global _index_defaut
+    with _verrou_defaut:
+        if _index_defaut is not None:
+            return _index_defaut
+        index = _index_defaut = IndexProfils()
+
+    # Des fichiers ont été ajoutés ou supprimés hors de l'application : le catalogue est remis à jour
+    if index.reconstruit:
+        _gestion().synchroniser_index(index)
+    return index
+
+
+def indexer_fichier(chemin):
+    """
+    Signale à l'index partagé (et au catalogue SQLite de GestionBase) qu'un fichier vient d'être enregistré.
+
+    Args:
+        chemin (str): Chemin du fichier.
+    """
+    try:
+        index = index_defaut()
+        slug = index.ajouter_fichier(chemin)
+        if slug is not None:
+            _gestion().synchroniser_entree(slug, index.entree_slug(slug), index.dossier)
+    except (OSError, sqlite3.Error) as e:
+        print(f"[ERREUR] Indexation impossible pour {chemin} : {e}")
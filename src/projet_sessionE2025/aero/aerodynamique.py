@@ -1,11 +1,23 @@
 import requests
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from io import StringIO
 import subprocess
 import os
+import shutil
+import tempfile
+import threading
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from projet_sessionE2025.aero.cache_polaires import empreinte_geometrie, polaire_non_vide
+from projet_sessionE2025.aero.metriques import calculer_metriques
+from projet_sessionE2025.BaseDonnees.gestion_base import polaires_importees
+from projet_sessionE2025.BaseDonnees.index_profils import variantes_nom, index_defaut, indexer_fichier
+
 # ─────────── dossier pour les imports AirfoilTools ───────────
 # (tous les .txt générés par telecharger_et_sauvegarder_txt iront ici)
 dossier_data = "data/"
@@ -15,6 +27,198 @@ sous_dossier_data_genere = os.path.join("data", "profils_manuels")
 os.makedirs(sous_dossier_data_import, exist_ok=True)
 # ─────────────────────────────────────────────────────────────
 
+# Paramètres fixes du script XFOIL (ils font partie de la clé du cache de polaires)
+ITERATIONS_XFOIL = 70
+PANNEAUX_XFOIL = "MDES-FILT+PANE"  # lissage MDES/FILT puis panneautage PANE par défaut
+
+
+def _chemin_xfoil():
+    """
+    Retourne le chemin de l'exécutable XFOIL livré dans le dossier 'projet_sessionE2025'.
+    """
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+    PACKAGE_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))  # ← remonte au dossier 'projet_sessionE2025'
+    return os.path.join(PACKAGE_ROOT, "xfoil.exe")
+
+
+def _copier_polaire(source, destination):
+    """
+    Copie une polaire vers son fichier de destination et la déclare à l'index de la base.
+    """
+    shutil.copyfile(source, destination)
+    indexer_fichier(destination)
+
+
+def _script_xfoil(dat_file, reynolds, mach, alpha_start, alpha_end, alpha_step, output_file, iterations=ITERATIONS_XFOIL):
+    """
+    Construit le script de commandes envoyé à XFOIL sur son entrée standard.
+
+    Args:
+        dat_file (str): Fichier .dat du profil (relatif au dossier de travail de XFOIL).
+        reynolds (float): Nombre de Reynolds.
+        mach (float): Nombre de Mach.
+        alpha_start, alpha_end, alpha_step (float): Balayage en angle d'attaque (°).
+        output_file (str): Fichier PACC où XFOIL accumule la polaire.
+        iterations (int): Nombre maximal d'itérations visqueuses par angle.
+
+    Returns:
+        str: Script XFOIL complet.
+    """
+    return f"""
+        LOAD {dat_file}
+        MDES
+        FILT
+        EXEC
+        
+        PANE
+        OPER
+        ITER {iterations}
+        RE {reynolds}
+        VISC {reynolds}
+        MACH {mach}
+        PACC
+        {output_file}
+        
+        ASEQ {alpha_start} {alpha_end} {alpha_step}
+
+
+        QUIT
+        """
+
+
+def _meta_polaire(nom, dat_file, reynolds, mach, alpha_start, alpha_end, alpha_step):
+    """
+    Rassemble les métadonnées enregistrées avec une polaire dans le cache.
+
+    Returns:
+        dict: Profil, empreinte géométrique, conditions et balayage de la polaire.
+    """
+    return {
+        "profil": nom,
+        "geometrie": empreinte_geometrie(dat_file),
+        "reynolds": float(reynolds),
+        "mach": float(mach),
+        "alpha_start": float(alpha_start),
+        "alpha_end": float(alpha_end),
+        "alpha_step": float(alpha_step),
+        "iter": ITERATIONS_XFOIL,
+        "panneaux": PANNEAUX_XFOIL,
+    }
+
+
+def _analyser_ligne_polaire(ligne, n_colonnes):
+    """
+    Convertit une ligne de données d'un fichier polaire en flottants.
+
+    Args:
+        ligne (str): Ligne brute du fichier.
+        n_colonnes (int): Nombre de colonnes attendu (celui de l'en-tête).
+
+    Returns:
+        tuple[float] | None: Valeurs de la ligne, ou None si ce n'est pas une ligne de données.
+    """
+    parties = ligne.split()
+    if len(parties) != n_colonnes:
+        return None
+    try:
+        return tuple(float(p) for p in parties)
+    except ValueError:
+        return None  # ligne de séparation "------" ou texte
+
+
+def lire_polaire_en_continu(chemin, est_termine=None, intervalle=0.05):
+    """
+    Lit un fichier polaire en cours d'écriture et produit chaque point dès qu'il y est ajouté.
+
+    XFOIL ajoute une ligne au fichier PACC à chaque angle convergé : le fichier est relu à partir
+    de la dernière position connue jusqu'à ce que ``est_termine()`` renvoie True.
+
+    Args:
+        chemin (str): Fichier polaire (il peut ne pas encore exister).
+        est_termine (callable, optional): Fonction sans argument indiquant que l'écriture est finie.
+            Par défaut, le fichier est lu une seule fois.
+        intervalle (float, optional): Pause (s) entre deux relectures du fichier.
+
+    Yields:
+        dict: Point de la polaire, ex. ``{"alpha": 2.0, "CL": 0.45, "CD": 0.0071, ...}`` en flottants.
+    """
+    colonnes = None
+    position = 0
+    reste = ""
+    while True:
+        # On lit l'état AVANT le fichier pour ne pas perdre les dernières lignes écrites
+        termine = est_termine is None or est_termine()
+
+        if os.path.exists(chemin):
+            with open(chemin, "r", encoding="utf-8", errors="ignore") as f:
+                f.seek(position)
+                reste += f.read()
+                position = f.tell()
+
+            *lignes, reste = reste.split("\n")
+            if termine:
+                lignes.append(reste)  # dernière ligne sans retour chariot
+                reste = ""
+            for ligne in lignes:
+                if colonnes is None:
+                    if ligne.strip().lower().startswith("alpha"):
+                        colonnes = ligne.split()
+                    continue
+                valeurs = _analyser_ligne_polaire(ligne, len(colonnes))
+                if valeurs is not None:
+                    yield dict(zip(colonnes, valeurs))
+
+        if termine:
+            return
+        time.sleep(intervalle)
+
+
+def detecter_decrochage(points, chute_cl=0.05, nb_points=2):
+    """
+    Détecte le décrochage dans une polaire en cours de calcul (balayage en alpha croissant).
+
+    Le décrochage est déclaré lorsque les ``nb_points`` derniers points sont tous sous le CL maximal
+    atteint, avec une chute d'au moins ``chute_cl`` par rapport à ce maximum.
+
+    Args:
+        points (list[dict]): Points déjà reçus (clés "alpha" et "CL").
+        chute_cl (float, optional): Perte de portance minimale après le maximum.
+        nb_points (int, optional): Nombre de points consécutifs après le maximum.
+
+    Returns:
+        bool: True si le profil a décroché.
+    """
+    if len(points) <= nb_points:
+        return False
+    cls = np.array([p["CL"] for p in points])
+    i_max = int(np.argmax(cls))
+    derniers = cls[-nb_points:]
+    return i_max < len(cls) - nb_points and bool(np.all(derniers < cls[i_max] - chute_cl))
+
+
+def _normaliser_tache(tache):
+    """
+    Convertit une tâche XFOIL (tuple ou dictionnaire) en dictionnaire complet.
+
+    Args:
+        tache (tuple | dict): ``(dat_file, reynolds, mach[, alpha_start, alpha_end, alpha_step])`` ou dictionnaire.
+
+    Returns:
+        dict: Tâche avec les clés dat_file, reynolds, mach, alpha_start, alpha_end, alpha_step, output_file.
+    """
+    if not isinstance(tache, dict):
+        cles = ["dat_file", "reynolds", "mach", "alpha_start", "alpha_end", "alpha_step"]
+        tache = dict(zip(cles, tache))
+
+    normalisee = {"alpha_start": -6, "alpha_end": 15, "alpha_step": 0.5, "output_file": None}
+    normalisee.update(tache)
+    # Les chemins relatifs sont résolus depuis le dossier courant, avant le passage en dossier temporaire.
+    normalisee["dat_file"] = os.path.abspath(normalisee["dat_file"])
+    if normalisee["output_file"]:
+        normalisee["output_file"] = os.path.abspath(normalisee["output_file"])
+    return normalisee
+
+
 class Aerodynamique:
     """
     Classe pour analyser les performances aérodynamiques d’un profil via AirfoilTools ou XFOIL.
@@ -134,34 +338,19 @@ class Aerodynamique:
     def telecharger_et_sauvegarder_txt(self, re=50000):
         """
         Télécharge la polaire aérodynamique (format .txt) depuis AirfoilTools.
-        Teste toutes les combinaisons possibles de nom de profil jusqu'à trouver un fichier valide.
-        """
-        suffixes = ['', '-il', '-sa', '-sm', 'h-sa', 'sm-il', '-jf','a-il']
-        prefixes = ['naca', 'n']
-        lettres_variante = ['h', 'sm']
-
-        code_brut = self.nom.lower().replace("naca", "").replace("n", "")
-
-        essais = []
-
-        # Patterns classiques
-        for prefix in prefixes:
-            for suffix in suffixes:
-                essais.append(f"{prefix}{code_brut}{suffix}")
-        essais.append(code_brut)  # Tester aussi le code brut seul
-
-        # Ajout de variantes avec 'h' et 'sm' pour les profils à 4 chiffres
-        if code_brut.isdigit() and len(code_brut) == 4:
-            for prefix in prefixes:
-                for lettre in lettres_variante:
-                    for suffix in suffixes:
-                        essais.append(f"{prefix}{code_brut}{lettre}{suffix}")
-            for lettre in lettres_variante:
-                essais.append(f"{code_brut}{lettre}")
-                for suffix in suffixes:
-                    essais.append(f"{code_brut}{lettre}{suffix}")
-
-        dossier = os.path.join("data", "polaires_importees")
+        Une polaire déjà présente dans la base au même Reynolds est réutilisée sans requête ;
+        sinon, les variantes du nom de profil sont testées jusqu'à trouver un fichier valide.
+        """
+        index = index_defaut()
+        chemin = index.chemin_polaire(self.nom, reynolds=re, sources=("importee",))
+        if chemin and os.path.exists(chemin):
+            code_url = index.resoudre(self.nom)
+            print(f"[INFO] Polaire trouvée dans la base : {chemin}")
+            return chemin, code_url
+
+        essais = variantes_nom(self.nom)
+
+        dossier = polaires_importees
         os.makedirs(dossier, exist_ok=True)
 
         for code_url in essais:
@@ -179,6 +368,7 @@ class Aerodynamique:
                 with open(chemin, "w", encoding="utf-8") as fichier:
                     fichier.write(contenu)
                 print(f"[INFO] Polaire trouvée et enregistrée: {url_txt}")
+                indexer_fichier(chemin)
                 return chemin, code_url
 
         raise Exception(f"Aucune version de polaire trouvée pour le profil {self.nom} (Re={re})")
@@ -194,8 +384,6 @@ class Aerodynamique:
             pd.DataFrame: Tableau structuré des performances.
         """
         import os
-        lignes = []
-        commencer = False
         chemin = nom_fichier_txt
 
         # 1. Vérifie que le fichier existe AVANT d'ouvrir
@@ -205,37 +393,35 @@ class Aerodynamique:
             print("Fichiers disponibles :", os.listdir(os.path.dirname(chemin)))
             return None
 
+        colonnes = None
+        lignes_donnees = []
         with open(chemin, "r", encoding="utf-8") as f:
             for ligne in f:
-                ligne = ligne.strip()
-                if not ligne:
-                    continue  # ignorer les lignes vides
-                if ligne.lower().startswith("alpha"):
-                    commencer = True
-                    lignes.append(ligne)
-                elif commencer:
-                    if all(c in "- " for c in ligne):
-                        continue  # ignorer ligne de séparation visuelle
-                    lignes.append(ligne)
+                if colonnes is None:
+                    if ligne.strip().lower().startswith("alpha"):
+                        colonnes = ligne.split()
+                    continue
+                if ligne.strip():
+                    lignes_donnees.append(ligne)
 
         # 2. Vérifie qu'il y a des données à parser
-        if not lignes:
+        if colonnes is None:
             print(f"[ERREUR] Aucun bloc de données détecté dans : {chemin}")
             return None
 
         try:
-            colonnes = lignes[0].split()
-            data = [l.split() for l in lignes[1:]]
+            # Conversion directe en flottants ; les lignes de séparation "------" sont écartées
+            valeurs = [_analyser_ligne_polaire(l, len(colonnes)) for l in lignes_donnees]
+            data = [v for v in valeurs if v is not None]
 
             # 3. Check cohérence colonnes/données
-            if not data or len(data[0]) != len(colonnes):
+            if not data:
                 print(f"[ERREUR] Données mal formatées dans : {chemin}")
                 print("En-tête :", colonnes)
-                print("Première ligne de data :", data[0] if data else "Aucune donnée")
+                print("Première ligne de data :", lignes_donnees[0].split() if lignes_donnees else "Aucune donnée")
                 return None
 
-            df = pd.DataFrame(data, columns=colonnes)
-            df = df.astype(float)
+            df = pd.DataFrame(np.array(data, dtype=float).reshape(-1, len(colonnes)), columns=colonnes)
             print(f"[OK] Données extraites : {len(df)} lignes, colonnes : {df.columns.tolist()}")
             return df
 
@@ -276,11 +462,105 @@ class Aerodynamique:
 
         return fig
 
-    def run_xfoil(self, dat_file, reynolds, mach, alpha_start=-6, alpha_end=15, alpha_step=0.5, output_file="polar_output.txt"):
+    def run_xfoil_en_continu(self, dat_file, reynolds, mach, alpha_start=-6, alpha_end=15, alpha_step=0.5,
+                             output_file=None, arret_decrochage=False, timeout=120, cache=None, forcer=False):
+        """
+        Exécute XFOIL et produit les points de la polaire au fur et à mesure de leur convergence.
+
+        À la fin du balayage (ou de son interruption), ``self.donnees`` contient la polaire reçue.
+        Une polaire interrompue au décrochage n'est ni copiée dans ``output_file`` ni mise en cache.
+
+        Args:
+            dat_file (str): Chemin vers le fichier .dat du profil.
+            reynolds (float): Nombre de Reynolds.
+            mach (float): Nombre de Mach.
+            alpha_start, alpha_end, alpha_step (float): Balayage en angle d'attaque (°).
+            output_file (str, optional): Fichier où copier la polaire complète.
+            arret_decrochage (bool, optional): Si True, arrête XFOIL dès que le décrochage est détecté.
+            timeout (float, optional): Durée maximale (s) de la simulation.
+            cache (CachePolaires, optional): Cache de polaires consulté avant de lancer XFOIL.
+            forcer (bool, optional): Si True, ignore le cache.
+
+        Yields:
+            dict: Point de la polaire (alpha, CL, CD, CDp, CM, Top_Xtr, Bot_Xtr).
+        """
+        tache = _normaliser_tache((dat_file, reynolds, mach, alpha_start, alpha_end, alpha_step))
+        points = []
+
+        cle = None
+        if cache is not None:
+            try:
+                cle = cache.cle(tache["dat_file"], reynolds, mach, alpha_start, alpha_end, alpha_step,
+                                iterations=ITERATIONS_XFOIL, panneaux=PANNEAUX_XFOIL)
+            except FileNotFoundError as e:
+                print(f"[ERREUR] Fichier introuvable pour la simulation XFOIL : {e}")
+                return
+            chemin_cache = None if forcer else cache.obtenir(cle)
+            if chemin_cache:
+                for point in lire_polaire_en_continu(chemin_cache):
+                    points.append(point)
+                    yield point
+                if output_file:
+                    _copier_polaire(chemin_cache, output_file)
+                self.donnees = pd.DataFrame(points)
+                return
+
+        dossier_tmp = tempfile.mkdtemp(prefix="xfoil_")
+        chemin_polaire = os.path.join(dossier_tmp, "polaire.txt")
+        processus = None
+        interrompu = False
+        try:
+            shutil.copyfile(tache["dat_file"], os.path.join(dossier_tmp, "profil.dat"))
+            processus = subprocess.Popen(
+                [_chemin_xfoil()],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=dossier_tmp
+            )
+            processus.stdin.write(_script_xfoil("profil.dat", reynolds, mach, alpha_start, alpha_end,
+                                                alpha_step, "polaire.txt").encode())
+            processus.stdin.close()
+
+            limite = time.monotonic() + timeout
+
+            def est_termine():
+                return processus.poll() is not None or time.monotonic() > limite
+
+            for point in lire_polaire_en_continu(chemin_polaire, est_termine):
+                points.append(point)
+                yield point
+                if arret_decrochage and detecter_decrochage(points):
+                    print(f"[INFO] Décrochage détecté à α = {point['alpha']}°, arrêt de XFOIL.")
+                    interrompu = True
+                    break
+
+            if processus.poll() is None and not interrompu:
+                print(f"[ERREUR] XFOIL a dépassé {timeout} s, arrêt de la simulation.")
+                interrompu = True
+
+            # Seule une polaire complète, d'un XFOIL sorti normalement et avec au moins un point, est conservée
+            if not interrompu and processus.wait() == 0 and points:
+                if output_file:
+                    _copier_polaire(chemin_polaire, output_file)
+                if cache is not None:
+                    cache.enregistrer(cle, chemin_polaire, _meta_polaire(self.nom, tache["dat_file"], reynolds, mach,
+                                                                         alpha_start, alpha_end, alpha_step))
+        except FileNotFoundError as e:
+            print(f"[ERREUR] Fichier introuvable pour la simulation XFOIL : {e}")
+        finally:
+            if processus is not None and processus.poll() is None:
+                processus.kill()
+                processus.wait()
+            shutil.rmtree(dossier_tmp, ignore_errors=True)
+            self.donnees = pd.DataFrame(points) if points else None
+
+    def run_xfoil(self, dat_file, reynolds, mach, alpha_start=-6, alpha_end=15, alpha_step=0.5, output_file="polar_output.txt",
+                  cache=None, forcer=False):
         """
         Exécute XFOIL issu d'un fichier .dat et enregistre les résultats dans un fichier texte.
 
-           Args:More actions
+           Args:
             dat_file (str): Chemin vers le fichier .dat du profil.
             reynolds (float): Nombre de Reynolds.
             mach (float): Nombre de Mach.
@@ -288,33 +568,33 @@ class Aerodynamique:
             alpha_end (float): Angle de fin (°).
             alpha_step (float): Incrément d’angle (°).
             output_file (str): Fichier de sortie des résultats.
+            cache (CachePolaires, optional): Cache de polaires consulté avant de lancer XFOIL.
+            forcer (bool, optional): Si True, ignore le cache et relance XFOIL.
         """
-        BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-        PACKAGE_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))  # ← remonte au dossier 'projet_sessionE2025'
-        #xfoil_path = Path(__file__).parent.parent.parent / "xfoil.exe"  # Remonte jusqu'à la racine
-        xfoil_path = os.path.join(PACKAGE_ROOT, "xfoil.exe")
-
-        # Script pour XFOIL
-        xfoil_input = f"""
-        LOAD {dat_file}
-        MDES
-        FILT
-        EXEC
-        
-        PANE
-        OPER
-        ITER 70
-        RE {reynolds}
-        VISC {reynolds}
-        MACH {mach}
-        PACC
-        {output_file}
-        
-        ASEQ {alpha_start} {alpha_end} {alpha_step}
+        xfoil_path = _chemin_xfoil()
+        # XFOIL est lancé depuis son propre dossier : les chemins relatifs sont résolus depuis celui-ci
+        chemin_dat = os.path.join(os.path.dirname(xfoil_path), dat_file)
+        chemin_sortie = os.path.join(os.path.dirname(xfoil_path), output_file)
 
+        cle = None
+        if cache is not None:
+            try:
+                cle = cache.cle(chemin_dat, reynolds, mach, alpha_start, alpha_end, alpha_step,
+                                iterations=ITERATIONS_XFOIL, panneaux=PANNEAUX_XFOIL)
+            except FileNotFoundError as e:
+                print(f"[ERREUR] Fichier introuvable pour la simulation XFOIL : {e}")
+                return None
+            chemin_cache = None if forcer else cache.obtenir(cle)
+            if chemin_cache:
+                _copier_polaire(chemin_cache, chemin_sortie)
+                print(f"[INFO] Polaire servie depuis le cache. Résultats dans : {output_file}")
+                return output_file
+            # XFOIL ajoute les points à un fichier PACC existant : on repart d'un fichier vierge
+            if os.path.exists(chemin_sortie):
+                os.remove(chemin_sortie)
 
-        QUIT
-        """
+        # Script pour XFOIL
+        xfoil_input = _script_xfoil(dat_file, reynolds, mach, alpha_start, alpha_end, alpha_step, output_file)
 
         try:
             result = subprocess.run(
@@ -328,26 +608,435 @@ class Aerodynamique:
                 print("Erreur XFOIL :", result.stderr.decode())
             else:
                 print(f"Analyse XFOIL terminée. Résultats dans : {output_file}")
+                indexer_fichier(chemin_sortie)
+                # XFOIL sort normalement même sans aucun angle convergé : une polaire vide n'est pas mise en cache
+                if cache is not None and os.path.exists(chemin_sortie) and polaire_non_vide(chemin_sortie):
+                    cache.enregistrer(cle, chemin_sortie, _meta_polaire(self.nom, chemin_dat, reynolds, mach,
+                                                                         alpha_start, alpha_end, alpha_step))
                 return output_file
         except FileNotFoundError:
             print("XFOIL introuvable. Vérifie le chemin ou l'existence de xfoil.exe.")
 
-    def calculer_finesse(self, nom_fichier):
+    def run_xfoil_lot(self, taches, max_workers=None, timeout=120, cache=None, forcer=False, pool=None):
+        """
+        Exécute un lot de simulations XFOIL en parallèle et renvoie les polaires dans l'ordre des tâches.
+
+        Chaque tâche tourne dans son propre dossier temporaire (XFOIL écrit le fichier PACC
+        relativement à son dossier courant), avec au plus ``max_workers`` processus XFOIL actifs.
+
+        Args:
+            taches (list): Tâches sous forme de tuples ``(dat_file, reynolds, mach, alpha_start, alpha_end, alpha_step)``
+                ou de dictionnaires avec les mêmes clés (+ ``output_file`` optionnel pour conserver la polaire,
+                ``profil`` optionnel pour le nom enregistré dans le cache quand le lot mêle plusieurs profils).
+            max_workers (int, optional): Nombre maximal de processus XFOIL simultanés (par défaut : nombre de cœurs).
+            timeout (float, optional): Durée maximale (s) accordée à chaque simulation.
+            cache (CachePolaires, optional): Cache consulté avant chaque simulation et alimenté après.
+            forcer (bool, optional): Si True, ignore le cache et relance toutes les simulations.
+            pool (PoolXfoil, optional): Pool de sessions XFOIL déjà lancées ; évite de démarrer un processus par tâche.
+
+        Returns:
+            list[pd.DataFrame | None]: Une polaire par tâche, ``None`` si la simulation a échoué.
+        """
+        taches = [_normaliser_tache(tache) for tache in taches]
+        if not taches:
+            return []
+
+        if pool is not None:
+            max_workers = pool.n_sessions
+        max_workers = max_workers or os.cpu_count() or 1
+        max_workers = min(max_workers, len(taches))
+
+        # Chaque thread ne fait qu'attendre son processus XFOIL : le pool borne le nombre de XFOIL lancés.
+        with ThreadPoolExecutor(max_workers=max_workers) as executeur:
+            futures = [executeur.submit(self._executer_tache_xfoil, tache, timeout, cache, forcer, pool)
+                       for tache in taches]
+            resultats = [future.result() for future in futures]
+
+        nb_echecs = sum(df is None for df in resultats)
+        print(f"[INFO] Lot XFOIL terminé : {len(resultats) - nb_echecs}/{len(resultats)} polaires obtenues.")
+        return resultats
+
+    def _executer_tache_xfoil(self, tache, timeout, cache=None, forcer=False, pool=None):
+        """
+        Lance une simulation XFOIL isolée dans un dossier temporaire et lit la polaire produite.
+
+        Args:
+            tache (dict): Tâche normalisée par ``_normaliser_tache``.
+            timeout (float): Durée maximale (s) de la simulation.
+            cache (CachePolaires, optional): Cache de polaires.
+            forcer (bool, optional): Si True, ignore le cache.
+            pool (PoolXfoil, optional): Pool de sessions XFOIL persistantes.
+
+        Returns:
+            pd.DataFrame | None: Polaire obtenue, ou None en cas d'échec.
+        """
+        cle = None
+        try:
+            if cache is not None:
+                cle = cache.cle(tache["dat_file"], tache["reynolds"], tache["mach"], tache["alpha_start"],
+                                tache["alpha_end"], tache["alpha_step"],
+                                iterations=ITERATIONS_XFOIL, panneaux=PANNEAUX_XFOIL)
+                chemin_cache = None if forcer else cache.obtenir(cle)
+                if chemin_cache:
+                    if tache["output_file"]:
+                        _copier_polaire(chemin_cache, tache["output_file"])
+                    return self.lire_txt_et_convertir_dataframe(chemin_cache)
+        except FileNotFoundError as e:
+            print(f"[ERREUR] Fichier introuvable pour la tâche XFOIL : {e}")
+            return None
+
+        dossier_tmp = tempfile.mkdtemp(prefix="xfoil_")
+        try:
+            chemin_polaire = os.path.join(dossier_tmp, "polaire.txt")
+            if pool is not None:
+                pool.calculer(tache, chemin_polaire, timeout=timeout)
+            else:
+                # Noms courts et relatifs : XFOIL tronque les chemins trop longs.
+                shutil.copyfile(tache["dat_file"], os.path.join(dossier_tmp, "profil.dat"))
+                xfoil_input = _script_xfoil("profil.dat", tache["reynolds"], tache["mach"], tache["alpha_start"],
+                                            tache["alpha_end"], tache["alpha_step"], "polaire.txt")
+                resultat = subprocess.run(
+                    [_chemin_xfoil()],
+                    input=xfoil_input.encode(),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    cwd=dossier_tmp,
+                    timeout=timeout
+                )
+                if resultat.returncode != 0:
+                    print(f"[ERREUR] XFOIL s'est terminé avec le code {resultat.returncode} pour {tache['dat_file']} "
+                          f"(Re={tache['reynolds']}, Mach={tache['mach']}) : {resultat.stderr.decode(errors='ignore')}")
+                    return None
+
+            if not os.path.exists(chemin_polaire):
+                print(f"[ERREUR] XFOIL n'a produit aucune polaire pour {tache['dat_file']} "
+                      f"(Re={tache['reynolds']}, Mach={tache['mach']}).")
+                return None
+
+            polaire = self.lire_txt_et_convertir_dataframe(chemin_polaire)
+            if polaire is None or polaire.empty:
+                # Aucun angle convergé : rien à conserver ni à mettre en cache
+                return None
+
+            if tache["output_file"]:
+                _copier_polaire(chemin_polaire, tache["output_file"])
+            if cache is not None:
+                meta = _meta_polaire(tache.get("profil") or self.nom, tache["dat_file"], tache["reynolds"],
+                                     tache["mach"], tache["alpha_start"], tache["alpha_end"], tache["alpha_step"])
+                cache.enregistrer(cle, chemin_polaire, meta)
+
+            return polaire
+
+        except (subprocess.TimeoutExpired, TimeoutError):
+            print(f"[ERREUR] XFOIL a dépassé {timeout} s pour {tache['dat_file']} "
+                  f"(Re={tache['reynolds']}, Mach={tache['mach']}).")
+        except FileNotFoundError as e:
+            print(f"[ERREUR] Fichier introuvable pour la tâche XFOIL : {e}")
+        except RuntimeError as e:
+            print(f"[ERREUR] {e}")
+        finally:
+            shutil.rmtree(dossier_tmp, ignore_errors=True)
+        return None
+
+    def metriques(self, nom_fichier=None):
         """
-        Calcule la finesse aérodynamique maximale à partir d’un fichier texte.
+        Calcule les métriques aérodynamiques de la polaire (finesse max, CL max, pente de portance...).
 
         Args:
-            nom_fichier (str): Chemin vers le fichier de résultats TXT.
+            nom_fichier (str, optional): Fichier polaire TXT ; par défaut, les données déjà chargées (``donnees``).
 
         Returns:
-            tuple: (liste des finesses, finesse maximale)
+            pd.Series: Métriques de ``calculer_metriques`` (NaN si aucune polaire n'est disponible).
+        """
+        data = self.lire_txt_et_convertir_dataframe(nom_fichier) if nom_fichier else self.donnees
+        return calculer_metriques({self.nom: data}).iloc[0]
+
+    def calculer_finesse(self, nom_fichier=None):
+        """
+        Calcule la finesse aérodynamique maximale à partir d’un fichier texte (ou des données déjà chargées).
+
+        Args:
+            nom_fichier (str, optional): Chemin vers le fichier de résultats TXT.
+
+        Returns:
+            tuple: (finesses CL/CD de chaque point (np.ndarray), finesse maximale)
+        """
+        data = self.lire_txt_et_convertir_dataframe(nom_fichier) if nom_fichier else self.donnees
+        finesse = data["CL"].to_numpy() / data["CD"].to_numpy()
+        return finesse, calculer_metriques({self.nom: data})["finesse_max"].iloc[0]
+
+
+class SessionXfoil:
+    """
+    Processus XFOIL interactif maintenu ouvert, piloté par des pipes.
+
+    Le profil chargé et panneauté (LOAD, MDES/FILT/EXEC, PANE) est conservé d'une requête à l'autre :
+    seules les commandes RE/MACH/ASEQ sont renvoyées tant que la géométrie ne change pas.
+
+    Attributes:
+        dossier (str): Dossier de travail propre à la session (fichiers .dat et PACC).
+        timeout (float): Durée maximale (s) d'une requête avant de considérer XFOIL comme bloqué.
+        geometrie (str | None): Empreinte du profil actuellement chargé.
+        processus (subprocess.Popen): Processus XFOIL.
+    """
+    def __init__(self, timeout=120):
+        """
+        Démarre un processus XFOIL dans un dossier temporaire dédié.
+
+        Args:
+            timeout (float, optional): Durée maximale (s) d'une requête.
+        """
+        self.dossier = tempfile.mkdtemp(prefix="xfoil_session_")
+        self.timeout = timeout
+        self.processus = None
+        self.geometrie = None
+        self._visqueux = False
+        self._compteur = 0
+        self._compteur_polaire = 0
+        self._lignes = None
+        try:
+            self._demarrer()
+        except BaseException:
+            # XFOIL n'a pas démarré : le dossier de la session ne servira jamais
+            self._arreter_processus()
+            shutil.rmtree(self.dossier, ignore_errors=True)
+            raise
+
+    def _demarrer(self):
+        """
+        Lance (ou relance) le processus XFOIL et le thread qui lit sa sortie.
+        """
+        # Sortie non bufferisée (XFOIL compilé avec gfortran) pour voir les marqueurs de synchronisation à temps
+        env = dict(os.environ, GFORTRAN_UNBUFFERED_PRECONNECTED="y")
+        self.processus = subprocess.Popen(
+            [_chemin_xfoil()],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=self.dossier,
+            env=env,
+            text=True,
+            bufsize=1
+        )
+        self._lignes = queue.Queue()
+        threading.Thread(target=self._lire_sortie, args=(self.processus, self._lignes), daemon=True).start()
+        self.geometrie = None
+        self._visqueux = False
+
+    @staticmethod
+    def _lire_sortie(processus, lignes):
+        """
+        Recopie la sortie de XFOIL ligne par ligne dans une file (None signale la fin du processus).
+        """
+        for ligne in processus.stdout:
+            lignes.put(ligne)
+        lignes.put(None)
+
+    def est_vivante(self):
+        """
+        Indique si le processus XFOIL tourne toujours.
+        """
+        return self.processus is not None and self.processus.poll() is None
+
+    def recycler(self):
+        """
+        Tue le processus XFOIL (plantage ou blocage) et en démarre un nouveau.
+        """
+        self._arreter_processus()
+        self._demarrer()
+
+    def _arreter_processus(self):
+        if self.processus is None:
+            return
+        if self.processus.poll() is None:
+            self.processus.kill()
+        try:
+            self.processus.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def _envoyer(self, commandes):
+        self.processus.stdin.write("\n".join(commandes) + "\n")
+        self.processus.stdin.flush()
+
+    def _synchroniser(self, timeout):
+        """
+        Envoie une commande inconnue servant de marqueur et attend que XFOIL la rejette.
+
+        XFOIL n'affiche que les 4 premiers caractères d'une commande inconnue : le marqueur tient donc
+        en 4 caractères, et son compteur suffit à le distinguer des marqueurs précédents.
+
+        Raises:
+            TimeoutError: Si XFOIL n'a pas répondu à temps.
+            RuntimeError: Si le processus XFOIL s'est arrêté.
+        """
+        self._compteur = (self._compteur + 1) % 1000
+        marqueur = f"Z{self._compteur:03d}"
+        self._envoyer([marqueur])
+
+        limite = time.monotonic() + timeout
+        while True:
+            reste = limite - time.monotonic()
+            if reste <= 0:
+                raise TimeoutError(f"XFOIL bloqué (aucune réponse en {timeout} s).")
+            try:
+                ligne = self._lignes.get(timeout=reste)
+            except queue.Empty:
+                raise TimeoutError(f"XFOIL bloqué (aucune réponse en {timeout} s).")
+            if ligne is None:
+                raise RuntimeError("Le processus XFOIL s'est arrêté.")
+            if marqueur in ligne.upper():
+                return
+
+    def _charger_geometrie(self, dat_file, empreinte):
+        """
+        Charge, lisse et panneaute un profil, sauf s'il est déjà chargé dans la session.
+        """
+        if empreinte == self.geometrie:
+            return
+        shutil.copyfile(dat_file, os.path.join(self.dossier, "profil.dat"))
+        self.geometrie = None
+        self._envoyer(["LOAD profil.dat", "MDES", "FILT", "EXEC", "", "PANE"])
+        self._synchroniser(self.timeout)
+        self.geometrie = empreinte
+
+    def calculer(self, tache, destination, timeout=None):
+        """
+        Calcule une polaire avec le processus XFOIL de la session.
+
+        Args:
+            tache (dict): Tâche normalisée (dat_file, reynolds, mach, alpha_start, alpha_end, alpha_step).
+            destination (str): Fichier où copier la polaire produite.
+            timeout (float, optional): Durée maximale (s) de la requête (par défaut celle de la session).
+
+        Raises:
+            TimeoutError: Si XFOIL s'est bloqué (la session est alors recyclée).
+            RuntimeError: Si XFOIL s'est arrêté (la session est alors recyclée).
+        """
+        timeout = timeout or self.timeout
+        if not self.est_vivante():
+            self.recycler()
+
+        empreinte = empreinte_geometrie(tache["dat_file"])
+        self._compteur_polaire += 1
+        nom_polaire = f"polaire_{self._compteur_polaire}.txt"
+        chemin_polaire = os.path.join(self.dossier, nom_polaire)
+
+        try:
+            self._charger_geometrie(tache["dat_file"], empreinte)
+
+            # VISC bascule le mode visqueux : une fois activé, on ne change plus que Re
+            commande_re = f"RE {tache['reynolds']}" if self._visqueux else f"VISC {tache['reynolds']}"
+            self._envoyer([
+                "OPER",
+                f"ITER {ITERATIONS_XFOIL}",
+                commande_re,
+                f"MACH {tache['mach']}",
+                "INIT",  # repart d'une couche limite neuve pour chaque requête
+                "PACC", nom_polaire, "",
+                f"ASEQ {tache['alpha_start']} {tache['alpha_end']} {tache['alpha_step']}",
+                "PACC",  # ferme le fichier polaire
+                ""
+            ])
+            self._visqueux = True
+            self._synchroniser(timeout)
+
+            if os.path.exists(chemin_polaire):
+                shutil.copyfile(chemin_polaire, destination)
+        except (TimeoutError, RuntimeError, OSError):
+            self.recycler()
+            raise
+        finally:
+            if os.path.exists(chemin_polaire):
+                os.remove(chemin_polaire)
+
+    def fermer(self):
         """
+        Quitte XFOIL proprement et supprime le dossier de la session.
+        """
+        if self.est_vivante():
+            try:
+                self._envoyer(["", "", "QUIT"])
+                self.processus.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        self._arreter_processus()
+        shutil.rmtree(self.dossier, ignore_errors=True)
 
 
-        data = self.lire_txt_et_convertir_dataframe(nom_fichier)
+class PoolXfoil:
+    """
+    Pool de sessions XFOIL gardées au chaud entre les requêtes.
 
-        finesse = (data["CL"] / data["CD"]).tolist()
+    Une requête est confiée en priorité à une session libre ayant déjà chargé le même profil, ce qui évite
+    de refaire LOAD/MDES/PANE lorsque seuls Re ou Mach changent.
+
+    Attributes:
+        n_sessions (int): Nombre de processus XFOIL maintenus.
+        sessions (list[SessionXfoil]): Sessions du pool.
+    """
+    def __init__(self, n_sessions=None, timeout=120):
+        """
+        Démarre ``n_sessions`` processus XFOIL.
+
+        Args:
+            n_sessions (int, optional): Nombre de sessions (par défaut : nombre de cœurs).
+            timeout (float, optional): Durée maximale (s) d'une requête avant recyclage de la session.
+        """
+        self.n_sessions = n_sessions or os.cpu_count() or 1
+        self.sessions = []
+        try:
+            for _ in range(self.n_sessions):
+                self.sessions.append(SessionXfoil(timeout=timeout))
+        except BaseException:
+            # Une session n'a pas démarré : on arrête celles qui tournent déjà avant de propager l'erreur
+            self.fermer()
+            raise
+        self._libres = list(self.sessions)
+        self._condition = threading.Condition()
+
+    def _acquerir(self, empreinte):
+        with self._condition:
+            while not self._libres:
+                self._condition.wait()
+            for session in self._libres:
+                if session.geometrie == empreinte:
+                    break
+            else:
+                session = self._libres[0]
+            self._libres.remove(session)
+            return session
+
+    def _liberer(self, session):
+        with self._condition:
+            self._libres.append(session)
+            self._condition.notify()
+
+    def calculer(self, tache, destination, timeout=None):
+        """
+        Calcule une polaire sur une session libre du pool.
+
+        Args:
+            tache (tuple | dict): Tâche XFOIL (même format que ``Aerodynamique.run_xfoil_lot``).
+            destination (str): Fichier où copier la polaire produite.
+            timeout (float, optional): Durée maximale (s) de la requête.
+        """
+        tache = _normaliser_tache(tache)
+        session = self._acquerir(empreinte_geometrie(tache["dat_file"]))
+        try:
+            session.calculer(tache, destination, timeout=timeout)
+        finally:
+            self._liberer(session)
+
+    def fermer(self):
+        """
+        Arrête toutes les sessions du pool.
+        """
+        for session in self.sessions:
+            session.fermer()
 
-        finesse_max = max(finesse)
+    def __enter__(self):
+        return self
 
-        return finesse, finesse_max
+    def __exit__(self, *exc):
+        self.fermer()
@@ -0,0 +1,269 @@
+import os
+import json
+import shutil
+import hashlib
+import threading
+import numpy as np
+
+from projet_sessionE2025.BaseDonnees.gestion_base import Dossier_data
+
+"""
+Module : cache_polaires
+
+Cache persistant des polaires XFOIL, adressé par le contenu.
+
+La clé d'une polaire est une empreinte SHA-256 des coordonnées du profil (.dat) et des conditions
+de calcul (Reynolds, Mach, balayage en alpha, ITER, options de panneautage). Deux profils portant le
+même nom mais de géométries différentes, ou un même profil à d'autres Re/Mach, ne peuvent donc
+jamais partager une entrée.
+
+Chaque entrée est stockée dans data/cache_polaires/ sous la forme :
+- <cle>.txt  : fichier PACC produit par XFOIL,
+- <cle>.json : métadonnées (empreinte géométrique, Re, Mach, balayage...).
+
+La date de modification du fichier .txt sert d'horloge LRU : elle est rafraîchie à chaque accès,
+et les entrées les plus anciennes sont supprimées dès que la taille totale dépasse la limite.
+"""
+
+dossier_cache_polaires = os.path.join(Dossier_data, "cache_polaires")
+
+
+def empreinte_geometrie(dat_file):
+    """
+    Calcule l'empreinte des coordonnées d'un fichier .dat (indépendante du nom et du formatage).
+
+    Args:
+        dat_file (str): Chemin du fichier .dat.
+
+    Returns:
+        str: Empreinte hexadécimale SHA-256 des coordonnées.
+    """
+    coordonnees = []
+    with open(dat_file, "r", encoding="utf-8", errors="ignore") as f:
+        for ligne in f:
+            parties = ligne.split()
+            if len(parties) != 2:
+                continue
+            try:
+                coordonnees.append((float(parties[0]), float(parties[1])))
+            except ValueError:
+                continue  # en-tête ou ligne non numérique
+
+    # Arrondi pour que "0.5" et "0.500000" donnent la même empreinte
+    tableau = np.round(np.asarray(coordonnees, dtype=np.float64), 8)
+    return hashlib.sha256(tableau.tobytes()).hexdigest()
+
+
+def polaire_non_vide(chemin_polaire):
+    """
+    Indique si un fichier PACC contient au moins un point convergé (ligne numérique sous l'en-tête "alpha").
+
+    Args:
+        chemin_polaire (str): Fichier polaire produit par XFOIL.
+
+    Returns:
+        bool: True si au moins une ligne de données a pu être lue.
+    """
+    n_colonnes = None
+    with open(chemin_polaire, "r", encoding="utf-8", errors="ignore") as f:
+        for ligne in f:
+            parties = ligne.split()
+            if n_colonnes is None:
+                if parties and parties[0].lower() == "alpha":
+                    n_colonnes = len(parties)
+                continue
+            if len(parties) != n_colonnes:
+                continue
+            try:
+                [float(p) for p in parties]
+            except ValueError:
+                continue  # ligne de séparation "------"
+            return True
+    return False
+
+
+class CachePolaires:
+    """
+    Cache disque des polaires XFOIL avec statistiques et éviction LRU bornée en taille.
+
+    Attributes:
+        dossier (str): Dossier de stockage des entrées.
+        taille_max_octets (int): Taille totale maximale du cache.
+        succes (int): Nombre de polaires servies depuis le cache.
+        echecs (int): Nombre de recherches infructueuses.
+        evictions (int): Nombre d'entrées supprimées par l'éviction LRU.
+    """
+    def __init__(self, dossier=None, taille_max_octets=100 * 1024 * 1024):
+        """
+        Initialise le cache et crée son dossier si nécessaire.
+
+        Args:
+            dossier (str, optional): Dossier du cache (par défaut data/cache_polaires).
+            taille_max_octets (int, optional): Taille maximale du cache (100 Mo par défaut).
+        """
+        self.dossier = dossier or dossier_cache_polaires
+        self.taille_max_octets = taille_max_octets
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+        self._verrou = threading.Lock()
+        os.makedirs(self.dossier, exist_ok=True)
+
+    def cle(self, dat_file, reynolds, mach, alpha_start, alpha_end, alpha_step, iterations=70, panneaux="MDES-FILT+PANE"):
+        """
+        Construit la clé d'une polaire à partir de la géométrie et des conditions de calcul.
+
+        Args:
+            dat_file (str): Fichier .dat du profil.
+            reynolds (float): Nombre de Reynolds.
+            mach (float): Nombre de Mach.
+            alpha_start, alpha_end, alpha_step (float): Balayage en angle d'attaque (°).
+            iterations (int): Valeur de ITER.
+            panneaux (str): Description des options de panneautage appliquées par le script XFOIL.
+
+        Returns:
+            str: Clé hexadécimale.
+        """
+        description = {
+            "geometrie": empreinte_geometrie(dat_file),
+            "reynolds": float(reynolds),
+            "mach": float(mach),
+            "alpha": [float(alpha_start), float(alpha_end), float(alpha_step)],
+            "iter": int(iterations),
+            "panneaux": panneaux,
+        }
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+    def _chemin(self, cle, extension=".txt"):
+        return os.path.join(self.dossier, f"{cle}{extension}")
+
+    def obtenir(self, cle):
+        """
+        Recherche une polaire dans le cache.
+
+        Args:
+            cle (str): Clé calculée par ``cle()``.
+
+        Returns:
+            str | None: Chemin du fichier polaire en cache, ou None si absent.
+        """
+        chemin = self._chemin(cle)
+        with self._verrou:
+            try:
+                os.utime(chemin)  # l'entrée devient la plus récemment utilisée
+            except FileNotFoundError:
+                # absente, ou évincée (par un autre processus) entre-temps
+                self.echecs += 1
+                return None
+            self.succes += 1
+        return chemin
+
+    def enregistrer(self, cle, chemin_polaire, meta=None):
+        """
+        Copie une polaire dans le cache, puis applique l'éviction LRU si la taille maximale est dépassée.
+
+        Args:
+            cle (str): Clé calculée par ``cle()``.
+            chemin_polaire (str): Fichier polaire produit par XFOIL.
+            meta (dict, optional): Métadonnées à conserver avec l'entrée (Re, Mach, profil...).
+
+        Returns:
+            str: Chemin de l'entrée dans le cache.
+
+        Raises:
+            ValueError: Si la polaire ne contient aucun point (XFOIL n'a convergé à aucun angle).
+        """
+        if not polaire_non_vide(chemin_polaire):
+            raise ValueError(f"Polaire vide, non mise en cache : {chemin_polaire}")
+        chemin = self._chemin(cle)
+        # Copie puis renommage atomique : un lecteur concurrent ne voit jamais un fichier partiel
+        temporaire = f"{chemin}.{threading.get_ident()}.tmp"
+        shutil.copyfile(chemin_polaire, temporaire)
+        os.replace(temporaire, chemin)
+
+        if meta is not None:
+            with open(self._chemin(cle, ".json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f, indent=2)
+
+        self._evincer()
+        return chemin
+
+    def _evincer(self):
+        """
+        Supprime les entrées les moins récemment utilisées jusqu'à repasser sous la taille maximale.
+        """
+        with self._verrou:
+            entrees = []
+            total = 0
+            for nom in os.listdir(self.dossier):
+                if not nom.endswith(".txt"):
+                    continue
+                chemin = os.path.join(self.dossier, nom)
+                try:
+                    stat = os.stat(chemin)
+                except FileNotFoundError:
+                    continue
+                entrees.append((stat.st_mtime, stat.st_size, nom[:-len(".txt")]))
+                total += stat.st_size
+
+            entrees.sort()
+            for _, taille, cle in entrees:
+                if total <= self.taille_max_octets:
+                    break
+                for extension in (".txt", ".json"):
+                    try:
+                        os.remove(self._chemin(cle, extension))
+                    except FileNotFoundError:
+                        pass
+                total -= taille
+                self.evictions += 1
+
+    def metadonnees(self):
+        """
+        Liste les métadonnées de toutes les entrées présentes dans le cache.
+
+        Returns:
+            list[dict]: Métadonnées, avec la clé ``cle`` et le chemin ``fichier`` de chaque polaire.
+        """
+        resultats = []
+        for nom in os.listdir(self.dossier):
+            if not nom.endswith(".json"):
+                continue
+            cle = nom[:-len(".json")]
+            if not os.path.exists(self._chemin(cle)):
+                continue
+            try:
+                with open(self._chemin(cle, ".json"), "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            meta.update({"cle": cle, "fichier": self._chemin(cle)})
+            resultats.append(meta)
+        return resultats
+
+    def vider(self):
+        """
+        Supprime toutes les entrées du cache.
+        """
+        with self._verrou:
+            for nom in os.listdir(self.dossier):
+                if nom.endswith((".txt", ".json")):
+                    os.remove(os.path.join(self.dossier, nom))
+
+    def statistiques(self):
+        """
+        Retourne les statistiques d'utilisation du cache.
+
+        Returns:
+            dict: succès, échecs, taux de succès, évictions, nombre d'entrées et taille occupée (octets).
+        """
+        fichiers = [os.path.join(self.dossier, nom) for nom in os.listdir(self.dossier) if nom.endswith(".txt")]
+        total_requetes = self.succes + self.echecs
+        return {
+            "succes": self.succes,
+            "echecs": self.echecs,
+            "taux_succes": self.succes / total_requetes if total_requetes else 0.0,
+            "evictions": self.evictions,
+            "entrees": len(fichiers),
+            "taille_octets": sum(os.path.getsize(f) for f in fichiers if os.path.exists(f)),
+        }
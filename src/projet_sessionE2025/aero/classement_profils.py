@@ -0,0 +1,280 @@
+import sys
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from projet_sessionE2025.BaseDonnees.gestion_base import GestionBase
+from projet_sessionE2025.BaseDonnees.bibliotheque_profils import lire_dat
+from projet_sessionE2025.BaseDonnees.import_profils import normaliser_contour
+from projet_sessionE2025.aero.aerodynamique import Aerodynamique
+from projet_sessionE2025.aero.cache_polaires import CachePolaires, empreinte_geometrie
+from projet_sessionE2025.aero.surface_polaires import SurfacePolaires
+from projet_sessionE2025.aero.metriques import empiler_polaires
+
+"""
+Module : classement_profils
+
+Classement multi-objectif de tous les profils du catalogue pour une condition de mission
+(Reynolds, Mach, plage de CL visée).
+
+Pour chaque profil :
+- polaire à la condition de mission, interpolée depuis le cache XFOIL (SurfacePolaires) ou, sur demande,
+  calculée par XFOIL en parallèle pour les profils sans polaire exploitable ;
+- objectifs : finesse maximale dans la plage de CL (à maximiser), |CM| au point de finesse maximale
+  (à minimiser), épaisseur relative (à maximiser, pour la structure) et marge de décrochage
+  CL_max - CL visé le plus haut (à maximiser).
+
+Les profils sont ordonnés par front de Pareto (rang 0 = non dominés), puis par finesse.
+Les évaluations sont enregistrées dans le catalogue (table ``evaluations``) avec l'empreinte de la géométrie :
+un nouveau classement n'évalue que les profils ajoutés ou modifiés depuis le précédent.
+
+Utilisation en ligne de commande :
+
+    projet-classement-profils --reynolds 1e6 --mach 0.2 --cl-min 0.3 --cl-max 0.8 --top 10
+"""
+
+ALPHAS_MISSION = np.arange(-10.0, 20.0 + 0.25, 0.5)
+OBJECTIFS = ["finesse", "cm", "epaisseur", "marge_decrochage"]
+SENS_OBJECTIFS = np.array([1.0, -1.0, 1.0, 1.0])  # +1 : à maximiser, -1 : |valeur| à minimiser
+
+
+def cle_mission(reynolds, mach, cl_min, cl_max):
+    """
+    Clé d'une condition de mission dans la table des évaluations.
+    """
+    return f"Re={reynolds:.4g};M={mach:.3f};CL={cl_min:.2f}-{cl_max:.2f}"
+
+
+def epaisseur_relative(coordonnees):
+    """
+    Épaisseur maximale d'un profil rapportée à sa corde.
+
+    Args:
+        coordonnees (array-like): Contour (N, 2), dans n'importe quel ordre ou format (Selig/Lednicer).
+
+    Returns:
+        float: Épaisseur relative (ex. 0.12 pour un NACA 2412).
+    """
+    coords = normaliser_contour(coordonnees, fermer_bord_fuite=False)
+    i_ba = int(np.argmin(np.hypot(coords[:, 0], coords[:, 1])))
+    extrados, intrados = coords[i_ba::-1], coords[i_ba:]  # x croissant sur les deux surfaces
+    x = np.linspace(0.0, 1.0, 201)
+    y_extrados = np.interp(x, extrados[:, 0], extrados[:, 1])
+    y_intrados = np.interp(x, intrados[:, 0], intrados[:, 1])
+    return float(np.max(y_extrados - y_intrados))
+
+
+def rangs_pareto(objectifs, taille_bloc=256, nombre_min=None):
+    """
+    Rang de Pareto de chaque ligne (0 = front non dominé, 1 = front suivant...), tous objectifs à maximiser.
+
+    Les fronts sont retirés un à un ; chaque front est obtenu par comparaison vectorisée de toutes les paires
+    (par blocs de ``taille_bloc`` lignes pour borner la mémoire).
+
+    Args:
+        objectifs (np.ndarray): Valeurs (n, m).
+        taille_bloc (int, optional): Lignes comparées à la fois.
+        nombre_min (int, optional): Arrête le tri dès que ce nombre de lignes est classé (top-k).
+
+    Returns:
+        np.ndarray: Rangs (n,), -1 pour les lignes contenant un NaN (ou non classées avant l'arrêt).
+    """
+    objectifs = np.asarray(objectifs, dtype=np.float64)
+    rangs = np.full(len(objectifs), -1, dtype=np.intp)
+    restants = np.flatnonzero(np.isfinite(objectifs).all(axis=1))
+    rang = 0
+    while restants.size and (nombre_min is None or np.count_nonzero(rangs >= 0) < nombre_min):
+        valeurs = objectifs[restants]
+        domine = np.zeros(len(valeurs), dtype=bool)
+        for debut in range(0, len(valeurs), taille_bloc):
+            bloc = valeurs[debut:debut + taille_bloc, None, :]
+            # bloc[i] est dominé par v[j] si v[j] >= bloc[i] partout et > quelque part
+            domine[debut:debut + taille_bloc] = ((valeurs[None] >= bloc).all(axis=2)
+                                                 & (valeurs[None] > bloc).any(axis=2)).any(axis=1)
+        rangs[restants[~domine]] = rang
+        restants = restants[domine]
+        rang += 1
+    return rangs
+
+
+def metriques_mission(polaires, cl_min, cl_max):
+    """
+    Finesse maximale dans la plage de CL, son angle, CM en ce point et marge de décrochage, pour un lot de
+    polaires (une passe vectorisée).
+
+    Args:
+        polaires (dict): ``{nom: DataFrame}`` (colonnes alpha, CL, CD, CM).
+        cl_min, cl_max (float): Plage de CL de la mission.
+
+    Returns:
+        pd.DataFrame: Colonnes finesse, alpha, cm, marge_decrochage, indexé par nom (finesse NaN si la plage de
+        CL n'est jamais atteinte).
+    """
+    noms, alphas, tableaux = empiler_polaires(polaires, ("CL", "CD", "CM"))
+    cl, cd, cm = tableaux["CL"], tableaux["CD"], tableaux["CM"]
+    if len(alphas) == 0:
+        return pd.DataFrame(np.nan, index=noms, columns=["finesse", "alpha", "cm", "marge_decrochage"])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        finesse = np.where((cl >= cl_min) & (cl <= cl_max), cl / cd, -np.inf)
+        i_max = np.argmax(np.nan_to_num(finesse, nan=-np.inf), axis=1)
+        lignes = np.arange(len(noms))
+        atteinte = np.isfinite(finesse[lignes, i_max])
+        cl_max_polaire = np.nanmax(np.where(np.isnan(cl), -np.inf, cl), axis=1)
+    return pd.DataFrame({
+        "finesse": np.where(atteinte, finesse[lignes, i_max], np.nan),
+        "alpha": np.where(atteinte, alphas[i_max], np.nan),
+        "cm": np.where(atteinte, cm[lignes, i_max], np.nan),
+        "marge_decrochage": np.where(np.isfinite(cl_max_polaire), cl_max_polaire - cl_max, np.nan),
+    }, index=noms)
+
+
+class ClassementProfils:
+    """
+    Évaluation et classement de Pareto des profils du catalogue pour une condition de mission.
+
+    Attributes:
+        reynolds (float): Nombre de Reynolds de la mission.
+        mach (float): Nombre de Mach de la mission.
+        cl_min, cl_max (float): Plage de CL visée.
+        workers (int): Nombre d'évaluations (lectures, processus XFOIL) simultanées.
+
+    Example:
+        >>> classement = ClassementProfils(reynolds=1e6, mach=0.2, cl_min=0.3, cl_max=0.8)
+        >>> classement.classer(top=10, calculer=True)
+    """
+    def __init__(self, reynolds, mach, cl_min=0.3, cl_max=0.8, gestion=None, cache=None, surface=None,
+                 workers=None):
+        self.reynolds = reynolds
+        self.mach = mach
+        self.cl_min = cl_min
+        self.cl_max = cl_max
+        self.gestion = gestion or GestionBase()
+        self.cache = cache or (surface.cache if surface is not None else CachePolaires())
+        self.surface = surface or SurfacePolaires(self.cache)
+        self.workers = workers
+
+    @property
+    def mission(self):
+        return cle_mission(self.reynolds, self.mach, self.cl_min, self.cl_max)
+
+    @staticmethod
+    def _preparer(element):
+        """
+        Empreinte et épaisseur d'un profil (None si son fichier est absent ou illisible).
+        """
+        nom, dat_file = element
+        try:
+            return {"nom_profil": nom, "dat_file": dat_file, "empreinte": empreinte_geometrie(dat_file),
+                    "epaisseur": epaisseur_relative(lire_dat(dat_file)[1])}
+        except (OSError, ValueError) as e:
+            print(f"[ERREUR] Profil {nom} ignoré : {e}")
+            return None
+
+    def _polaire_cache(self, profil, metadonnees):
+        df, erreur = self.surface.estimer(profil["dat_file"], self.reynolds, self.mach, ALPHAS_MISSION, metadonnees)
+        if df is None or df.empty or erreur["CL"] > self.surface.seuil_cl or erreur["CD"] > self.surface.seuil_cd:
+            return None
+        return df
+
+    def evaluer(self, types=None, calculer=False, forcer=False):
+        """
+        Évalue les profils du catalogue qui ne l'ont pas encore été pour cette mission (ou dont la géométrie a changé).
+
+        Args:
+            types (iterable, optional): Types de profils retenus ('importe', 'manuel', 'givre').
+            calculer (bool, optional): Lance XFOIL pour les profils sans polaire exploitable dans le cache.
+            forcer (bool, optional): Réévalue tous les profils.
+
+        Returns:
+            pd.DataFrame: Évaluations des profils retenus (colonnes de ``GestionBase.evaluations``).
+        """
+        fichiers = self.gestion.fichiers_coordonnees(types)
+        connues = self.gestion.evaluations(self.mission).set_index("nom_profil")["empreinte"].to_dict()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executeur:
+            profils = [p for p in executeur.map(self._preparer, fichiers.items()) if p is not None]
+            a_evaluer = [p for p in profils if forcer or connues.get(p["nom_profil"]) != p["empreinte"]]
+
+            metadonnees = self.cache.metadonnees()
+            polaires = list(executeur.map(lambda p: self._polaire_cache(p, metadonnees), a_evaluer))
+        sources = ["cache" if df is not None else None for df in polaires]
+
+        manquants = [i for i, df in enumerate(polaires) if df is None]
+        if calculer and manquants:
+            taches = [{"dat_file": a_evaluer[i]["dat_file"], "reynolds": self.reynolds, "mach": self.mach,
+                       "alpha_start": ALPHAS_MISSION[0], "alpha_end": ALPHAS_MISSION[-1],
+                       "alpha_step": ALPHAS_MISSION[1] - ALPHAS_MISSION[0], "profil": a_evaluer[i]["nom_profil"]}
+                      for i in manquants]
+            resultats = Aerodynamique("classement").run_xfoil_lot(taches, max_workers=self.workers, cache=self.cache)
+            for i, df in zip(manquants, resultats):
+                polaires[i], sources[i] = df, ("xfoil" if df is not None else None)
+
+        evalues = {p["nom_profil"]: df for p, df in zip(a_evaluer, polaires) if df is not None}
+        metriques = metriques_mission(evalues, self.cl_min, self.cl_max)
+        lignes = []
+        for profil, source in zip(a_evaluer, sources):
+            if source is None:
+                continue  # pas de polaire : le profil sera réévalué au prochain classement
+            m = metriques.loc[profil["nom_profil"]]
+            lignes.append({"nom_profil": profil["nom_profil"], "empreinte": profil["empreinte"],
+                           "epaisseur": profil["epaisseur"], "source": source,
+                           **{c: (None if np.isnan(m[c]) else float(m[c])) for c in metriques.columns}})
+        self.gestion.enregistrer_evaluations(self.mission, lignes)
+
+        print(f"[INFO] {len(profils)} profil(s) lus, {len(a_evaluer)} à évaluer, {len(lignes)} évalué(s), "
+              f"{len(a_evaluer) - len(lignes)} sans polaire")
+        evaluations = self.gestion.evaluations(self.mission)
+        return evaluations[evaluations["nom_profil"].isin(fichiers)].reset_index(drop=True)
+
+    def classer(self, top=10, **options):
+        """
+        Classe les profils par front de Pareto puis par finesse.
+
+        Args:
+            top (int, optional): Nombre de profils retournés (tous si None).
+            **options: Options de ``evaluer`` (types, calculer, forcer).
+
+        Returns:
+            pd.DataFrame: Profils classés avec la colonne ``rang_pareto`` (les profils qui n'atteignent pas la plage
+            de CL sont exclus).
+        """
+        evaluations = self.evaluer(**options)
+        objectifs = evaluations[OBJECTIFS].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        objectifs[:, 1] = np.abs(objectifs[:, 1])
+        evaluations["rang_pareto"] = rangs_pareto(objectifs * SENS_OBJECTIFS, nombre_min=top)
+        classement = evaluations[evaluations["rang_pareto"] >= 0].sort_values(
+            ["rang_pareto", "finesse"], ascending=[True, False], kind="stable").reset_index(drop=True)
+        return classement if top is None else classement.head(top)
+
+
+def main(argv=None):
+    """
+    Point d'entrée en ligne de commande (``projet-classement-profils``).
+    """
+    parser = argparse.ArgumentParser(description="Classement de Pareto des profils du catalogue pour une mission.")
+    parser.add_argument("--reynolds", type=float, required=True, help="Nombre de Reynolds de la mission")
+    parser.add_argument("--mach", type=float, default=0.0, help="Nombre de Mach de la mission")
+    parser.add_argument("--cl-min", type=float, default=0.3, help="Borne basse de la plage de CL visée")
+    parser.add_argument("--cl-max", type=float, default=0.8, help="Borne haute de la plage de CL visée")
+    parser.add_argument("--top", type=int, default=10, help="Nombre de profils affichés")
+    parser.add_argument("--types", nargs="*", default=None, help="Types de profils (importe, manuel, givre)")
+    parser.add_argument("--workers", type=int, default=None, help="Évaluations simultanées")
+    parser.add_argument("--calculer", action="store_true", help="Lance XFOIL pour les profils sans polaire en cache")
+    parser.add_argument("--forcer", action="store_true", help="Réévalue tous les profils")
+    args = parser.parse_args(argv)
+
+    classement = ClassementProfils(args.reynolds, args.mach, args.cl_min, args.cl_max, workers=args.workers)
+    resultat = classement.classer(top=args.top, types=args.types, calculer=args.calculer, forcer=args.forcer)
+    if resultat.empty:
+        print("[INFO] Aucun profil classé : lancer avec --calculer pour calculer les polaires manquantes.")
+        return 1
+    colonnes = ["rang_pareto", "nom_profil"] + OBJECTIFS + ["alpha", "source"]
+    print(resultat[colonnes].to_string(index=False, float_format=lambda v: f"{v:.4g}"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
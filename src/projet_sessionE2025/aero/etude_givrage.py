@@ -0,0 +1,159 @@
+import os
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from projet_sessionE2025.BaseDonnees.gestion_base import Dossier_data
+from projet_sessionE2025.BaseDonnees.bibliotheque_profils import ecrire_dat
+from projet_sessionE2025.airfoil.Airfoil import FORMES_GIVRE, givrer_lot
+from projet_sessionE2025.aero.aerodynamique import Aerodynamique
+from projet_sessionE2025.aero.metriques import calculer_metriques, empiler_polaires
+
+"""
+Module : etude_givrage
+
+Étude paramétrique du givrage d'un profil : chaque combinaison (épaisseur, début et fin de zone, forme de
+GivreProfil) donne un profil givré, dont la polaire XFOIL est comparée à celle du profil propre.
+
+- les K géométries givrées sont produites en une opération (``givrer_lot``, tableau (K, N, 2)) ;
+- le profil propre et les K profils givrés partent en un seul lot XFOIL parallèle (pool de sessions et cache
+  de polaires utilisables) ;
+- les métriques de toutes les polaires sont calculées en une passe (``calculer_metriques``).
+
+Le tableau retourné donne, pour chaque combinaison, la dégradation par rapport au profil propre :
+ΔCL_max, ΔCD à l'angle de croisière et Δ angle de décrochage.
+"""
+
+COLONNES_GRILLE = ["ep_max", "x0", "x1", "forme"]
+COLONNES_DEGRADATION = ["delta_cl_max", "delta_cd_croisiere", "delta_alpha_decrochage"]
+dossier_profils_givres = os.path.join(Dossier_data, "profils_givre")
+
+
+def grille_givrage(epaisseurs, debuts, fins, formes=FORMES_GIVRE):
+    """
+    Produit cartésien des paramètres de givrage (seules les zones avec début < fin sont gardées).
+
+    Args:
+        epaisseurs (iterable): Épaisseurs maximales (fraction de corde).
+        debuts, fins (iterable): Début et fin de la zone givrée (x/c).
+        formes (iterable, optional): Formes parmi FORMES_GIVRE.
+
+    Returns:
+        pd.DataFrame: Une ligne par combinaison, colonnes COLONNES_GRILLE.
+
+    Example:
+        >>> grille_givrage([0.005, 0.01, 0.02], [0.0, 0.1], [0.3, 0.5], ["gaussienne", "uniforme"])
+    """
+    inconnues = set(formes) - set(FORMES_GIVRE)
+    if inconnues:
+        raise ValueError(f"Forme(s) de givrage inconnue(s) : {sorted(inconnues)} (attendu : {FORMES_GIVRE})")
+    grille = pd.DataFrame(list(itertools.product(epaisseurs, debuts, fins, formes)), columns=COLONNES_GRILLE)
+    grille = grille[grille["x0"] < grille["x1"]].reset_index(drop=True)
+    return grille.astype({"ep_max": float, "x0": float, "x1": float})
+
+
+class EtudeGivrage:
+    """
+    Étude paramétrique du givrage d'un profil à une condition de vol.
+
+    Attributes:
+        nom (str): Nom du profil (préfixe des fichiers .dat givrés).
+        coordonnees (np.ndarray): Contour propre (N, 2), ordre Selig.
+    """
+    def __init__(self, nom, coordonnees, reynolds, mach, alpha_start=-5.0, alpha_end=15.0, alpha_step=0.5,
+                 alpha_croisiere=2.0, dossier=None):
+        """
+        Args:
+            nom (str): Nom du profil.
+            coordonnees (array-like): Contour propre (N, 2).
+            reynolds (float): Nombre de Reynolds.
+            mach (float): Nombre de Mach.
+            alpha_start, alpha_end, alpha_step (float, optional): Balayage en alpha (°) des polaires.
+            alpha_croisiere (float, optional): Angle (°) auquel la traînée de croisière est comparée.
+            dossier (str, optional): Dossier des .dat givrés (par défaut data/profils_givre/<nom>).
+        """
+        self.nom = nom
+        self.coordonnees = np.asarray(coordonnees, dtype=np.float64)
+        self.reynolds = reynolds
+        self.mach = mach
+        self.alphas = (alpha_start, alpha_end, alpha_step)
+        self.alpha_croisiere = alpha_croisiere
+        self.dossier = dossier or os.path.join(dossier_profils_givres, nom)
+
+    def geometries(self, grille):
+        """
+        Contours givrés de toutes les combinaisons de la grille.
+
+        Returns:
+            np.ndarray: Tableau (K, N, 2), dans l'ordre des lignes de ``grille``.
+        """
+        return givrer_lot(self.coordonnees, grille["ep_max"].to_numpy(), grille["x0"].to_numpy(),
+                          grille["x1"].to_numpy(), grille["forme"].to_numpy())
+
+    def _ecrire_profils(self, geometries):
+        os.makedirs(self.dossier, exist_ok=True)
+        chemins = [ecrire_dat(os.path.join(self.dossier, f"{self.nom}_propre.dat"), self.coordonnees,
+                              nom=self.nom, indexer=False)]
+        for k, coords in enumerate(geometries):
+            nom = f"{self.nom}_givre_{k:03d}"
+            chemins.append(ecrire_dat(os.path.join(self.dossier, f"{nom}.dat"), coords, nom=nom, indexer=False))
+        return chemins
+
+    def _cd_croisiere(self, polaires):
+        """
+        CD de chaque polaire à l'angle de croisière (interpolation linéaire, NaN hors du domaine convergé).
+        """
+        _, alphas, tableaux = empiler_polaires(polaires, ("CD",))
+        cd = np.full(len(polaires), np.nan)
+        for i, ligne in enumerate(tableaux["CD"]):
+            valides = np.isfinite(ligne)
+            if valides.any() and alphas[valides][0] <= self.alpha_croisiere <= alphas[valides][-1]:
+                cd[i] = np.interp(self.alpha_croisiere, alphas[valides], ligne[valides])
+        return cd
+
+    def executer(self, grille, max_workers=None, pool=None, cache=None):
+        """
+        Lance l'étude : profils givrés, lot XFOIL (profil propre compris) et comparaison au profil propre.
+
+        Args:
+            grille (pd.DataFrame): Combinaisons à étudier (voir ``grille_givrage``).
+            max_workers (int, optional): Nombre maximal de processus XFOIL simultanés.
+            pool (PoolXfoil, optional): Pool de sessions XFOIL persistantes.
+            cache (CachePolaires, optional): Cache de polaires.
+
+        Returns:
+            pd.DataFrame: Colonnes de la grille, puis cl_max, alpha_decrochage, cd_croisiere et
+            COLONNES_DEGRADATION (NaN pour les combinaisons sans polaire). Les valeurs du profil propre sont
+            dans ``df.attrs["propre"]``.
+
+        Raises:
+            RuntimeError: Si la polaire du profil propre n'a pas pu être obtenue.
+        """
+        grille = grille.reset_index(drop=True)
+        chemins = self._ecrire_profils(self.geometries(grille))
+
+        alpha_start, alpha_end, alpha_step = self.alphas
+        taches = [{"dat_file": chemin, "reynolds": self.reynolds, "mach": self.mach, "alpha_start": alpha_start,
+                   "alpha_end": alpha_end, "alpha_step": alpha_step,
+                   "profil": os.path.splitext(os.path.basename(chemin))[0]} for chemin in chemins]
+        print(f"[INFO] Étude de givrage de {self.nom} : {len(grille)} combinaison(s) + profil propre.")
+        polaires = Aerodynamique(self.nom).run_xfoil_lot(taches, max_workers=max_workers, cache=cache, pool=pool)
+        if polaires[0] is None or polaires[0].empty:
+            raise RuntimeError(f"Polaire du profil propre {self.nom} introuvable : étude de givrage impossible.")
+
+        metriques = calculer_metriques(polaires)
+        resultats = pd.DataFrame({
+            "cl_max": metriques["cl_max"].to_numpy(),
+            "alpha_decrochage": metriques["alpha_decrochage"].to_numpy(),
+            "cd_croisiere": self._cd_croisiere(polaires),
+        })
+        propre, givres = resultats.iloc[0], resultats.iloc[1:].reset_index(drop=True)
+
+        tableau = pd.concat([grille, givres], axis=1).assign(
+            delta_cl_max=givres["cl_max"] - propre["cl_max"],
+            delta_cd_croisiere=givres["cd_croisiere"] - propre["cd_croisiere"],
+            delta_alpha_decrochage=givres["alpha_decrochage"] - propre["alpha_decrochage"],
+        )
+        tableau.attrs["propre"] = propre.to_dict()
+        return tableau
@@ -0,0 +1,294 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from projet_sessionE2025.BaseDonnees.bibliotheque_profils import ecrire_dat
+from projet_sessionE2025.airfoil.Airfoil import BruitProfil
+from projet_sessionE2025.aero.aerodynamique import Aerodynamique
+
+"""
+Module : etude_rugosite
+
+Analyse Monte-Carlo de la rugosité de surface d'un profil (BruitProfil) : M réalisations tirées d'un générateur
+initialisé par une graine, polaires XFOIL en parallèle, puis bandes de moyenne, d'écart type et de percentiles
+par angle d'attaque.
+
+Le calcul est découpé en lots de ``taille_lot`` réalisations : chaque lot est tiré d'un coup (tableau
+(taille_lot, N, 2)), simulé, agrégé puis libéré. La mémoire ne dépend donc pas de M :
+- moyenne et variance : algorithme de Welford, lots fusionnés par la formule de Chan ;
+- percentiles : un histogramme par angle et par coefficient, dont les bornes sont fixées sur les ``n_pilote``
+  premières polaires du flux (étendue observée élargie de part et d'autre) ; ces polaires sont gardées en
+  attente jusque-là. Un percentile est exact à une classe près ; les valeurs hors bornes sont comptées dans
+  les classes extrêmes et le résultat est borné par les extrema exacts.
+
+Les tirages se suivent dans le flux du générateur et les bornes ne dépendent que des premières polaires de ce
+flux : à graine égale, ni la moyenne, ni l'écart type, ni les percentiles ne dépendent de la taille des lots.
+"""
+
+COLONNES_POLAIRE = ("CL", "CD", "CM")
+
+
+class AgregateurPolaires:
+    """
+    Statistiques en flux de polaires calculées sur une même grille d'angles.
+
+    Attributes:
+        alphas (np.ndarray): Grille d'angles (°).
+        n (dict): Nombre de points convergés par coefficient et par angle.
+    """
+    def __init__(self, alphas, colonnes=COLONNES_POLAIRE, n_classes=400, elargissement=1.0, n_pilote=64):
+        """
+        Args:
+            alphas (array-like): Angles (°) du balayage XFOIL ; les angles des polaires y sont rapportés.
+            colonnes (tuple, optional): Coefficients agrégés.
+            n_classes (int, optional): Nombre de classes des histogrammes de percentiles.
+            elargissement (float, optional): Les bornes des histogrammes débordent de l'étendue des polaires
+                pilotes de ``elargissement`` fois cette étendue, de chaque côté.
+            n_pilote (int, optional): Nombre de premières polaires (dans l'ordre d'arrivée) qui fixent les bornes
+                des histogrammes, quel que soit le découpage en lots.
+        """
+        self.alphas = np.round(np.asarray(alphas, dtype=np.float64), 6)
+        self.colonnes = tuple(colonnes)
+        self.n_classes = n_classes
+        self.elargissement = elargissement
+        self.n_pilote = n_pilote
+        self.n_polaires = 0
+        self._en_attente = []  # valeurs des polaires reçues avant que les bornes soient fixées
+
+        forme = len(self.alphas)
+        self.n = {c: np.zeros(forme, dtype=np.int64) for c in self.colonnes}
+        self._moyenne = {c: np.zeros(forme) for c in self.colonnes}
+        self._m2 = {c: np.zeros(forme) for c in self.colonnes}
+        self._min = {c: np.full(forme, np.inf) for c in self.colonnes}
+        self._max = {c: np.full(forme, -np.inf) for c in self.colonnes}
+        self._bornes = {}
+        self._histogrammes = {c: np.zeros((forme, n_classes), dtype=np.int64) for c in self.colonnes}
+
+    def _empiler(self, polaires):
+        """
+        Tableaux (B, A) de chaque coefficient, NaN aux angles sans point convergé.
+        """
+        valeurs = {c: np.full((len(polaires), len(self.alphas)), np.nan) for c in self.colonnes}
+        for i, df in enumerate(polaires):
+            if df is None or df.empty:
+                continue
+            alphas = np.round(df["alpha"].to_numpy(dtype=np.float64), 6)
+            positions = np.searchsorted(self.alphas, alphas)
+            sur_grille = positions < len(self.alphas)
+            sur_grille[sur_grille] = self.alphas[positions[sur_grille]] == alphas[sur_grille]
+            for c in self.colonnes:
+                valeurs[c][i, positions[sur_grille]] = df[c].to_numpy(dtype=np.float64)[sur_grille]
+        return valeurs
+
+    def _fixer_bornes(self, colonne, valeurs, presents):
+        if not presents.any():
+            # Aucun point convergé parmi les pilotes : bornes arbitraires, le résultat reste borné par les extrema
+            self._bornes[colonne] = (np.full(len(self.alphas), -1.0), np.full(len(self.alphas), 1.0))
+            return
+        bas = np.where(presents, valeurs, np.inf).min(axis=0)
+        haut = np.where(presents, valeurs, -np.inf).max(axis=0)
+        # Angles absents du premier lot : étendue de tout le coefficient
+        bas = np.where(np.isfinite(bas), bas, bas.min())
+        haut = np.where(np.isfinite(haut), haut, haut.max())
+        etendue = np.maximum(haut - bas, 1e-6 * np.maximum(np.abs(haut), 1.0))
+        self._bornes[colonne] = (bas - self.elargissement * etendue, haut + self.elargissement * etendue)
+
+    def ajouter(self, polaires):
+        """
+        Agrège un lot de polaires (les polaires ``None`` ou vides sont ignorées).
+
+        Args:
+            polaires (list[pd.DataFrame | None]): Polaires (colonnes alpha et ``colonnes``).
+        """
+        polaires = [df for df in polaires if df is not None and not df.empty]
+        if not polaires:
+            return
+        self.n_polaires += len(polaires)
+
+        lot = self._empiler(polaires)
+        for c, valeurs in lot.items():
+            presents = np.isfinite(valeurs)
+            n_lot = presents.sum(axis=0)
+            if not n_lot.any():
+                continue
+
+            # Welford par lot (Chan) : moyenne et somme des carrés des écarts du lot, puis fusion
+            with np.errstate(invalid="ignore", divide="ignore"):
+                moyenne_lot = np.where(n_lot > 0, np.nansum(valeurs, axis=0) / n_lot, 0.0)
+            m2_lot = np.nansum((valeurs - moyenne_lot) ** 2, axis=0)
+            n_total = self.n[c] + n_lot
+            delta = moyenne_lot - self._moyenne[c]
+            poids = np.divide(n_lot, n_total, out=np.zeros(len(n_total)), where=n_total > 0)
+            self._moyenne[c] += delta * poids
+            self._m2[c] += m2_lot + delta ** 2 * self.n[c] * poids
+            self.n[c] = n_total
+            self._min[c] = np.minimum(self._min[c], np.where(presents, valeurs, np.inf).min(axis=0))
+            self._max[c] = np.maximum(self._max[c], np.where(presents, valeurs, -np.inf).max(axis=0))
+
+        if self._bornes:
+            self._histogrammer(lot)
+            return
+        self._en_attente.append(lot)
+        if sum(len(v[self.colonnes[0]]) for v in self._en_attente) >= self.n_pilote:
+            self._vider_attente()
+
+    def _vider_attente(self):
+        """
+        Fixe les bornes sur les n_pilote premières polaires, puis verse les polaires en attente aux histogrammes.
+        """
+        if not self._en_attente:
+            return
+        valeurs = {c: np.concatenate([v[c] for v in self._en_attente]) for c in self.colonnes}
+        self._en_attente = []
+        for c in self.colonnes:
+            pilotes = valeurs[c][:self.n_pilote]
+            self._fixer_bornes(c, pilotes, np.isfinite(pilotes))
+        self._histogrammer(valeurs)
+
+    def _histogrammer(self, valeurs):
+        for c in self.colonnes:
+            presents = np.isfinite(valeurs[c])
+            bas, haut = self._bornes[c]
+            lignes, colonnes_alpha = np.nonzero(presents)
+            classes = np.floor((valeurs[c][lignes, colonnes_alpha] - bas[colonnes_alpha])
+                               / (haut - bas)[colonnes_alpha] * self.n_classes).astype(np.int64)
+            classes = np.clip(classes, 0, self.n_classes - 1)
+            self._histogrammes[c] += np.bincount(colonnes_alpha * self.n_classes + classes,
+                                                 minlength=self._histogrammes[c].size).reshape(
+                self._histogrammes[c].shape)
+
+    def _percentile(self, colonne, q):
+        histogramme = self._histogrammes[colonne]
+        cumul = np.cumsum(histogramme, axis=1)
+        rang = q / 100.0 * cumul[:, -1]
+        # Première classe où le cumul atteint le rang, puis interpolation linéaire dans la classe
+        classe = np.minimum((cumul < rang[:, None]).sum(axis=1), self.n_classes - 1)
+        lignes = np.arange(len(classe))
+        avant = np.where(classe > 0, cumul[lignes, np.maximum(classe - 1, 0)], 0)
+        dans_classe = histogramme[lignes, classe]
+        fraction = np.divide(rang - avant, dans_classe, out=np.zeros(len(rang)), where=dans_classe > 0)
+        bas, haut = self._bornes[colonne]
+        valeur = bas + (classe + np.clip(fraction, 0, 1)) * (haut - bas) / self.n_classes
+        valeur = np.clip(valeur, self._min[colonne], self._max[colonne])
+        return np.where(cumul[:, -1] > 0, valeur, np.nan)
+
+    def bandes(self, percentiles=(5, 50, 95)):
+        """
+        Bandes statistiques par angle.
+
+        Args:
+            percentiles (tuple, optional): Percentiles (0-100) à estimer.
+
+        Returns:
+            pd.DataFrame: Index alpha ; pour chaque coefficient C : C_moyenne, C_ecart_type, C_p<q>, C_n.
+        """
+        self._vider_attente()  # moins de n_pilote polaires : les bornes sont fixées sur toutes
+        bandes = {}
+        for c in self.colonnes:
+            n = self.n[c]
+            vide = n == 0
+            bandes[f"{c}_moyenne"] = np.where(vide, np.nan, self._moyenne[c])
+            bandes[f"{c}_ecart_type"] = np.sqrt(np.divide(self._m2[c], n - 1, out=np.full(len(n), np.nan),
+                                                          where=n > 1))
+            for q in percentiles:
+                bandes[f"{c}_p{q:g}"] = self._percentile(c, q) if c in self._bornes else np.full(len(n), np.nan)
+            bandes[f"{c}_n"] = n
+        return pd.DataFrame(bandes, index=pd.Index(self.alphas, name="alpha"))
+
+
+class EtudeRugosite:
+    """
+    Étude Monte-Carlo de la rugosité de surface d'un profil à une condition de vol.
+
+    Attributes:
+        nom (str): Nom du profil.
+        bruit (BruitProfil): Modèle de bruit (amplitude, mode, zone et générateur).
+    """
+    def __init__(self, nom, coordonnees, reynolds, mach, amplitude=0.001, mode="gaussien", zone=(0.0, 0.3),
+                 graine=None, alpha_start=-5.0, alpha_end=15.0, alpha_step=0.5):
+        """
+        Args:
+            nom (str): Nom du profil.
+            coordonnees (array-like): Contour propre (N, 2).
+            reynolds (float): Nombre de Reynolds.
+            mach (float): Nombre de Mach.
+            amplitude, mode, zone: Paramètres du bruit (voir BruitProfil).
+            graine (int, optional): Graine du générateur ; fixe tous les tirages de l'étude.
+            alpha_start, alpha_end, alpha_step (float, optional): Balayage en alpha (°) des polaires.
+        """
+        self.nom = nom
+        self.coordonnees = np.asarray(coordonnees, dtype=np.float64)
+        self.reynolds = reynolds
+        self.mach = mach
+        self.bruit = BruitProfil(amplitude=amplitude, mode=mode, zone=zone, graine=graine)
+        self.alphas = (alpha_start, alpha_end, alpha_step)
+
+    def executer(self, m, taille_lot=64, percentiles=(5, 50, 95), max_workers=None, pool=None):
+        """
+        Tire et simule m réalisations par lots, et agrège leurs polaires au fil de l'eau.
+
+        Les polaires ne passent pas par le cache : chaque géométrie bruitée est unique.
+
+        Args:
+            m (int): Nombre de réalisations.
+            taille_lot (int, optional): Réalisations tirées, simulées et agrégées à la fois.
+            percentiles (tuple, optional): Percentiles des bandes.
+            max_workers (int, optional): Nombre maximal de processus XFOIL simultanés.
+            pool (PoolXfoil, optional): Pool de sessions XFOIL persistantes.
+
+        Returns:
+            pd.DataFrame: Bandes par angle (voir ``AgregateurPolaires.bandes``) ; le nombre de polaires obtenues
+            est dans ``df.attrs["n_polaires"]``.
+        """
+        alpha_start, alpha_end, alpha_step = self.alphas
+        agregateur = AgregateurPolaires(np.arange(alpha_start, alpha_end + alpha_step / 2, alpha_step))
+        aero = Aerodynamique(self.nom)
+        dossier_tmp = tempfile.mkdtemp(prefix="rugosite_")
+        try:
+            for debut in range(0, m, taille_lot):
+                lot = self.bruit.realisations(self.coordonnees, min(taille_lot, m - debut))
+                taches = []
+                for k, coords in enumerate(lot):
+                    chemin = ecrire_dat(os.path.join(dossier_tmp, f"{self.nom}_rugosite_{k:04d}.dat"), coords,
+                                        nom=f"{self.nom}_rugosite_{debut + k}", indexer=False)
+                    taches.append({"dat_file": chemin, "reynolds": self.reynolds, "mach": self.mach,
+                                   "alpha_start": alpha_start, "alpha_end": alpha_end, "alpha_step": alpha_step})
+                agregateur.ajouter(aero.run_xfoil_lot(taches, max_workers=max_workers, pool=pool))
+                print(f"[INFO] Rugosité {self.nom} : {debut + len(lot)}/{m} réalisations, "
+                      f"{agregateur.n_polaires} polaires agrégées.")
+        finally:
+            shutil.rmtree(dossier_tmp, ignore_errors=True)
+
+        bandes = agregateur.bandes(percentiles)
+        bandes.attrs["n_polaires"] = agregateur.n_polaires
+        return bandes
+
+
+def tracer_bandes(bandes, colonnes=("CL", "CD"), percentiles=(5, 95)):
+    """
+    Trace la moyenne et la bande [p_bas, p_haut] de chaque coefficient en fonction de alpha.
+
+    Args:
+        bandes (pd.DataFrame): Résultat de ``EtudeRugosite.executer``.
+        colonnes (tuple, optional): Coefficients tracés.
+        percentiles (tuple, optional): Percentiles bas et haut de la bande (présents dans ``bandes``).
+
+    Returns:
+        matplotlib.figure.Figure: Figure produite.
+    """
+    fig, axs = plt.subplots(1, len(colonnes), figsize=(6 * len(colonnes), 4), squeeze=False)
+    bas, haut = percentiles
+    for ax, c in zip(axs[0], colonnes):
+        ax.fill_between(bandes.index, bandes[f"{c}_p{bas:g}"], bandes[f"{c}_p{haut:g}"], alpha=0.3,
+                        label=f"p{bas:g} - p{haut:g}")
+        ax.plot(bandes.index, bandes[f"{c}_moyenne"], label="Moyenne")
+        ax.set_xlabel("α")
+        ax.set_ylabel(c)
+        ax.grid(True)
+        ax.legend()
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+"""
+Module : metriques
+
+Métriques aérodynamiques de polaires déjà chargées, calculées en une passe vectorisée pour une ou plusieurs
+centaines de polaires.
+
+Les polaires sont empilées sur une grille d'angles commune (union des angles de toutes les polaires, NaN là où
+une polaire n'a pas de point convergé) ; chaque métrique est alors une réduction le long de l'axe des angles :
+- finesse maximale CL/CD et son angle ;
+- CL maximal et angle de décrochage (angle du CL maximal) ;
+- pente de portance et angle de portance nulle (régression linéaire sur la plage linéaire en alpha) ;
+- paramètre d'endurance maximal CL^1.5/CD (CL > 0) ;
+- CD minimal et largeur du « bucket » de traînée : écart de CL entre les points où CD ≤ (1 + tolérance)·CD_min.
+"""
+
+COLONNES_METRIQUES = ["finesse_max", "alpha_finesse_max", "cl_max", "alpha_decrochage", "pente_portance_rad",
+                      "alpha_portance_nulle", "endurance_max", "cd_min", "alpha_cd_min", "largeur_bucket_cl",
+                      "n_points"]
+
+
+def empiler_polaires(polaires, colonnes=("CL", "CD", "CM")):
+    """
+    Empile des polaires sur une grille d'angles commune.
+
+    Args:
+        polaires (dict | list): ``{identifiant: DataFrame}`` ou liste de DataFrames (colonnes alpha, CL, CD...).
+        colonnes (tuple, optional): Coefficients à empiler.
+
+    Returns:
+        tuple: (identifiants (P,), alphas (A,), {colonne: tableau (P, A)}).
+    """
+    if not isinstance(polaires, dict):
+        polaires = dict(enumerate(polaires))
+    identifiants = list(polaires)
+    longueurs = np.array([0 if df is None else len(df) for df in polaires.values()])
+    non_vides = [df for df in polaires.values() if df is not None and len(df)]
+    if not non_vides:
+        return identifiants, np.empty(0), {c: np.full((len(identifiants), 0), np.nan) for c in colonnes}
+
+    tout = pd.concat(non_vides, ignore_index=True)
+    lignes = np.repeat(np.arange(len(identifiants)), longueurs)
+    # Arrondi : -2.0 et -1.99999999 (écritures différentes d'un même angle) tombent dans la même colonne
+    alphas, positions = np.unique(np.round(tout["alpha"].to_numpy(dtype=np.float64), 6), return_inverse=True)
+
+    tableaux = {}
+    for colonne in colonnes:
+        tableau = np.full((len(identifiants), len(alphas)), np.nan)
+        if colonne in tout:
+            tableau[lignes, positions] = tout[colonne].to_numpy(dtype=np.float64)
+        tableaux[colonne] = tableau
+    return identifiants, alphas, tableaux
+
+
+def _arg_extremum(valeurs, alphas, fonction):
+    """
+    (valeur, angle) de l'extremum de chaque ligne, NaN pour les lignes sans donnée.
+    """
+    vide = np.all(np.isnan(valeurs), axis=1)
+    remplacement = -np.inf if fonction is np.nanargmax else np.inf
+    indices = fonction(np.where(vide[:, None], remplacement, valeurs), axis=1)
+    extremum = np.where(vide, np.nan, valeurs[np.arange(len(valeurs)), indices])
+    return extremum, np.where(vide, np.nan, alphas[indices])
+
+
+def calculer_metriques(polaires, plage_lineaire=(-5.0, 5.0), tolerance_bucket=0.1):
+    """
+    Calcule les métriques de chaque polaire en une passe.
+
+    Args:
+        polaires (dict | list): ``{identifiant: DataFrame}`` ou liste de polaires (colonnes alpha, CL, CD).
+        plage_lineaire (tuple, optional): Angles (°) retenus pour la régression de la pente de portance.
+        tolerance_bucket (float, optional): Surcroît de traînée relatif définissant le bucket.
+
+    Returns:
+        pd.DataFrame: Une ligne par polaire (index = identifiants), colonnes COLONNES_METRIQUES ; NaN quand une
+        métrique n'est pas calculable (polaire vide, pas de point dans la plage linéaire...).
+
+    Example:
+        >>> calculer_metriques({"naca2412": df_2412, "naca4412": df_4412})
+    """
+    identifiants, alphas, tableaux = empiler_polaires(polaires, ("CL", "CD"))
+    cl, cd = tableaux["CL"], tableaux["CD"]
+    index = pd.Index(identifiants, name="polaire")
+    if len(alphas) == 0:
+        return pd.DataFrame(np.nan, index=index, columns=COLONNES_METRIQUES).assign(n_points=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        finesse = cl / cd
+        endurance = np.where(cl > 0, np.abs(cl) ** 1.5 / cd, np.nan)
+
+        finesse_max, alpha_finesse_max = _arg_extremum(finesse, alphas, np.nanargmax)
+        cl_max, alpha_decrochage = _arg_extremum(cl, alphas, np.nanargmax)
+        endurance_max, _ = _arg_extremum(endurance, alphas, np.nanargmax)
+        cd_min, alpha_cd_min = _arg_extremum(cd, alphas, np.nanargmin)
+
+        # Régression CL = a·alpha + b sur la plage linéaire, par sommes masquées
+        dans_plage = (alphas >= plage_lineaire[0]) & (alphas <= plage_lineaire[1])
+        masque = dans_plage[None, :] & np.isfinite(cl)
+        x = np.where(masque, alphas[None, :], 0.0)
+        y = np.where(masque, cl, 0.0)
+        n = masque.sum(axis=1)
+        sx, sy = x.sum(axis=1), y.sum(axis=1)
+        denominateur = n * (x * x).sum(axis=1) - sx * sx
+        pente_deg = np.where((n >= 2) & (denominateur > 0), (n * (x * y).sum(axis=1) - sx * sy) / denominateur, np.nan)
+        ordonnee = (sy - pente_deg * sx) / n
+        alpha_portance_nulle = -ordonnee / pente_deg
+
+        dans_bucket = cd <= (1.0 + tolerance_bucket) * cd_min[:, None]
+        largeur_bucket = np.nanmax(np.where(dans_bucket, cl, -np.inf), axis=1) \
+            - np.nanmin(np.where(dans_bucket, cl, np.inf), axis=1)
+        largeur_bucket = np.where(np.isfinite(largeur_bucket), largeur_bucket, np.nan)
+
+    return pd.DataFrame({
+        "finesse_max": finesse_max,
+        "alpha_finesse_max": alpha_finesse_max,
+        "cl_max": cl_max,
+        "alpha_decrochage": alpha_decrochage,
+        "pente_portance_rad": np.degrees(pente_deg),
+        "alpha_portance_nulle": alpha_portance_nulle,
+        "endurance_max": endurance_max,
+        "cd_min": cd_min,
+        "alpha_cd_min": alpha_cd_min,
+        "largeur_bucket_cl": largeur_bucket,
+        "n_points": np.isfinite(cl).sum(axis=1),
+    }, index=index, columns=COLONNES_METRIQUES)
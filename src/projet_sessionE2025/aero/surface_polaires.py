@@ -0,0 +1,298 @@
+import os
+import numpy as np
+import pandas as pd
+from scipy.spatial import Delaunay, QhullError
+
+from projet_sessionE2025.aero.cache_polaires import CachePolaires, empreinte_geometrie
+from projet_sessionE2025.aero.aerodynamique import lire_polaire_en_continu, _normaliser_tache
+
+"""
+Module : surface_polaires
+
+Surface d'interpolation des polaires d'un profil sur (alpha, Reynolds, Mach), construite à partir des polaires
+XFOIL déjà présentes dans le cache (CachePolaires), pour répondre sans XFOIL aux conditions voisines.
+
+Pour un profil (identifié par l'empreinte de sa géométrie) :
+1. chaque polaire en cache est rééchantillonnée en alpha (interpolation linéaire, pas d'extrapolation) ;
+2. les conditions (log10 Re, Mach) des polaires, ramenées à des échelles comparables, sont triangulées
+   (Delaunay) ; une condition est interpolée linéairement (coordonnées barycentriques) dans son triangle.
+   Si toutes les polaires ont le même Mach (ou le même Re), l'interpolation se fait sur l'autre axe seul ;
+3. l'erreur de la surface est estimée par validation croisée « leave-one-out » : chaque polaire est prédite
+   à partir des autres et comparée à XFOIL. Une polaire en bord d'enveloppe (ou aux extrémités d'une grille 1D),
+   que les autres n'encadrent pas, est prédite par sa plus proche voisine : son erreur reste finie, et
+   pessimiste. L'erreur d'une requête est la plus grande erreur des polaires qui l'encadrent.
+
+XFOIL reste utilisé quand la condition sort de l'enveloppe convexe des polaires connues, quand l'erreur
+estimée dépasse le seuil, ou quand la plage d'alpha demandée n'est pas couverte.
+"""
+
+COEFFICIENTS = ["CL", "CD", "CDp", "CM", "Top_Xtr", "Bot_Xtr"]
+ECHELLE_MACH = 0.1  # un écart de Mach de 0.1 pèse autant qu'une décade de Reynolds
+
+
+def _lire_polaire(chemin):
+    """
+    Lit un fichier polaire PACC en DataFrame (sans messages), trié en alpha.
+    """
+    df = pd.DataFrame(list(lire_polaire_en_continu(chemin)))
+    if df.empty or "alpha" not in df:
+        return None
+    return df.drop_duplicates("alpha").sort_values("alpha").reset_index(drop=True)
+
+
+def _reechantillonner(df, alphas, colonnes):
+    """
+    Valeurs (len(alphas), len(colonnes)) d'une polaire aux angles demandés ; NaN hors de sa plage en alpha.
+    """
+    alpha = df["alpha"].to_numpy()
+    valeurs = np.empty((len(alphas), len(colonnes)))
+    for j, colonne in enumerate(colonnes):
+        valeurs[:, j] = np.interp(alphas, alpha, df[colonne].to_numpy(), left=np.nan, right=np.nan)
+    return valeurs
+
+
+class _Surface:
+    """
+    Interpolateur barycentrique sur les conditions (log10 Re, Mach) d'un ensemble de polaires.
+    """
+    def __init__(self, points):
+        self.points = np.asarray(points, dtype=np.float64)
+        etendue = np.ptp(self.points, axis=0) if len(self.points) else np.zeros(2)
+        # Dimensions réellement explorées (un seul Mach : interpolation 1D en Reynolds)
+        self.axes = [k for k in range(2) if etendue[k] > 1e-12]
+        self._triangulation = None
+        if len(self.axes) == 2 and len(self.points) >= 3:
+            try:
+                self._triangulation = Delaunay(self.points)
+            except QhullError:  # points alignés
+                self.axes = [int(np.argmax(etendue))]
+
+    def poids(self, point):
+        """
+        Sommets et poids barycentriques encadrant ``point``, ou None s'il est hors de l'enveloppe.
+        """
+        point = np.asarray(point, dtype=np.float64)
+        if len(self.points) == 0:
+            return None
+        if not self.axes:
+            # Une seule condition connue : la requête doit la reproduire exactement
+            egal = np.flatnonzero(np.all(np.abs(self.points - point) < 1e-9, axis=1))
+            return (egal[:1], np.ones(1)) if len(egal) else None
+
+        if len(self.axes) == 2 and self._triangulation is None:
+            return None  # moins de trois conditions non alignées
+        if self._triangulation is not None:
+            simplexe = int(self._triangulation.find_simplex(point))
+            if simplexe < 0:
+                return None
+            transformation = self._triangulation.transform[simplexe]
+            b = transformation[:2] @ (point - transformation[2])
+            return self._triangulation.simplices[simplexe], np.append(b, 1.0 - b.sum())
+
+        axe = self.axes[0]
+        autre = 1 - axe
+        if np.any(np.abs(self.points[:, autre] - point[autre]) > 1e-9):
+            return None
+        ordre = np.argsort(self.points[:, axe])
+        x = self.points[ordre, axe]
+        i = int(np.searchsorted(x, point[axe]))
+        if i < len(x) and abs(x[i] - point[axe]) < 1e-12:
+            return ordre[i:i + 1], np.ones(1)
+        if i == 0 or i == len(x):
+            return None
+        t = (point[axe] - x[i - 1]) / (x[i] - x[i - 1])
+        return ordre[[i - 1, i]], np.array([1.0 - t, t])
+
+
+class SurfacePolaires:
+    """
+    Polaires interpolées à partir du cache XFOIL, avec repli sur XFOIL.
+
+    Attributes:
+        cache (CachePolaires): Cache des polaires XFOIL (source des données et destination des nouveaux calculs).
+        seuil_cl (float): Erreur RMS maximale tolérée sur CL.
+        seuil_cd (float): Erreur RMS relative maximale tolérée sur CD.
+        couverture_min (float): Fraction minimale des angles demandés que la surface doit couvrir.
+
+    Example:
+        >>> surface = SurfacePolaires(CachePolaires())
+        >>> df, erreur = surface.estimer("data/profils_importes/naca2412_coord_profil.dat", 2.1e6, 0.25,
+        ...                              np.arange(-15, 16))
+    """
+    def __init__(self, cache=None, seuil_cl=0.02, seuil_cd=0.05, couverture_min=0.9):
+        self.cache = cache or CachePolaires()
+        self.seuil_cl = seuil_cl
+        self.seuil_cd = seuil_cd
+        self.couverture_min = couverture_min
+        self.estimations = 0
+        self.replis = 0
+        self._modeles = {}  # empreinte -> (clés des polaires, modèle)
+
+    @staticmethod
+    def _coordonnees(reynolds, mach):
+        return np.array([np.log10(reynolds), mach / ECHELLE_MACH])
+
+    def _modele(self, empreinte, metadonnees=None):
+        """
+        Polaires en cache d'une géométrie et leur surface d'interpolation, reconstruites si le cache a changé.
+        """
+        entrees = sorted((m for m in (self.cache.metadonnees() if metadonnees is None else metadonnees)
+                          if m.get("geometrie") == empreinte and m.get("reynolds", 0) > 0),
+                         key=lambda m: m["cle"])
+        cles = tuple(m["cle"] for m in entrees)
+        connu = self._modeles.get(empreinte)
+        if connu is not None and connu[0] == cles:
+            return connu[1]
+
+        polaires, points = [], []
+        for meta in entrees:
+            df = _lire_polaire(meta["fichier"])
+            if df is None:
+                continue
+            point = self._coordonnees(meta["reynolds"], meta["mach"])
+            # Deux balayages en alpha à la même condition : le premier lu suffit
+            if any(np.allclose(point, p) for p in points):
+                continue
+            polaires.append(df)
+            points.append(point)
+
+        modele = {"polaires": polaires, "points": np.array(points).reshape(-1, 2), "surface": _Surface(points)}
+        modele["erreurs"] = self._erreurs_validation_croisee(modele)
+        self._modeles[empreinte] = (cles, modele)
+        return modele
+
+    def _interpoler(self, polaires, sommets, poids, alphas, colonnes):
+        return sum(w * _reechantillonner(polaires[s], alphas, colonnes) for s, w in zip(sommets, poids))
+
+    def _erreurs_validation_croisee(self, modele):
+        """
+        Erreur (RMS CL, RMS relative CD) de chaque polaire prédite sans elle.
+
+        Une polaire hors de l'enveloppe des autres est prédite par la plus proche (même échelle que la
+        triangulation) ; l'erreur reste inf s'il n'y a pas d'autre polaire ou moins de deux angles communs.
+        """
+        polaires, points = modele["polaires"], modele["points"]
+        erreurs = np.full((len(polaires), 2), np.inf)
+        for i in range(len(polaires)):
+            autres = [j for j in range(len(polaires)) if j != i]
+            if not autres:
+                continue
+            reponse = _Surface(points[autres]).poids(points[i])
+            if reponse is None:
+                # Bord d'enveloppe : extrapolation constante depuis la polaire la plus proche
+                distances = np.linalg.norm(points[autres] - points[i], axis=1)
+                sommets, poids = np.array([int(np.argmin(distances))]), np.array([1.0])
+            else:
+                sommets, poids = reponse
+            alphas = polaires[i]["alpha"].to_numpy()
+            estime = self._interpoler([polaires[j] for j in autres], sommets, poids, alphas, ["CL", "CD"])
+            reference = polaires[i][["CL", "CD"]].to_numpy()
+            valide = np.isfinite(estime).all(axis=1)
+            if valide.sum() < 2:
+                continue
+            ecart = estime[valide] - reference[valide]
+            erreurs[i, 0] = np.sqrt(np.mean(ecart[:, 0] ** 2))
+            erreurs[i, 1] = np.sqrt(np.mean((ecart[:, 1] / reference[valide, 1]) ** 2))
+        return erreurs
+
+    def estimer(self, dat_file, reynolds, mach, alphas, metadonnees=None):
+        """
+        Polaire interpolée d'un profil à une condition donnée, avec son erreur estimée.
+
+        Args:
+            dat_file (str): Fichier .dat du profil (seule sa géométrie compte).
+            reynolds (float): Nombre de Reynolds.
+            mach (float): Nombre de Mach.
+            alphas (array-like): Angles d'attaque demandés (°).
+            metadonnees (list[dict], optional): ``cache.metadonnees()`` déjà lues (évite de relire le cache
+                quand on estime de nombreux profils).
+
+        Returns:
+            tuple[pd.DataFrame | None, dict]: Polaire (colonnes alpha, CL, CD, ...) limitée aux angles couverts, ou
+            None si la condition est hors de l'enveloppe ; erreur estimée ``{"CL": ..., "CD": ...}`` (inf si
+            inconnue).
+        """
+        modele = self._modele(empreinte_geometrie(dat_file), metadonnees)
+        erreur = {"CL": np.inf, "CD": np.inf}
+        reponse = modele["surface"].poids(self._coordonnees(reynolds, mach))
+        if reponse is None:
+            return None, erreur
+
+        sommets, poids = reponse
+        # Contribution négligeable (requête sur une arête) : le sommet opposé n'intervient pas dans l'erreur
+        sommets_utiles = sommets[poids > 1e-9]
+        if len(sommets_utiles) == 1:
+            erreur = {"CL": 0.0, "CD": 0.0}  # condition déjà calculée par XFOIL
+        else:
+            erreur_max = modele["erreurs"][sommets_utiles].max(axis=0)
+            erreur = {"CL": float(erreur_max[0]), "CD": float(erreur_max[1])}
+
+        alphas = np.asarray(alphas, dtype=np.float64)
+        colonnes = [c for c in COEFFICIENTS if all(c in modele["polaires"][s] for s in sommets)]
+        valeurs = self._interpoler(modele["polaires"], sommets, poids, alphas, colonnes)
+        df = pd.DataFrame(valeurs, columns=colonnes)
+        df.insert(0, "alpha", alphas)
+        return df.dropna().reset_index(drop=True), erreur
+
+    def est_fiable(self, df, erreur, n_alphas):
+        """
+        Indique si une estimation peut remplacer un calcul XFOIL.
+        """
+        return (df is not None and len(df) >= self.couverture_min * n_alphas
+                and erreur["CL"] <= self.seuil_cl and erreur["CD"] <= self.seuil_cd)
+
+    def run_xfoil_lot(self, aero, taches, **options):
+        """
+        Comme ``Aerodynamique.run_xfoil_lot``, mais les conditions que la surface estime de façon fiable ne
+        lancent pas XFOIL. Les autres sont calculées par XFOIL (et alimentent le cache, donc la surface).
+
+        Args:
+            aero (Aerodynamique): Objet utilisé pour les calculs XFOIL de repli.
+            taches (list): Tâches XFOIL (voir ``Aerodynamique.run_xfoil_lot``).
+            **options: Options transmises à ``Aerodynamique.run_xfoil_lot`` (max_workers, pool...).
+
+        Returns:
+            list[pd.DataFrame | None]: Une polaire par tâche, dans l'ordre des tâches.
+        """
+        taches = [_normaliser_tache(tache) for tache in taches]
+        resultats = [None] * len(taches)
+        a_calculer = []
+        for i, tache in enumerate(taches):
+            alphas = np.arange(tache["alpha_start"], tache["alpha_end"] + 0.5 * tache["alpha_step"],
+                               tache["alpha_step"])
+            try:
+                df, erreur = self.estimer(tache["dat_file"], tache["reynolds"], tache["mach"], alphas)
+            except FileNotFoundError:
+                df, erreur = None, None
+            if erreur is not None and self.est_fiable(df, erreur, len(alphas)):
+                self.estimations += 1
+                print(f"[INFO] Polaire interpolée (Re={tache['reynolds']:.3g}, Mach={tache['mach']:.3f}, "
+                      f"erreur CL ≈ {erreur['CL']:.3g})")
+                if tache["output_file"]:
+                    ecrire_polaire(tache["output_file"], df, tache["reynolds"], tache["mach"])
+                resultats[i] = df
+            else:
+                a_calculer.append(i)
+
+        if a_calculer:
+            self.replis += len(a_calculer)
+            options.setdefault("cache", self.cache)
+            calculs = aero.run_xfoil_lot([taches[i] for i in a_calculer], **options)
+            for i, df in zip(a_calculer, calculs):
+                resultats[i] = df
+        return resultats
+
+
+def ecrire_polaire(chemin, df, reynolds, mach):
+    """
+    Écrit une polaire interpolée dans un fichier texte lisible par ``lire_txt_et_convertir_dataframe``.
+    """
+    dossier = os.path.dirname(chemin)
+    if dossier:
+        os.makedirs(dossier, exist_ok=True)
+    with open(chemin, "w", encoding="utf-8") as f:
+        f.write(f" Polaire interpolée (surface_polaires)  Re = {reynolds:.4g}  Mach = {mach:.4f}\n\n")
+        f.write("  " + "  ".join(f"{c:>9s}" for c in df.columns) + "\n")
+        f.write("  " + "  ".join("-" * 9 for _ in df.columns) + "\n")
+        for ligne in df.to_numpy():
+            f.write("  " + "  ".join(f"{v:9.5f}" for v in ligne) + "\n")
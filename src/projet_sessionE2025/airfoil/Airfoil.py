@@ -3,11 +3,14 @@ import sys
 import csv
 import numpy as np
 import matplotlib.pyplot as plt
-import requests
 from pathlib import Path
 
 from projet_sessionE2025.BaseDonnees.gestion_base import (GestionBase, profils_importes, profils_manuels, polaires_xfoil)
+from projet_sessionE2025.BaseDonnees.index_profils import indexer_fichier
+from projet_sessionE2025.BaseDonnees.bibliotheque_profils import ecrire_dat
 from projet_sessionE2025.Interface.interaction_graphique import FenetreInteraction
+from projet_sessionE2025.airfoil import generateur_naca
+from projet_sessionE2025.airfoil.resolveur_airfoiltools import resolveur_defaut
 
 class Airfoil:
     """
@@ -15,7 +18,7 @@ class Airfoil:
 
     Attributes:
         nom (str): Nom du profil.
-        coordonnees (list of tuple): Liste de couples (x, y) représentant les points du contour.
+        coordonnees (np.ndarray): Tableau float64 (N, 2) en lecture seule des points (x, y) du contour.
     """
     def __init__(self, nom, coordonnees):
         """
@@ -23,18 +26,39 @@ class Airfoil:
 
         Args:
             nom (str): Nom du profil (ex: 'NACA2412').
-            coordonnees (liste de tuples): Coordonnées (x, y) du contour.
+            coordonnees (array-like): Coordonnées (x, y) du contour (liste de tuples ou tableau (N, 2)).
         """
         self.nom = nom
         self.coordonnees = coordonnees
 
+    @property
+    def coordonnees(self):
+        """
+        Coordonnées du contour sous forme de vue (N, 2) non modifiable.
+
+        La vue s'utilise comme l'ancienne liste de tuples (``for x, y in ...``, ``zip(*...)``)
+        sans copie ; pour modifier le contour, il faut réaffecter l'attribut.
+        """
+        vue = self._coordonnees.view()
+        vue.flags.writeable = False
+        return vue
+
+    @coordonnees.setter
+    def coordonnees(self, valeur):
+        # Un seul tableau contigu : les transformations travaillent dessus sans reconversion
+        self._coordonnees = np.ascontiguousarray(valeur, dtype=np.float64).reshape(-1, 2)
+
     @classmethod
-    def depuis_airfoiltools(cls, code_naca: str):
+    def depuis_airfoiltools(cls, code_naca: str, resolveur=None):
         """
         Télécharge un profil NACA depuis le site AirfoilTools.
 
+        Les noms candidats (nacaXXXX-il, nXXXX, variantes h/sm...) sont interrogés en parallèle par
+        ``ResolveurAirfoilTools`` ; un profil déjà trouvé est relu depuis le cache local.
+
         Args:
             code_naca (str): Code NACA (ex: '2412').
+            resolveur (ResolveurAirfoilTools, optional): Résolveur à utiliser (par défaut celui de l'application).
 
         Returns:
             Airfoil: Instance du profil téléchargé.
@@ -42,58 +66,20 @@ class Airfoil:
         Raises:
             Exception: Si la récupération échoue.
         """
-        # Nettoyage de l'entrée utilisateur
-        code_naca = code_naca.strip().lower()
-        suffixes = ['', '-il', '-sa', '-sm', 'h-sa', 'sm-il', '-jf','a-il']
-        prefixes = ['naca', 'n']
-        lettres_variante = ['h', 'sm']
-
-        # On retire tous les préfixes pour garder le cœur numérique
-        code_brut = code_naca.replace("naca", "").replace("n", "")
-        essais = set()
-
-        # 1. Patterns classiques
-        for prefix in prefixes:
-            for suffix in suffixes:
-                essais.add(f"{prefix}{code_brut}{suffix}")
-        essais.add(code_brut)  # Ex : '2412' ou '22112'
-
-        # 2. Si code brut 4 ou 5 chiffres, on tente des variantes avec 'h', 'sm'
-        if code_brut.isdigit() and len(code_brut) in (4, 5):
-            for prefix in prefixes:
-                for lettre in lettres_variante:
-                    for suffix in suffixes:
-                        essais.add(f"{prefix}{code_brut}{lettre}{suffix}")
-            for lettre in lettres_variante:
-                essais.add(f"{code_brut}{lettre}")
-                for suffix in suffixes:
-                    essais.add(f"{code_brut}{lettre}{suffix}")
-
-        # 3. On tente aussi le code NACA original (en cas d'entrée custom)
-        essais.add(code_naca)
-
-        # Optionnel : log des essais (pour debug)
-        print("Essais générés :", essais)
-
-        for code_url in essais:
-            url = f"http://airfoiltools.com/airfoil/seligdatfile?airfoil={code_url}"
-            reponse = requests.get(url)
-            # Optionnel : print(f"Test URL: {url} | Status: {reponse.status_code}")
-            if reponse.status_code == 200 and "Invalid airfoil name" not in reponse.text:
-                print(f"[INFO] Profil trouvé : {url}")
-                lignes = reponse.text.strip().splitlines()
-                coordonnees = []
-                for ligne in lignes[1:]:
-                    try:
-                        parties = ligne.strip().split()
-                        x = float(parties[0])
-                        y = float(parties[1])
-                        coordonnees.append((x, y))
-                    except (IndexError, ValueError):
-                        continue
-                return cls(nom=f"{code_url}", coordonnees=coordonnees)
-
-        raise Exception(f"Aucune version trouvée pour le profil NACA {code_naca}")
+        resolveur = resolveur or resolveur_defaut()
+        code_url, texte = resolveur.resoudre(code_naca)
+
+        lignes = texte.strip().splitlines()
+        coordonnees = []
+        for ligne in lignes[1:]:
+            try:
+                parties = ligne.strip().split()
+                x = float(parties[0])
+                y = float(parties[1])
+                coordonnees.append((x, y))
+            except (IndexError, ValueError):
+                continue
+        return cls(nom=f"{code_url}", coordonnees=coordonnees)
 
     def sauvegarder_coordonnees(self, nom_fichier=None):
         """
@@ -114,8 +100,19 @@ class Airfoil:
             for x, y in self.coordonnees:
                 f.write(f"{x},{y}\n")
 
+        indexer_fichier(chemin)
         return chemin
 
+    def pipeline(self):
+        """
+        Crée une chaîne de transformations paresseuse partant du contour de ce profil.
+
+        Returns:
+            PipelineGeometrie: Pipeline vide (sans transformation) sur ce profil.
+        """
+        from projet_sessionE2025.airfoil.pipeline_geometrie import PipelineGeometrie
+        return PipelineGeometrie(self.coordonnees, nom=self.nom)
+
     # Tracer le contour
 
     def tracer_contour(self, nom_profil):
@@ -125,8 +122,8 @@ class Airfoil:
         Args:
             nom_profil (str): Titre du graphe affiché.
         """
-        x_vals = [point[0] for point in self.coordonnees]
-        y_vals = [point[1] for point in self.coordonnees]
+        x_vals = self.coordonnees[:, 0]
+        y_vals = self.coordonnees[:, 1]
 
         plt.figure(figsize=(8, 4))
         plt.plot(x_vals, y_vals, marker='o', linewidth=1)
@@ -137,69 +134,42 @@ class Airfoil:
         plt.grid(True)
         plt.show()
 
-    def naca4_profil(self):
+    def naca4_profil(self, n_points=18, params=None):
         """
         Génère un profil NACA 4 chiffres à partir de formules analytiques.
 
+        Les paramètres sont demandés à l'utilisateur par une fenêtre si ``params`` n'est pas fourni ;
+        le calcul est délégué au générateur vectorisé ``generateur_naca``.
+
+        Args:
+            n_points (int, optional): Nombre de points par demi-profil.
+            params (dict, optional): Paramètres {"m", "p", "t", "c"} (fractions de corde et longueur de corde).
+
         Returns:
             tuple: (x_upper, y_upper, x_lower, y_lower, x, c) — coordonnées des surfaces et paramètres.
         """
-        interface = FenetreInteraction()
+        if params is None:
+            interface = FenetreInteraction()
 
-        params = interface.demander_parametres({
-            "m": "Cambrure du profil (entre 0 et 1)",
-            "p": "Position de la cambrure maximale (entre 0 et 1)",
-            "t": "Épaisseur maximale (entre 0 et 1)",
-            "c": "Longueur de corde du profil"
-        })
+            params = interface.demander_parametres({
+                "m": "Cambrure du profil (entre 0 et 1)",
+                "p": "Position de la cambrure maximale (entre 0 et 1)",
+                "t": "Épaisseur maximale (entre 0 et 1)",
+                "c": "Longueur de corde du profil"
+            })
 
         m = params["m"]
         p = params["p"]
         t = params["t"]
         c = params["c"]
 
-        # m = float(input("Indiquer la cambrure du profil (entre 0 et 1): "))
-        # p = float(input("Indiquer la position de la cambrure maximale du profil (entre 0 et 1): "))
-        # t = float(input("Indiquer l'épaisseur maximale du profil (entre 0 et 1): "))
-        # c = float(input("Indiquer la longueur de corde du profil: "))
-        n_points = 18 #int(input("Indiquer le nombre de points souhaité pour le tracé du demi-profil: "))
-
-
-        # Discrétisation le long de x (on utilise un espacement cosinus pour affiner vers le bord d'attaque)
-        beta = np.linspace(0.0, np.pi, n_points)
-        x = c * (0.5 * (1 - np.cos(beta)))
-
-        # Calcul de l'épaisseur relative yt(x)
-        yt = (t / 0.2) * c * (0.2969 * np.sqrt(x / c)
-                              - 0.1260 * (x / c)
-                              - 0.3516 * (x / c) ** 2
-                              + 0.2843 * (x / c) ** 3
-                              - 0.1015 * (x / c) ** 4)
-
-        # Calcul de la cambrure yc(x) et de dyc/dx
-        yc = np.zeros_like(x)
-        dyc_dx = np.zeros_like(x)
-        coordonnees = []
-        for i in range(len(x)):
-            xi = x[i] / c
-            if xi < p:  #Coordonnées profil sans cambrure
-                yc[i] = (m / p ** 2) * (2 * p * xi - xi ** 2) * c
-                dyc_dx[i] = (2 * m / p ** 2) * (p - xi)
-            else:   #Coordonnées profil après la cambrure
-                yc[i] = (m / (1 - p) ** 2) * (1 - 2 * p + 2 * p * xi - xi ** 2) * c
-                dyc_dx[i] = (2 * m / (1 - p) ** 2) * (p - xi)
-
-        # Calcul de theta(x)
-        theta = np.arctan(dyc_dx)
-
-        # Coordonnées des surfaces supérieure et inférieure
-        x_upper = x - yt * np.sin(theta)
-        y_upper = yc + yt * np.cos(theta)
-
-        x_lower = x + yt * np.sin(theta)
-        y_lower = yc - yt * np.cos(theta)
+        # Espacement cosinus pour affiner vers le bord d'attaque
+        x = generateur_naca.distribution_cosinus(n_points)
+        yc, dyc_dx = generateur_naca.cambrure_naca4(x, m, p)
+        yt = generateur_naca.epaisseur_naca4(x, t)
+        x_upper, y_upper, x_lower, y_lower = generateur_naca.surfaces(x, yc, dyc_dx, yt, corde=c)
 
-        return x_upper, y_upper, x_lower, y_lower, x, c
+        return x_upper[0], y_upper[0], x_lower[0], y_lower[0], x * c, c
 
     def tracer_profil_manuel(self, x_upper, y_upper, x_lower, y_lower):
         """
@@ -247,6 +217,7 @@ class Airfoil:
                 writer.writerow([x_up[i], y_up[i], x_low[i], y_low[i]])  # supposant que x_up = x_low
 
         print(f"Les coordonnées du profil on été enregistré dans le fichier: {chemin}")
+        indexer_fichier(chemin)
         return chemin
 
     def enregistrer_profil_format_dat(self, x_up, y_up, x_low, y_low, c, nom_fichier= None):
@@ -265,22 +236,10 @@ class Airfoil:
         chemin = os.path.join(profils_manuels, nom_fichier)
         os.makedirs(profils_manuels, exist_ok=True)
 
-        with open(chemin, mode='w') as file:
-            file.write(f"{self.nom}\n")
-
-            # Extrados : de 1 vers 0
-            for i in reversed(range(len(x_up))):
-                x = x_up[i] / c
-                y = y_up[i] / c
-                file.write(f"{x:.6f} {y:.6f}\n")
-
-            # Intrados : de 0 vers 1
-            for i in range(1, len(x_low)):
-                x = x_low[i] / c
-                y = y_low[i] / c
-                file.write(f"{x:.6f} {y:.6f}\n")
-
-        return chemin
+        # Extrados de 1 vers 0, puis intrados de 0 vers 1 (bord d'attaque non dupliqué)
+        x = np.concatenate((np.asarray(x_up)[::-1], np.asarray(x_low)[1:]))
+        y = np.concatenate((np.asarray(y_up)[::-1], np.asarray(y_low)[1:]))
+        return ecrire_dat(chemin, np.column_stack((x, y)), self.nom, corde=c)
 
     def tracer_comparaison(self, profil_2):
         """
@@ -390,7 +349,7 @@ class Airfoil:
         fichier_dat = os.path.join(dossier, f"{self.nom}_coord_givre.dat")
 
         # ───  extraction coords ──────────────────────────────────────────────────────
-        coords = np.array(self.coordonnees)  # shape (N,2)
+        coords = self.coordonnees  # shape (N,2)
         x_vals, y_vals = coords[:, 0], coords[:, 1]
 
         # ───  normales ────────────────────────────────────────────────────────────────
@@ -419,12 +378,9 @@ class Airfoil:
         print(f" CSV givré : {fichier_csv}")
 
         # ───  écriture du DAT pour XFoil ──────────────────────────────────────────────
-        with open(fichier_dat, "w", encoding="utf-8") as f:
-            # entête XFoil
-            f.write(f"{self.nom}-givre\n")
-            for x, y in coords_givre:
-                f.write(f"{x:.6f} {y:.6f}\n")
+        ecrire_dat(fichier_dat, coords_givre, f"{self.nom}-givre")
         print(f" DAT givré  : {fichier_dat}")
+        indexer_fichier(fichier_csv)
 
         # ───  tracé ───────────────────────────────────────────────────────────────────
         plt.figure(figsize=(8, 4))
@@ -445,10 +401,68 @@ class Airfoil:
         return fichier_csv, fichier_dat
 
 
+FORMES_GIVRE = ("gaussienne", "triangle", "uniforme")
+
+
+def epaisseur_givre(x, ep_max, x0, x1, forme="gaussienne"):
+    """
+    Épaisseur de givrage en x (loi de GivreProfil), nulle hors de la zone [x0, x1].
+
+    Les paramètres peuvent être des tableaux (K, 1) diffusés contre x (N,) pour évaluer K couches à la fois.
+
+    Raises:
+        ValueError: Si une forme n'appartient pas à FORMES_GIVRE.
+    """
+    forme = np.asarray(forme)
+    inconnues = set(np.unique(forme).tolist()) - set(FORMES_GIVRE)
+    if inconnues:
+        raise ValueError(f"Forme(s) de givrage inconnue(s) : {sorted(inconnues)} (attendu : {FORMES_GIVRE})")
+    # normalise x dans [0,1] sur la zone
+    xi = np.clip((x - x0) / (x1 - x0), 0, 1)
+    loi = np.where(forme == "gaussienne", np.exp(-((xi - 0.5)**2)/(2*0.15**2)),  # pic en milieu de zone
+                   np.where(forme == "triangle", 2 * np.minimum(xi, 1 - xi), 1.0))
+    return ep_max * loi * ((x >= x0) & (x <= x1))
+
+
+def _normales_exterieures(coords, normales=None):
+    """
+    Normales unitaires orientées vers l'extérieur du contour, quel que soit son sens de parcours.
+    """
+    x, y = coords[:, 0], coords[:, 1]
+    if normales is None:
+        dx_ds, dy_ds = np.gradient(x), np.gradient(y)
+        norms = np.hypot(dx_ds, dy_ds)[:, None]
+        normales = np.column_stack((-dy_ds, dx_ds)) / norms
+    # (-dy, dx) pointe vers l'intérieur d'un contour parcouru dans le sens trigonométrique (ordre Selig)
+    aire_signee = np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)
+    return -normales if aire_signee > 0 else normales
+
+
+def givrer_lot(coordonnees, ep_max, x0, x1, forme="gaussienne", normales=None):
+    """
+    Applique K couches de givrage à un même profil en une seule opération.
+
+    Args:
+        coordonnees (array-like): Contour (N, 2).
+        ep_max, x0, x1 (float | array-like): Épaisseur maximale et zone de chaque couche (K valeurs ou scalaire).
+        forme (str | array-like): Forme de chaque couche (FORMES_GIVRE).
+        normales (np.ndarray, optional): Normales (-dy, dx) déjà calculées (PipelineGeometrie).
+
+    Returns:
+        np.ndarray: Contours givrés (K, N, 2).
+    """
+    coords = np.asarray(coordonnees, dtype=np.float64)
+    ep_max, x0, x1, forme = (np.atleast_1d(v)[:, None] for v in np.broadcast_arrays(ep_max, x0, x1, forme))
+    n = _normales_exterieures(coords, normales)
+    # on ne givre que l'extrados (y>=0)
+    eps = epaisseur_givre(coords[:, 0], ep_max, x0, x1, forme) * (coords[:, 1] >= 0)
+    return coords[None] + eps[..., None] * n[None]
+
+
 class GivreProfil:
     """
-    Applique une couche de givrage uniformément sur l'extrados,
-    de x0 à x1, avec une épaisseur max ep_max.
+    Applique une couche de givrage sur l'extrados, de x0 à x1, avec une épaisseur max ep_max
+    (vers l'extérieur du profil). Voir ``givrer_lot`` pour plusieurs couches à la fois.
     """
     def __init__(self, ep_max=0.02, zone=(0.2, 0.6), forme="gaussienne"):
         self.ep_max = ep_max
@@ -457,39 +471,16 @@ class GivreProfil:
 
     def _epaisseur(self, x):
         """Retourne l'épaisseur de givrage en x."""
-        # normalise x dans [0,1] sur la zone
-        xi = (x - self.x0) / (self.x1 - self.x0)
-        xi = np.clip(xi, 0, 1)
-        if self.forme == "gaussienne":
-            # pic en milieu de zone
-            return self.ep_max * np.exp(-((xi - 0.5)**2)/(2*0.15**2))
-        elif self.forme == "triangle":
-            return self.ep_max * np.minimum(xi, 1 - xi) * 2
-        else:  # uniforme
-            return self.ep_max * np.ones_like(xi)
-
-    def appliquer(self, coordonnees):
-        coords = np.array(coordonnees)    # shape (N,2)
-        x, y = coords[:,0], coords[:,1]
-
-        # calcul des normales du profil
-        dx_ds, dy_ds = np.gradient(x), np.gradient(y)
-        tang = np.vstack((dx_ds, dy_ds)).T
-        norms = np.linalg.norm(tang, axis=1, keepdims=True)
-        normals = np.hstack((-dy_ds.reshape(-1,1), dx_ds.reshape(-1,1))) / norms
+        return epaisseur_givre(x, self.ep_max, self.x0, self.x1, self.forme)
 
-        # on ne givre que l'extrados (y>=0)
-        masque = y >= 0
+    def cle(self):
+        """Signature des paramètres, utilisée par PipelineGeometrie pour mémoriser les résultats."""
+        return ("givre", self.ep_max, self.x0, self.x1, self.forme)
 
-        # calcul de l'épaisseur en chaque point
-        eps = self._epaisseur(x)
-
-        # on applique uniquement sur la zone d'extrados
-        decal = normals * (eps * masque)[:,None]
-
-        # retourne les nouvelles coordonnées
-        coords_givre = coords + decal
-        return [tuple(pt) for pt in coords_givre]
+    def appliquer(self, coordonnees, geometrie=None):
+        # normales du profil (ou réutilisation de celles déjà calculées par le pipeline)
+        normales = geometrie.normales if geometrie is not None else None
+        return givrer_lot(coordonnees, self.ep_max, self.x0, self.x1, self.forme, normales)[0]
 
 
 
@@ -498,9 +489,12 @@ class RotationProfil:
         self.angle_rad = np.radians(angle_deg)      #  conversion degrés = radians
         self.centre = np.array(centre)              #  point autour duquel on tourne
 
-    def appliquer(self, coordonnees):
-        coords = np.array(coordonnees)              #  convertit liste de tuples = array Nx2
-        coords -= self.centre                        #  déplacement du centre vers l’origine (x - x0, y - y0)
+    def cle(self):
+        return ("rotation", float(self.angle_rad), *map(float, self.centre))
+
+    def appliquer(self, coordonnees, geometrie=None):
+        coords = np.asarray(coordonnees, dtype=np.float64)  #  array Nx2 (sans copie si déjà un tableau)
+        coords = coords - self.centre                #  déplacement du centre vers l’origine (x - x0, y - y0)
 
         M = np.array([                               #  Matrice de rotation
             [np.cos(self.angle_rad), -np.sin(self.angle_rad)],
@@ -508,33 +502,57 @@ class RotationProfil:
         ])
 
         rot = coords @ M.T                           #  produit matriciel : rotation
-        return (rot + self.centre).tolist()          #  on revient au repère initial (x + x0, y + y0)
+        return rot + self.centre                     #  on revient au repère initial (x + x0, y + y0)
 
 
 # Classe pour appliquer du bruit (rugosité, givrage, etc.) sur une région du profil
 
 
 class BruitProfil:
-    def __init__(self, amplitude=0.01, mode="gaussien", zone=(0.0, 0.3)):
+    def __init__(self, amplitude=0.01, mode="gaussien", zone=(0.0, 0.3), graine=None):
         """
         amplitude : déplacement max (en corde unité)
         mode      : "gaussien" ou "uniforme"
         zone      : (x_min, x_max) sur lequel on applique le bruit
+        graine    : graine du générateur (numpy.random.Generator) ; même graine = mêmes tirages
         """
         self.amplitude = amplitude
         self.mode = mode
         self.zone = zone
+        self.graine = graine
+        self.generateur = np.random.default_rng(graine)
+
+    def cle(self):
+        # Tirage aléatoire : le résultat ne doit jamais être réutilisé d'une évaluation à l'autre
+        return None
+
+    def realisations(self, coordonnees, m, geometrie=None):
+        """
+        Tire m réalisations du bruit en une seule opération.
 
-    def appliquer(self, coordonnees):
+        Les tirages se suivent dans le flux du générateur : deux appels de m/2 réalisations donnent les mêmes
+        contours qu'un appel de m.
+
+        Args:
+            coordonnees (array-like): Contour (N, 2).
+            m (int): Nombre de réalisations.
+            geometrie (GeometrieProfil, optional): Normales déjà calculées (PipelineGeometrie).
+
+        Returns:
+            np.ndarray: Contours bruités (m, N, 2).
+        """
         # conversion et extraction
-        coords = np.array(coordonnees)       # shape (N,2)
+        coords = np.asarray(coordonnees, dtype=np.float64)       # shape (N,2)
         x_vals, y_vals = coords[:,0], coords[:,1]
 
         # calcul des tangentes et normales
-        dx_ds, dy_ds = np.gradient(x_vals), np.gradient(y_vals)
-        tangentes = np.vstack((dx_ds, dy_ds)).T
-        norms = np.linalg.norm(tangentes, axis=1)
-        normals = np.column_stack((-dy_ds/norms, dx_ds/norms))
+        if geometrie is not None:
+            normals = geometrie.normales
+        else:
+            dx_ds, dy_ds = np.gradient(x_vals), np.gradient(y_vals)
+            tangentes = np.vstack((dx_ds, dy_ds)).T
+            norms = np.linalg.norm(tangentes, axis=1)
+            normals = np.column_stack((-dy_ds/norms, dx_ds/norms))
 
         # on ne bruit que là où x dans la zone ET y >= 0 (extrados)
         masque = (
@@ -543,19 +561,20 @@ class BruitProfil:
             & (y_vals >= 0)
         )
 
-        # génération du bruit scalaire
+        # génération du bruit scalaire, une ligne par réalisation
         if self.mode == "gaussien":
-            eta = np.random.normal(0, self.amplitude, size=len(x_vals))
+            eta = self.generateur.normal(0, self.amplitude, size=(m, len(x_vals)))
         else:
-            eta = np.random.uniform(-self.amplitude, self.amplitude, size=len(x_vals))
+            eta = self.generateur.uniform(-self.amplitude, self.amplitude, size=(m, len(x_vals)))
 
         # on garde uniquement les eta pour lesquels masque=True
         eta *= masque
 
         # décalage suivant la normale
-        coords_bruitees = coords + normals * eta[:, None]
+        return coords[None] + normals[None] * eta[..., None]
 
-        return [tuple(pt) for pt in coords_bruitees]
+    def appliquer(self, coordonnees, geometrie=None):
+        return self.realisations(coordonnees, 1, geometrie)[0]
 
 
            #  ajout du bruit point par point
@@ -567,29 +586,145 @@ class RotationVrillee:
         self.axe = axe
         self.centre_y = centre_y  # centre de rotation en y
 
-    def appliquer(self, coordonnees):
-        coords = np.array(coordonnees)
-        nouvelles_coords = []
+    def cle(self):
+        return ("vrillage", float(self.angle_max), self.axe, self.centre_y)
+
+    def appliquer(self, coordonnees, geometrie=None):
+        coords = np.asarray(coordonnees, dtype=np.float64)
+        x, y = coords[:, 0], coords[:, 1]
+
+        # Angle de rotation en fonction de x (linéaire), puis rotation autour de (x, centre_y) pour tous les points
+        alpha = self.angle_max * x
+        y_rot = self.centre_y + (y - self.centre_y) * np.cos(alpha)
+
+        return np.column_stack((x, y_rot))
+
+
+def _evaluer_loi(loi, eta, defaut):
+    """
+    Évalue une loi d'envergure (vrillage, corde...) sur les positions réduites eta.
+
+    Args:
+        loi (callable | array-like | float | None): Fonction de eta (0 à l'emplanture, 1 au saumon),
+            valeurs par section, ou constante.
+        eta (np.ndarray): Positions réduites des sections, forme (S,).
+        defaut (callable): Loi utilisée si ``loi`` vaut None.
+
+    Returns:
+        np.ndarray: Valeurs par section, forme (S,).
+    """
+    if loi is None:
+        loi = defaut
+    valeurs = loi(eta) if callable(loi) else loi
+    return np.broadcast_to(np.asarray(valeurs, dtype=np.float64), eta.shape)
+
+
+def generer_pale_vrillee(profil_2d, angle_max_deg=30, z_max=1.0, sections=50, loi_vrillage=None, loi_corde=None,
+                         centre=(0.25, 0)):
+    """
+    Construit une pale vrillée en empilant le profil le long de z, en une seule opération vectorisée.
+
+    Chaque section est mise à l'échelle de sa corde puis tournée autour de ``centre`` (axe de calage),
+    ce qui permet des lois de vrillage et d'effilement non linéaires.
+
+    Args:
+        profil_2d (array-like): Contour (N, 2) du profil de référence (corde unité).
+        angle_max_deg (float, optional): Vrillage au saumon pour la loi linéaire par défaut (°).
+        z_max (float, optional): Envergure de la pale.
+        sections (int, optional): Nombre de sections.
+        loi_vrillage (callable | array-like, optional): Vrillage (°) en fonction de eta = z / z_max.
+            Par défaut : angle_max_deg * eta.
+        loi_corde (callable | array-like, optional): Facteur de corde en fonction de eta (effilement).
+            Par défaut : 1.
+        centre (tuple, optional): Centre de rotation et de mise à l'échelle dans le repère du profil.
+
+    Returns:
+        np.ndarray: Points de la pale, forme (sections, N, 3) ; ``.reshape(-1, 3)`` donne le nuage de points.
+
+    Example:
+        >>> pale = generer_pale_vrillee(profil.coordonnees, sections=500,
+        ...                             loi_vrillage=lambda eta: 25 * (1 - eta) ** 2,
+        ...                             loi_corde=lambda eta: 1 - 0.6 * eta)
+    """
+    coords = np.asarray(profil_2d, dtype=np.float64)
+    centre = np.asarray(centre, dtype=np.float64)
+
+    eta = np.linspace(0.0, 1.0, sections)
+    angles = np.radians(_evaluer_loi(loi_vrillage, eta, lambda e: angle_max_deg * e))[:, None]   # (S, 1)
+    cordes = _evaluer_loi(loi_corde, eta, lambda e: 1.0)[:, None]                                # (S, 1)
+
+    dx = coords[:, 0] - centre[0]  # (N,)
+    dy = coords[:, 1] - centre[1]
+    cos_a, sin_a = np.cos(angles), np.sin(angles)
 
-        for x, y in coords:
-            # Angle de rotation en fonction de x (linéaire)
-            alpha = self.angle_max * x
+    pale = np.empty((sections, len(coords), 3))
+    pale[..., 0] = centre[0] + cordes * (dx * cos_a - dy * sin_a)
+    pale[..., 1] = centre[1] + cordes * (dx * sin_a + dy * cos_a)
+    pale[..., 2] = (z_max * eta)[:, None]
+    return pale
 
-            # Rotation autour de (x, centre_y)
-            dy = y - self.centre_y
-            y_rot = self.centre_y + dy * np.cos(alpha)
 
-            nouvelles_coords.append((x, y_rot))
+def triangles_pale(pale):
+    """
+    Maille la surface latérale d'une pale (sections, N, 3) en triangles.
+
+    Chaque quadrilatère entre deux sections et deux points consécutifs du contour (contour refermé)
+    est coupé en deux triangles.
+
+    Args:
+        pale (np.ndarray): Pale de forme (S, N, 3).
+
+    Returns:
+        np.ndarray: Triangles, forme (2 * (S - 1) * N, 3, 3).
+    """
+    a = pale[:-1]                                # section s, point i
+    b = np.roll(pale[:-1], -1, axis=1)           # section s, point i + 1
+    c = pale[1:]                                 # section s + 1, point i
+    d = np.roll(pale[1:], -1, axis=1)            # section s + 1, point i + 1
+    triangles = np.concatenate([np.stack([a, b, d], axis=-2), np.stack([a, d, c], axis=-2)], axis=1)
+    return triangles.reshape(-1, 3, 3)
 
-        return nouvelles_coords
 
-def generer_pale_vrillee(profil_2d, angle_max_deg=30, z_max=1.0, sections=50):
-    pale = []
-    for i in range(sections):
-        z = z_max * i / (sections - 1)
-        angle_local = angle_max_deg * z / z_max  # rotation linéaire selon Z
-        rotation = RotationProfil(angle_deg=angle_local, centre=(0.25, 0))  # tu peux changer le centre
-        section = rotation.appliquer(profil_2d)
-        for x, y in section:
-            pale.append((x, y, z))
-    return np.array(pale)
+def exporter_pale_stl(pale, chemin, nom="pale"):
+    """
+    Écrit la surface d'une pale au format STL binaire (lisible par tous les mailleurs et logiciels de CAO).
+
+    Args:
+        pale (np.ndarray): Pale de forme (S, N, 3).
+        chemin (str): Fichier .stl de sortie.
+        nom (str, optional): Nom inscrit dans l'en-tête.
+
+    Returns:
+        str: Chemin du fichier écrit.
+    """
+    triangles = triangles_pale(pale).astype(np.float32)
+    normales = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    longueurs = np.linalg.norm(normales, axis=1, keepdims=True)
+    normales = np.divide(normales, longueurs, out=np.zeros_like(normales), where=longueurs > 0)
+
+    enregistrements = np.zeros(len(triangles), dtype=np.dtype([
+        ("normale", "<f4", (3,)), ("sommets", "<f4", (3, 3)), ("attribut", "<u2"),
+    ]))
+    enregistrements["normale"] = normales
+    enregistrements["sommets"] = triangles
+
+    with open(chemin, "wb") as f:
+        f.write(nom.encode("ascii", "replace")[:80].ljust(80, b" "))
+        f.write(np.uint32(len(triangles)).tobytes())
+        enregistrements.tofile(f)
+    return chemin
+
+
+def exporter_pale_npy(pale, chemin):
+    """
+    Sauvegarde la pale (S, N, 3) au format binaire NumPy (.npy), rechargeable avec ``np.load``.
+
+    Args:
+        pale (np.ndarray): Pale de forme (S, N, 3).
+        chemin (str): Fichier .npy de sortie.
+
+    Returns:
+        str: Chemin du fichier écrit.
+    """
+    np.save(chemin, np.ascontiguousarray(pale, dtype=np.float64))
+    return chemin
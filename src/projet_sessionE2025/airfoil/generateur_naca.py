@@ -0,0 +1,350 @@
+import numpy as np
+
+"""
+Module : generateur_naca
+
+Génération analytique et vectorisée des profils NACA, sans aucune boîte de dialogue.
+
+Toutes les fonctions acceptent des scalaires ou des tableaux de paramètres : avec K jeux de
+paramètres, les contours sont renvoyés sous la forme d'un seul tableau (K, N, 2), ce qui permet de
+générer des milliers de profils candidats d'un coup pour un balayage de l'espace de conception.
+
+Les contours suivent l'ordre Selig attendu par XFOIL : bord de fuite → extrados → bord d'attaque
+→ intrados → bord de fuite, soit N = 2 * n_points - 1 points.
+
+Séries supportées :
+- NACA 4 chiffres (m, p, t),
+- NACA 4 chiffres modifiée (rayon de bord d'attaque I, position d'épaisseur maximale M, ex. 0012-64),
+- NACA 5 chiffres, standard et à cambrure réflexe (ex. 23012, 23112).
+"""
+
+# Ligne moyenne des profils 5 chiffres (CL de conception 0.3) : position P -> (r, k1)
+_NACA5_STANDARD = {
+    1: (0.0580, 361.400),
+    2: (0.1260, 51.640),
+    3: (0.2025, 15.957),
+    4: (0.2900, 6.643),
+    5: (0.3910, 3.230),
+}
+
+# Ligne moyenne réflexe : position P -> (r, k1, k2/k1)
+_NACA5_REFLEXE = {
+    2: (0.1300, 51.990, 0.000764),
+    3: (0.2170, 15.793, 0.00677),
+    4: (0.3180, 6.520, 0.0303),
+    5: (0.4410, 3.191, 0.1355),
+}
+
+# Pente du bord de fuite (d1) des profils 4 chiffres modifiés selon la position d'épaisseur maximale
+_D1_MODIFIE = (np.array([0.2, 0.3, 0.4, 0.5, 0.6]), np.array([0.200, 0.234, 0.315, 0.465, 0.700]))
+
+
+def distribution_cosinus(n_points):
+    """
+    Discrétise la corde unité avec un espacement cosinus (resserré aux bords d'attaque et de fuite).
+
+    Args:
+        n_points (int): Nombre de points par surface.
+
+    Returns:
+        np.ndarray: Abscisses x de 0 à 1, de forme (n_points,).
+    """
+    beta = np.linspace(0.0, np.pi, n_points)
+    return 0.5 * (1 - np.cos(beta))
+
+
+def _colonne(valeur):
+    """Transforme un paramètre scalaire ou 1D en colonne (K, 1) pour la diffusion sur x."""
+    return np.atleast_1d(np.asarray(valeur, dtype=np.float64))[:, None]
+
+
+def epaisseur_naca4(x, t, bord_fuite_ferme=False):
+    """
+    Demi-épaisseur de la série NACA 4 chiffres.
+
+    Args:
+        x (np.ndarray): Abscisses sur la corde unité, forme (N,).
+        t (float | array-like): Épaisseur relative maximale (ex : 0.12), forme (K,).
+        bord_fuite_ferme (bool, optional): Si True, utilise le coefficient -0.1036 (bord de fuite fermé).
+
+    Returns:
+        np.ndarray: Demi-épaisseur, forme (K, N).
+    """
+    a4 = -0.1036 if bord_fuite_ferme else -0.1015
+    return (_colonne(t) / 0.2) * (0.2969 * np.sqrt(x) - 0.1260 * x - 0.3516 * x ** 2 + 0.2843 * x ** 3 + a4 * x ** 4)
+
+
+def epaisseur_naca4_modifiee(x, t, indice_bord_attaque=6, position_epaisseur=0.3):
+    """
+    Demi-épaisseur de la série NACA 4 chiffres modifiée (ex : 0012-64 -> I = 6, M = 0.4).
+
+    La partie arrière est un polynôme en (1 - x) dont la pente au bord de fuite (d1) est tabulée selon M ;
+    la partie avant a0 sqrt(x) + a1 x + a2 x² + a3 x³ est raccordée en x = M avec continuité de la valeur,
+    de la pente (nulle) et de la courbure. Les coefficients sont résolus en lot pour tous les profils.
+
+    Args:
+        x (np.ndarray): Abscisses sur la corde unité, forme (N,).
+        t (float | array-like): Épaisseur relative maximale, forme (K,).
+        indice_bord_attaque (float | array-like): Indice I du rayon de bord d'attaque (0 = pointu, 6 = normal, 9 max).
+        position_epaisseur (float | array-like): Position M de l'épaisseur maximale (0.2 à 0.6).
+
+    Returns:
+        np.ndarray: Demi-épaisseur, forme (K, N).
+    """
+    t, indice, m = np.broadcast_arrays(np.atleast_1d(np.asarray(t, dtype=np.float64)),
+                                       np.asarray(indice_bord_attaque, dtype=np.float64),
+                                       np.asarray(position_epaisseur, dtype=np.float64))
+
+    # Coefficients pour une épaisseur de référence de 20 % (demi-épaisseur maximale 0.1)
+    a0 = 0.296904 * np.where(indice >= 9, 10.3933, indice) / 6
+    d0 = 0.002
+    d1 = np.interp(m, *_D1_MODIFIE)
+    s = 1 - m
+    d3 = (2 * d0 + d1 * s - 0.2) / s ** 3
+    d2 = -(d1 + 3 * d3 * s ** 2) / (2 * s)
+
+    # Raccord en x = M : valeur 0.1, pente nulle, courbure égale à celle de la partie arrière
+    courbure_arriere = 2 * d2 + 6 * d3 * s
+    matrice = np.stack([
+        np.stack([m, m ** 2, m ** 3], axis=-1),
+        np.stack([np.ones_like(m), 2 * m, 3 * m ** 2], axis=-1),
+        np.stack([np.zeros_like(m), 2 * np.ones_like(m), 6 * m], axis=-1),
+    ], axis=-2)
+    second_membre = np.stack([
+        0.1 - a0 * np.sqrt(m),
+        -a0 / (2 * np.sqrt(m)),
+        courbure_arriere + a0 / (4 * m ** 1.5),
+    ], axis=-1)
+    a1, a2, a3 = np.moveaxis(np.linalg.solve(matrice, second_membre[..., None])[..., 0], -1, 0)
+
+    col = lambda v: v[:, None]
+    avant = col(a0) * np.sqrt(x) + col(a1) * x + col(a2) * x ** 2 + col(a3) * x ** 3
+    u = 1 - x
+    arriere = d0 + col(d1) * u + col(d2) * u ** 2 + col(d3) * u ** 3
+    y = np.where(x < col(m), avant, arriere)
+    return (col(t) / 0.2) * y
+
+
+def cambrure_naca4(x, m, p):
+    """
+    Ligne moyenne de la série NACA 4 chiffres et sa pente, calculées par masques NumPy.
+
+    Args:
+        x (np.ndarray): Abscisses sur la corde unité, forme (N,).
+        m (float | array-like): Cambrure maximale (ex : 0.02), forme (K,).
+        p (float | array-like): Position de la cambrure maximale (ex : 0.4), forme (K,).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (yc, dyc/dx), chacun de forme (K, N).
+    """
+    m, p = _colonne(m), _colonne(p)
+    # Profils symétriques (m = 0 ou p = 0) : on évite la division par zéro, la cambrure est nulle
+    p_avant = np.where(p > 0, p, 1.0)
+    p_arriere = np.where(p < 1, p, 0.0)
+    avant = x < p
+
+    yc = np.where(avant,
+                  m / p_avant ** 2 * (2 * p * x - x ** 2),
+                  m / (1 - p_arriere) ** 2 * (1 - 2 * p + 2 * p * x - x ** 2))
+    dyc = np.where(avant,
+                   2 * m / p_avant ** 2 * (p - x),
+                   2 * m / (1 - p_arriere) ** 2 * (p - x))
+    return yc, dyc
+
+
+def cambrure_naca5(x, cl_conception, position, reflexe=0):
+    """
+    Ligne moyenne de la série NACA 5 chiffres (standard ou réflexe) et sa pente.
+
+    Args:
+        x (np.ndarray): Abscisses sur la corde unité, forme (N,).
+        cl_conception (float | array-like): Coefficient de portance de conception (0.15 × premier chiffre).
+        position (int | array-like): Deuxième chiffre P (position de cambrure maximale = 0.05 × P).
+        reflexe (int | array-like): Troisième chiffre Q (0 = standard, 1 = réflexe).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (yc, dyc/dx), chacun de forme (K, N).
+    """
+    cl, position, reflexe = np.broadcast_arrays(np.atleast_1d(np.asarray(cl_conception, dtype=np.float64)),
+                                                np.asarray(position, dtype=int),
+                                                np.asarray(reflexe, dtype=int))
+    r = np.empty(cl.shape)
+    k1 = np.empty(cl.shape)
+    k21 = np.zeros(cl.shape)
+    for i, (p, q) in enumerate(zip(position, reflexe)):
+        table = _NACA5_REFLEXE if q else _NACA5_STANDARD
+        if p not in table:
+            raise ValueError(f"Ligne moyenne NACA 5 chiffres inconnue : P={p}, Q={q}")
+        r[i], k1[i] = table[p][:2]
+        if q:
+            k21[i] = table[p][2]
+
+    echelle = (cl / 0.3)[:, None]
+    r, k1, k21 = r[:, None], k1[:, None], k21[:, None]
+    reflexe = reflexe.astype(bool)[:, None]
+    avant = x < r
+
+    # Ligne moyenne standard
+    yc_std = np.where(avant, k1 / 6 * (x ** 3 - 3 * r * x ** 2 + r ** 2 * (3 - r) * x), k1 * r ** 3 / 6 * (1 - x))
+    dyc_std = np.where(avant, k1 / 6 * (3 * x ** 2 - 6 * r * x + r ** 2 * (3 - r)), -k1 * r ** 3 / 6)
+
+    # Ligne moyenne réflexe
+    terme = k21 * (1 - r) ** 3 + r ** 3
+    yc_ref = np.where(avant, k1 / 6 * ((x - r) ** 3 - terme * x + r ** 3),
+                      k1 / 6 * (k21 * (x - r) ** 3 - terme * x + r ** 3))
+    dyc_ref = np.where(avant, k1 / 6 * (3 * (x - r) ** 2 - terme),
+                       k1 / 6 * (3 * k21 * (x - r) ** 2 - terme))
+
+    yc = np.where(reflexe, yc_ref, yc_std) * echelle
+    dyc = np.where(reflexe, dyc_ref, dyc_std) * echelle
+    return yc, dyc
+
+
+def surfaces(x, yc, dyc, yt, corde=1.0):
+    """
+    Combine ligne moyenne et épaisseur (perpendiculaire à la ligne moyenne) en extrados/intrados.
+
+    Args:
+        x (np.ndarray): Abscisses, forme (N,).
+        yc, dyc, yt (np.ndarray): Ligne moyenne, pente et demi-épaisseur, forme (K, N).
+        corde (float, optional): Longueur de corde.
+
+    Returns:
+        tuple[np.ndarray]: (x_upper, y_upper, x_lower, y_lower), chacun de forme (K, N), du bord d'attaque au bord de fuite.
+    """
+    theta = np.arctan(dyc)
+    sin_t, cos_t = np.sin(theta), np.cos(theta)
+    x_upper = (x - yt * sin_t) * corde
+    y_upper = (yc + yt * cos_t) * corde
+    x_lower = (x + yt * sin_t) * corde
+    y_lower = (yc - yt * cos_t) * corde
+    return x_upper, y_upper, x_lower, y_lower
+
+
+def contour(x_upper, y_upper, x_lower, y_lower):
+    """
+    Assemble les surfaces en contours fermés dans l'ordre Selig.
+
+    Args:
+        x_upper, y_upper, x_lower, y_lower (np.ndarray): Surfaces de forme (K, N).
+
+    Returns:
+        np.ndarray: Contours de forme (K, 2N - 1, 2).
+    """
+    x_tot = np.concatenate([x_upper[:, ::-1], x_lower[:, 1:]], axis=1)
+    y_tot = np.concatenate([y_upper[:, ::-1], y_lower[:, 1:]], axis=1)
+    return np.stack([x_tot, y_tot], axis=-1)
+
+
+def _sortie(contours, *parametres):
+    """Renvoie un seul contour (N, 2) si tous les paramètres étaient scalaires."""
+    if all(np.ndim(p) == 0 for p in parametres):
+        return contours[0]
+    return contours
+
+
+def naca4(m, p, t, n_points=100, corde=1.0, bord_fuite_ferme=False):
+    """
+    Génère des profils NACA 4 chiffres.
+
+    Args:
+        m (float | array-like): Cambrure maximale (fraction de corde).
+        p (float | array-like): Position de la cambrure maximale (fraction de corde).
+        t (float | array-like): Épaisseur maximale (fraction de corde).
+        n_points (int, optional): Nombre de points par surface.
+        corde (float, optional): Longueur de corde.
+        bord_fuite_ferme (bool, optional): Ferme le bord de fuite.
+
+    Returns:
+        np.ndarray: Contour (2N - 1, 2) pour des paramètres scalaires, sinon tableau (K, 2N - 1, 2).
+
+    Example:
+        >>> profils = naca4(m=[0.0, 0.02, 0.04], p=0.4, t=np.linspace(0.08, 0.16, 3), n_points=80)
+        >>> profils.shape
+        (3, 159, 2)
+    """
+    m_b, p_b, t_b = np.broadcast_arrays(np.atleast_1d(m), np.atleast_1d(p), np.atleast_1d(t))
+    x = distribution_cosinus(n_points)
+    yc, dyc = cambrure_naca4(x, m_b, p_b)
+    yt = epaisseur_naca4(x, t_b, bord_fuite_ferme)
+    return _sortie(contour(*surfaces(x, yc, dyc, yt, corde)), m, p, t)
+
+
+def naca4_modifie(m, p, t, indice_bord_attaque=6, position_epaisseur=0.3, n_points=100, corde=1.0):
+    """
+    Génère des profils NACA 4 chiffres modifiés (ex : 2412-63 -> indice 6, position 0.3).
+
+    Args:
+        m, p, t (float | array-like): Cambrure, position de cambrure et épaisseur (fractions de corde).
+        indice_bord_attaque (float | array-like, optional): Indice I du rayon de bord d'attaque.
+        position_epaisseur (float | array-like, optional): Position M de l'épaisseur maximale.
+        n_points (int, optional): Nombre de points par surface.
+        corde (float, optional): Longueur de corde.
+
+    Returns:
+        np.ndarray: Contour (2N - 1, 2) ou tableau (K, 2N - 1, 2).
+    """
+    m_b, p_b, t_b, i_b, pos_b = np.broadcast_arrays(np.atleast_1d(m), np.atleast_1d(p), np.atleast_1d(t),
+                                                    np.atleast_1d(indice_bord_attaque),
+                                                    np.atleast_1d(position_epaisseur))
+    x = distribution_cosinus(n_points)
+    yc, dyc = cambrure_naca4(x, m_b, p_b)
+    yt = epaisseur_naca4_modifiee(x, t_b, i_b, pos_b)
+    return _sortie(contour(*surfaces(x, yc, dyc, yt, corde)), m, p, t, indice_bord_attaque, position_epaisseur)
+
+
+def naca5(cl_conception, position, reflexe, t, n_points=100, corde=1.0, bord_fuite_ferme=False):
+    """
+    Génère des profils NACA 5 chiffres (ex : 23012 -> cl_conception=0.3, position=3, reflexe=0, t=0.12).
+
+    Args:
+        cl_conception (float | array-like): CL de conception (0.15 × premier chiffre).
+        position (int | array-like): Deuxième chiffre (1 à 5).
+        reflexe (int | array-like): Troisième chiffre (0 ou 1).
+        t (float | array-like): Épaisseur maximale (fraction de corde).
+        n_points (int, optional): Nombre de points par surface.
+        corde (float, optional): Longueur de corde.
+        bord_fuite_ferme (bool, optional): Ferme le bord de fuite.
+
+    Returns:
+        np.ndarray: Contour (2N - 1, 2) ou tableau (K, 2N - 1, 2).
+    """
+    cl_b, pos_b, q_b, t_b = np.broadcast_arrays(np.atleast_1d(cl_conception), np.atleast_1d(position),
+                                                np.atleast_1d(reflexe), np.atleast_1d(t))
+    x = distribution_cosinus(n_points)
+    yc, dyc = cambrure_naca5(x, cl_b, pos_b, q_b)
+    yt = epaisseur_naca4(x, t_b, bord_fuite_ferme)
+    return _sortie(contour(*surfaces(x, yc, dyc, yt, corde)), cl_conception, position, reflexe, t)
+
+
+def naca_depuis_code(code, n_points=100, corde=1.0):
+    """
+    Génère un profil à partir de sa désignation NACA.
+
+    Args:
+        code (str): Désignation, ex. '2412', 'naca23012', '0012-64'.
+        n_points (int, optional): Nombre de points par surface.
+        corde (float, optional): Longueur de corde.
+
+    Returns:
+        np.ndarray: Contour de forme (2N - 1, 2).
+
+    Raises:
+        ValueError: Si la désignation n'est pas reconnue.
+    """
+    code = code.strip().lower().replace("naca", "").replace(" ", "")
+    chiffres, _, suffixe = code.partition("-")
+
+    if len(chiffres) == 4 and chiffres.isdigit():
+        m, p, t = int(chiffres[0]) / 100, int(chiffres[1]) / 10, int(chiffres[2:]) / 100
+        if suffixe:
+            if len(suffixe) != 2 or not suffixe.isdigit():
+                raise ValueError(f"Suffixe de profil NACA modifié invalide : {code}")
+            return naca4_modifie(m, p, t, int(suffixe[0]), int(suffixe[1]) / 10, n_points, corde)
+        return naca4(m, p, t, n_points, corde)
+
+    if len(chiffres) == 5 and chiffres.isdigit() and not suffixe:
+        return naca5(0.15 * int(chiffres[0]), int(chiffres[1]), int(chiffres[2]), int(chiffres[3:]) / 100,
+                     n_points, corde)
+
+    raise ValueError(f"Désignation NACA non reconnue : {code}")
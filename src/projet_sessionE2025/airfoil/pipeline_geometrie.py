@@ -0,0 +1,304 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from projet_sessionE2025.airfoil.Airfoil import Airfoil, GivreProfil, BruitProfil, RotationProfil, RotationVrillee
+from projet_sessionE2025.BaseDonnees.bibliotheque_profils import ecrire_dat
+
+"""
+Module : pipeline_geometrie
+
+Composition paresseuse des modificateurs de géométrie (givrage, bruit, rotation, vrillage).
+
+Un PipelineGeometrie décrit une chaîne de transformations sans rien calculer : les coordonnées ne sont
+produites qu'au moment de l'export (.dat), du tracé ou d'un accès explicite à ``coordonnees``.
+Les pipelines sont immuables, si bien qu'une même base peut servir de point de départ à des centaines
+de chaînes différentes (études paramétriques de givrage) :
+
+    base = PipelineGeometrie(profil.coordonnees, nom=profil.nom)
+    for ep in np.linspace(0.005, 0.03, 100):
+        base.givrer(ep_max=ep, zone=(0.0, 0.2)).tourner(4, centre=(0.25, 0)).exporter_dat(...)
+
+Deux caches partagés évitent les recalculs :
+- les grandeurs différentielles (tangentes, normales, abscisse curviligne) sont calculées une seule fois
+  par géométrie d'entrée, identifiée par l'empreinte de ses coordonnées ;
+- le résultat de chaque préfixe de chaîne déterministe est mémorisé, si bien que les étapes communes
+  à plusieurs chaînes ne sont évaluées qu'une fois. Une étape aléatoire (BruitProfil) coupe la mémorisation
+  pour elle-même et pour les étapes qui la suivent.
+"""
+
+TAILLE_CACHE_GEOMETRIE = 512
+
+
+def empreinte_coordonnees(coords):
+    """
+    Calcule l'empreinte d'un tableau de coordonnées (N, 2).
+
+    Args:
+        coords (np.ndarray): Coordonnées du contour.
+
+    Returns:
+        str: Empreinte hexadécimale.
+    """
+    coords = np.ascontiguousarray(coords, dtype=np.float64)
+    return hashlib.blake2b(coords.tobytes() + str(coords.shape).encode(), digest_size=16).hexdigest()
+
+
+class GeometrieContour:
+    """
+    Grandeurs différentielles d'un contour, calculées à la demande puis conservées.
+
+    Attributes:
+        coords (np.ndarray): Coordonnées (N, 2), en lecture seule.
+    """
+    def __init__(self, coords):
+        self.coords = np.ascontiguousarray(coords, dtype=np.float64).view()
+        self.coords.flags.writeable = False
+
+    @cached_property
+    def tangentes(self):
+        """Tangentes (N, 2) non normalisées, par différences centrées (np.gradient)."""
+        return np.column_stack((np.gradient(self.coords[:, 0]), np.gradient(self.coords[:, 1])))
+
+    @cached_property
+    def normales(self):
+        """Normales unitaires (N, 2), même convention que GivreProfil et BruitProfil : (-dy, dx) / |t|."""
+        t = self.tangentes
+        return np.column_stack((-t[:, 1], t[:, 0])) / np.linalg.norm(t, axis=1, keepdims=True)
+
+    @cached_property
+    def abscisse_curviligne(self):
+        """Longueur d'arc cumulée (N,) depuis le premier point du contour."""
+        segments = np.linalg.norm(np.diff(self.coords, axis=0), axis=1)
+        return np.concatenate(([0.0], np.cumsum(segments)))
+
+
+class _CacheLRU:
+    """Petit dictionnaire LRU partagé entre threads."""
+    def __init__(self, taille_max):
+        self.taille_max = taille_max
+        self._donnees = OrderedDict()
+        self._verrou = threading.Lock()
+
+    def obtenir(self, cle):
+        with self._verrou:
+            valeur = self._donnees.get(cle)
+            if valeur is not None:
+                self._donnees.move_to_end(cle)
+            return valeur
+
+    def enregistrer(self, cle, valeur):
+        with self._verrou:
+            self._donnees[cle] = valeur
+            self._donnees.move_to_end(cle)
+            while len(self._donnees) > self.taille_max:
+                self._donnees.popitem(last=False)
+
+    def vider(self):
+        with self._verrou:
+            self._donnees.clear()
+
+
+_cache_geometries = _CacheLRU(TAILLE_CACHE_GEOMETRIE)
+_cache_prefixes = _CacheLRU(TAILLE_CACHE_GEOMETRIE)
+
+
+def geometrie_contour(coords, empreinte=None):
+    """
+    Retourne la géométrie différentielle d'un contour, partagée entre tous les pipelines.
+
+    Args:
+        coords (array-like): Coordonnées (N, 2).
+        empreinte (str, optional): Empreinte déjà calculée des coordonnées.
+
+    Returns:
+        GeometrieContour: Objet mis en cache (normales, tangentes, abscisse curviligne).
+    """
+    empreinte = empreinte or empreinte_coordonnees(coords)
+    geometrie = _cache_geometries.obtenir(empreinte)
+    if geometrie is None:
+        geometrie = GeometrieContour(coords)
+        _cache_geometries.enregistrer(empreinte, geometrie)
+    return geometrie
+
+
+def vider_caches():
+    """
+    Vide les caches de géométries et de préfixes de chaînes.
+    """
+    _cache_geometries.vider()
+    _cache_prefixes.vider()
+
+
+class PipelineGeometrie:
+    """
+    Chaîne immuable et paresseuse de transformations de géométrie.
+
+    Toute transformation exposant ``appliquer(coordonnees, geometrie=None)`` et ``cle()`` peut être ajoutée ;
+    ``cle()`` retourne un tuple hachable décrivant ses paramètres, ou None si le résultat n'est pas reproductible.
+
+    Attributes:
+        nom (str): Nom du profil de départ.
+        etapes (tuple): Transformations, dans l'ordre d'application.
+    """
+    def __init__(self, coordonnees, nom="profil", etapes=()):
+        """
+        Args:
+            coordonnees (array-like): Coordonnées (N, 2) du profil de départ.
+            nom (str, optional): Nom du profil (en-tête des fichiers .dat exportés).
+            etapes (tuple, optional): Transformations déjà présentes dans la chaîne.
+        """
+        # Copie figée : une modification ultérieure du tableau d'origine ne doit pas fausser les caches
+        self._base = np.array(coordonnees, dtype=np.float64).reshape(-1, 2)
+        self._base.flags.writeable = False
+        self._empreinte_base = empreinte_coordonnees(self._base)
+        self.nom = nom
+        self.etapes = tuple(etapes)
+
+    def __repr__(self):
+        return f"PipelineGeometrie({self.nom!r}, {len(self.etapes)} étape(s))"
+
+    def __len__(self):
+        return len(self.etapes)
+
+    def ajouter(self, transformation):
+        """
+        Retourne un nouveau pipeline prolongé d'une transformation (le pipeline courant n'est pas modifié).
+
+        Args:
+            transformation: Objet avec ``appliquer(coordonnees, geometrie=None)`` et ``cle()``.
+
+        Returns:
+            PipelineGeometrie: Nouveau pipeline.
+        """
+        nouveau = PipelineGeometrie.__new__(PipelineGeometrie)
+        nouveau._base = self._base
+        nouveau._empreinte_base = self._empreinte_base
+        nouveau.nom = self.nom
+        nouveau.etapes = self.etapes + (transformation,)
+        return nouveau
+
+    def givrer(self, ep_max=0.02, zone=(0.2, 0.6), forme="gaussienne"):
+        """Ajoute une couche de givrage (voir GivreProfil)."""
+        return self.ajouter(GivreProfil(ep_max=ep_max, zone=zone, forme=forme))
+
+    def bruiter(self, amplitude=0.01, mode="gaussien", zone=(0.0, 0.3), graine=None):
+        """Ajoute un bruit de surface (voir BruitProfil)."""
+        return self.ajouter(BruitProfil(amplitude=amplitude, mode=mode, zone=zone, graine=graine))
+
+    def tourner(self, angle_deg=0, centre=(0, 0)):
+        """Ajoute une rotation rigide (voir RotationProfil)."""
+        return self.ajouter(RotationProfil(angle_deg=angle_deg, centre=centre))
+
+    def vriller(self, angle_max_deg=20, axe="x", centre_y=0.0):
+        """Ajoute un vrillage progressif (voir RotationVrillee)."""
+        return self.ajouter(RotationVrillee(angle_max_deg=angle_max_deg, axe=axe, centre_y=centre_y))
+
+    def _evaluer(self):
+        """
+        Évalue la chaîne en réutilisant le plus long préfixe déjà mémorisé.
+
+        Returns:
+            np.ndarray: Coordonnées finales (N, 2), en lecture seule.
+        """
+        # Signatures cumulées des préfixes ; None dès qu'une étape n'est pas reproductible
+        signatures = []
+        signature = (self._empreinte_base,)
+        for etape in self.etapes:
+            cle = etape.cle() if signature is not None else None
+            signature = signature + (cle,) if cle is not None else None
+            signatures.append(signature)
+
+        # Recherche du plus long préfixe déjà calculé
+        depart = 0
+        coords = self._base
+        empreinte = self._empreinte_base
+        for i in range(len(signatures) - 1, -1, -1):
+            if signatures[i] is None:
+                continue
+            memorise = _cache_prefixes.obtenir(signatures[i])
+            if memorise is not None:
+                coords, empreinte = memorise
+                depart = i + 1
+                break
+
+        for i in range(depart, len(self.etapes)):
+            geometrie = geometrie_contour(coords, empreinte)
+            coords = np.asarray(self.etapes[i].appliquer(geometrie.coords, geometrie=geometrie), dtype=np.float64)
+            coords.flags.writeable = False
+            empreinte = empreinte_coordonnees(coords)
+            if signatures[i] is not None:
+                _cache_prefixes.enregistrer(signatures[i], (coords, empreinte))
+
+        return coords
+
+    @property
+    def coordonnees(self):
+        """Coordonnées finales (N, 2) en lecture seule ; la chaîne est évaluée à cet accès."""
+        return self._evaluer()
+
+    @property
+    def geometrie(self):
+        """Géométrie différentielle (normales, abscisse curviligne) du résultat final."""
+        return geometrie_contour(self.coordonnees)
+
+    def vers_airfoil(self, nom=None):
+        """
+        Matérialise la chaîne en un objet Airfoil.
+
+        Args:
+            nom (str, optional): Nom du profil produit (par défaut celui du pipeline).
+
+        Returns:
+            Airfoil: Profil transformé.
+        """
+        return Airfoil(nom or self.nom, self.coordonnees)
+
+    def exporter_dat(self, chemin, entete=None, indexer=True):
+        """
+        Évalue la chaîne et écrit le résultat au format .dat (XFOIL) avec ``ecrire_dat``.
+
+        Args:
+            chemin (str): Fichier de sortie.
+            entete (str, optional): Première ligne du fichier (par défaut le nom du profil).
+            indexer (bool, optional): Déclare le fichier à l'index et au catalogue (voir ``ecrire_dat``).
+
+        Returns:
+            str: Chemin du fichier écrit.
+        """
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        return ecrire_dat(chemin, self.coordonnees, nom=entete or self.nom, indexer=indexer)
+
+    def tracer(self, ax=None, original=True):
+        """
+        Évalue la chaîne et trace le contour obtenu (et, optionnellement, le contour de départ).
+
+        Args:
+            ax (matplotlib.axes.Axes, optional): Axe existant ; sinon une nouvelle figure est affichée.
+            original (bool, optional): Trace aussi le profil de départ.
+
+        Returns:
+            matplotlib.axes.Axes: Axe utilisé.
+        """
+        afficher = ax is None
+        if ax is None:
+            _, ax = plt.subplots(figsize=(8, 4))
+
+        coords = self.coordonnees
+        if original:
+            ax.plot(self._base[:, 0], self._base[:, 1], label="Original", linewidth=2)
+        ax.plot(coords[:, 0], coords[:, 1], "--", label=f"{self.nom} ({len(self.etapes)} transformation(s))")
+        ax.set_aspect("equal")
+        ax.grid(True)
+        ax.legend()
+
+        if afficher:
+            plt.show()
+        return ax
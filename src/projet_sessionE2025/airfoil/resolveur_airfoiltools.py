@@ -0,0 +1,223 @@
+import os
+import re
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from projet_sessionE2025.BaseDonnees.gestion_base import Dossier_data
+from projet_sessionE2025.BaseDonnees.index_profils import variantes_nom
+
+"""
+Module : resolveur_airfoiltools
+
+Résolution concurrente d'un nom de profil saisi par l'utilisateur (ex : '2412') vers le nom exact
+utilisé par AirfoilTools (ex : 'naca2412-il').
+
+Les noms candidats (``variantes_nom``) sont générés dans un ordre de priorité fixe puis interrogés
+en parallèle sur une session HTTP partagée (connexions réutilisées). Le candidat retenu est toujours le premier, dans l'ordre
+de priorité, à exister : le résultat ne dépend donc pas de l'ordre d'arrivée des réponses. Dès qu'il est
+connu, les requêtes restantes sont annulées. Un candidat prioritaire dont la requête a échoué (erreur réseau)
+n'est pas considéré comme absent : il est réinterrogé avant qu'un candidat moins prioritaire soit retenu.
+
+La correspondance nom saisi -> nom AirfoilTools et le fichier Selig téléchargé sont conservés dans
+data/airfoiltools/ : une seconde recherche du même profil ne fait plus aucune requête réseau.
+"""
+
+URL_AIRFOILTOOLS = "http://airfoiltools.com"
+dossier_airfoiltools = os.path.join(Dossier_data, "airfoiltools")
+_SLUG_VALIDE = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def slug_valide(slug):
+    """
+    Vrai si le nom peut servir de nom de fichier dans le cache (pas de '/', de '..'...).
+    """
+    return bool(slug) and _SLUG_VALIDE.fullmatch(slug) is not None
+
+
+class ResolveurAirfoilTools:
+    """
+    Résout et télécharge les profils AirfoilTools en interrogeant les candidats en parallèle.
+
+    Attributes:
+        url_base (str): Racine du site (remplaçable par un serveur local pour les essais).
+        dossier (str): Dossier du cache local (correspondances et fichiers Selig).
+        max_workers (int): Nombre de requêtes simultanées.
+        timeout (float): Délai maximal d'une requête (s).
+    """
+    def __init__(self, url_base=URL_AIRFOILTOOLS, dossier=None, max_workers=8, timeout=10):
+        self.url_base = url_base.rstrip("/")
+        self.dossier = dossier or dossier_airfoiltools
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._verrou = threading.Lock()
+        os.makedirs(self.dossier, exist_ok=True)
+
+        # Session partagée : les connexions TCP sont réutilisées d'une requête à l'autre
+        self.session = requests.Session()
+        adaptateur = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adaptateur)
+        self.session.mount("https://", adaptateur)
+
+    @property
+    def _fichier_correspondances(self):
+        return os.path.join(self.dossier, "correspondances.json")
+
+    def _lire_correspondances(self):
+        try:
+            with open(self._fichier_correspondances, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _chemin_selig(self, slug):
+        """
+        Fichier Selig d'un profil dans le cache.
+
+        Raises:
+            ValueError: Si le nom contient autre chose que des lettres, chiffres, '-' ou '_'.
+        """
+        if not slug_valide(slug):
+            raise ValueError(f"Nom de profil AirfoilTools invalide : {slug!r}")
+        return os.path.join(self.dossier, f"{slug}.dat")
+
+    def _memoriser(self, code, slug, texte):
+        """Enregistre la correspondance code -> slug et le fichier Selig associé."""
+        with self._verrou:
+            with open(self._chemin_selig(slug), "w", encoding="utf-8") as f:
+                f.write(texte)
+            correspondances = self._lire_correspondances()
+            correspondances[code] = slug
+            temporaire = f"{self._fichier_correspondances}.tmp"
+            with open(temporaire, "w", encoding="utf-8") as f:
+                json.dump(correspondances, f, indent=2, sort_keys=True)
+            os.replace(temporaire, self._fichier_correspondances)
+
+    def url(self, slug):
+        """
+        Args:
+            slug (str): Nom AirfoilTools du profil.
+
+        Returns:
+            str: URL du fichier Selig du profil.
+        """
+        return f"{self.url_base}/airfoil/seligdatfile?airfoil={slug}"
+
+    def _sonder(self, slug, abandon):
+        """
+        Interroge un candidat.
+
+        Returns:
+            str | requests.RequestException | None: Contenu du fichier Selig si le profil existe, l'erreur
+            si la requête a échoué (existence inconnue), sinon None.
+        """
+        if abandon.is_set():
+            return None
+        try:
+            reponse = self.session.get(self.url(slug), timeout=self.timeout)
+        except requests.RequestException as e:
+            return e
+        if reponse.status_code == 200 and "Invalid airfoil name" not in reponse.text and reponse.text.strip():
+            return reponse.text
+        return None
+
+    def resoudre(self, code_naca):
+        """
+        Trouve le nom AirfoilTools d'un profil et retourne son fichier Selig.
+
+        Args:
+            code_naca (str): Nom saisi par l'utilisateur.
+
+        Returns:
+            tuple[str, str]: (nom AirfoilTools, contenu du fichier Selig).
+
+        Raises:
+            requests.ConnectionError: Si un candidat prioritaire reste injoignable : on ne peut alors pas savoir
+                s'il existe, ni donc retenir un candidat moins prioritaire.
+            Exception: Si aucun candidat n'existe sur le site.
+        """
+        code = code_naca.strip().lower()
+
+        # Recherche locale d'abord
+        slug = self._lire_correspondances().get(code)
+        if slug_valide(slug):
+            chemin = self._chemin_selig(slug)
+            if os.path.exists(chemin):
+                with open(chemin, "r", encoding="utf-8") as f:
+                    print(f"[INFO] Profil trouvé en local : {slug}")
+                    return slug, f.read()
+
+        # Les variantes viennent de la saisie : seuls les noms sûrs sont interrogés puis écrits dans le cache
+        candidats = [candidat for candidat in variantes_nom(code) if slug_valide(candidat)]
+        abandon = threading.Event()
+        executeur = ThreadPoolExecutor(max_workers=self.max_workers)
+        en_erreur = []
+        trouve = None
+        try:
+            futures = [executeur.submit(self._sonder, candidat, abandon) for candidat in candidats]
+
+            # Les réponses sont examinées dans l'ordre de priorité : le premier candidat existant l'emporte
+            for candidat, future in zip(candidats, futures):
+                resultat = future.result()
+                if isinstance(resultat, requests.RequestException):
+                    en_erreur.append(candidat)
+                elif resultat is not None:
+                    trouve = (candidat, resultat)
+                    break
+        finally:
+            abandon.set()
+            executeur.shutdown(wait=False, cancel_futures=True)
+
+        # Les candidats prioritaires restés sans réponse sont réinterrogés (une fois) avant de conclure
+        trouve = self._reessayer(en_erreur, code_naca) or trouve
+        if trouve is None:
+            raise Exception(f"Aucune version trouvée pour le profil NACA {code_naca}")
+        slug, texte = trouve
+        print(f"[INFO] Profil trouvé : {self.url(slug)}")
+        self._memoriser(code, slug, texte)
+        return slug, texte
+
+    def _reessayer(self, candidats, code_naca):
+        """
+        Réinterroge, dans l'ordre de priorité, des candidats dont la requête a échoué.
+
+        Returns:
+            tuple[str, str] | None: (nom, fichier Selig) du premier candidat existant, None si aucun n'existe.
+
+        Raises:
+            requests.ConnectionError: Si un candidat reste injoignable.
+        """
+        for candidat in candidats:
+            resultat = self._sonder(candidat, threading.Event())
+            if isinstance(resultat, requests.RequestException):
+                raise requests.ConnectionError(
+                    f"AirfoilTools injoignable pour {candidat} ({code_naca}) : impossible de savoir si ce profil "
+                    f"existe, aucun candidat moins prioritaire n'est retenu.") from resultat
+            if resultat is not None:
+                return candidat, resultat
+        return None
+
+    def fermer(self):
+        """
+        Ferme la session HTTP.
+        """
+        self.session.close()
+
+
+_resolveur_defaut = None
+
+
+def resolveur_defaut():
+    """
+    Retourne le résolveur partagé de l'application (créé au premier appel).
+
+    Returns:
+        ResolveurAirfoilTools: Résolveur pointant vers airfoiltools.com.
+    """
+    global _resolveur_defaut
+    if _resolveur_defaut is None:
+        _resolveur_defaut = ResolveurAirfoilTools()
+    return _resolveur_defaut
@@ -1,8 +1,9 @@
 import pandas as pd
 import matplotlib.pyplot as plt
-import asyncio
 import os
-from main import GestionBase, Aerodynamique, Airfoil, ConditionVol, calcul_delta_isa, fetch_vols, comparer_polaires
+from main import GestionBase, Aerodynamique, CachePolaires, SurfacePolaires, EtudeGivrage, grille_givrage, FORMES_GIVRE, EtudeRugosite, tracer_bandes, Airfoil, ConditionVol, delta_isa_conditions, comparer_polaires, lire_dat, ecrire_dat, conditions_vols, service_defaut
+from projet_sessionE2025.aero.aerodynamique import PoolXfoil
+from projet_sessionE2025.aero.metriques import calculer_metriques
 import streamlit as st
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -19,6 +20,17 @@ st.set_page_config(page_title="Interface NACA", layout="centered")
 st.title("✈️ Interface Streamlit – Simulation profil NACA")
 API_KEY = ""  #  Définissez votre clé ici :
 gestion = GestionBase()
+cache_polaires = CachePolaires()
+surface_polaires = SurfacePolaires(cache_polaires)
+stats_cache = cache_polaires.statistiques()
+st.sidebar.caption(f"Cache XFOIL : {stats_cache['entrees']} polaires, {stats_cache['taille_octets'] / 1e6:.1f} Mo")
+
+@st.cache_resource
+def obtenir_service_vols():
+    """
+    Service d'ingestion OpenSky partagé par toutes les sessions : les listes de vols sont lues dans son index.
+    """
+    return service_defaut()
 
 def interface_selection_vol_opensky(profil1_nom, profil2_nom, suffixe=""):
     st.subheader("Sélection d’un vol réel (via OpenSky)")
@@ -31,24 +43,14 @@ def interface_selection_vol_opensky(profil1_nom, profil2_nom, suffixe=""):
     couche_id = couche.split(" ")[0]
 
     if st.button("🔄 Générer une nouvelle liste de vols filtrés", key=f"bouton_generation_vols_{suffixe}") or f"df_vols_ok_{suffixe}" not in st.session_state:
-        vols = asyncio.run(fetch_vols(limit=100))
-        rows = [{
-            "icao24": v.icao24,
-            "callsign": (v.callsign or "").strip(),
-            "origin_country": v.origin_country,
-            "altitude_m": v.geo_altitude or 0.0,
-            "vitesse_m_s": v.velocity or 0.0,
-            "latitude": v.latitude,
-            "longitude": v.longitude
-        } for v in vols]
-        df = pd.DataFrame(rows)
+        index = obtenir_service_vols().index()
 
         if couche_id == "1":
-            df_filt = df[df["altitude_m"] < 11000]
+            df_filt = index.rechercher(limite=100, altitude_max=11000)
         elif couche_id == "2":
-            df_filt = df[df["altitude_m"] >= 11000]
+            df_filt = index.rechercher(limite=100, altitude_min=11000)
         else:
-            df_filt = df
+            df_filt = index.rechercher(limite=100)
 
         if df_filt.empty:
             st.warning("Aucun vol trouvé pour ce filtre. Essayez à nouveau.")
@@ -64,15 +66,14 @@ def interface_selection_vol_opensky(profil1_nom, profil2_nom, suffixe=""):
             st.session_state[f"df_vols_ok_{suffixe}"] = True
 
     if st.session_state.get(f"df_vols_ok_{suffixe}", False):
-        df_vols = st.session_state[f"df_vols_proposee_{suffixe}"]
+        corde = st.number_input("Longueur de corde (m)", value=1.0, key=f"corde_reel_{suffixe}")
+        df_vols = conditions_vols(st.session_state[f"df_vols_proposee_{suffixe}"], corde=corde)
         idx = st.number_input("Sélectionnez le vol (index)", min_value=0, max_value=len(df_vols) - 1, step=1,
                               key=f"idx_vol_{suffixe}")
         row = df_vols.loc[idx]
 
         alt = row["altitude_m"]
-        vit = row["vitesse_m_s"]
-        Tstd = 288.15 - 0.0065 * alt
-        mach = vit / ((1.4 * 287.05 * Tstd) ** 0.5)
+        mach = row["mach"]
 
         angle = st.number_input("Angle d’attaque (°)", value=2.0, key=f"angle_reel_{suffixe}")
         st.success(f"Conditions extraites : Mach = {mach:.3f}, Altitude = {alt:.1f} m")
@@ -80,7 +81,7 @@ def interface_selection_vol_opensky(profil1_nom, profil2_nom, suffixe=""):
         alpha_start = -15
         alpha_end = +15
         alpha_step = 1
-        Re = 1e6
+        Re = row["reynolds"]
 
         forcer_xfoil = st.checkbox("Forcer la régénération des résultats XFOIL",
                                    value=False, key=f"forcer_xfoil_{suffixe}")
@@ -145,18 +146,12 @@ if mode == "Importer":
             chemin_csv = profil.sauvegarder_coordonnees()
             print('chemin_csv', chemin_csv)
 
-            # Étape 3 : Convertir CSV -> DAT (comme dans main.py)
-            chemin_dat = chemin_csv.replace("_coord_profil.csv", "_coord_profil.dat")
-            with open(chemin_csv, "r") as f_csv, open(chemin_dat, "w") as f_dat:
-                lignes = f_csv.readlines()
-                f_dat.write(f"{code}\n")
-                for ligne in lignes[1:]:  # Ignorer l'en-tête x,y
-                    x_str, y_str = ligne.strip().split(",")
-                    f_dat.write(f"{float(x_str):.6f} {float(y_str):.6f}\n")
+            # Étape 3 : Écrire le .dat pour XFOIL (comme dans main.py)
+            chemin_dat = ecrire_dat(chemin_csv.replace("_coord_profil.csv", "_coord_profil.dat"), profil.coordonnees, code)
 
             #  Étape 4 : Tracer dans Streamlit
-            x = [pt[0] for pt in profil.coordonnees]
-            y = [pt[1] for pt in profil.coordonnees]
+            x = profil.coordonnees[:, 0]
+            y = profil.coordonnees[:, 1]
             fig, ax = plt.subplots()
             ax.plot(x, y)
             ax.set_aspect("equal")
@@ -188,24 +183,11 @@ elif mode == "Générer":
             st.error(" Veuillez entrer un nom de profil.")
         else:
             try:
-                import builtins
+                # 1. Génération analytique directe (sans fenêtre Tk)
+                profil = Airfoil(nom_profil, coordonnees=[])
+                x_up, y_up, x_low, y_low, _, c = profil.naca4_profil(params={"m": m, "p": p, "t": t, "c": c})
 
-                #  1. On remplace temporairement l’interface graphique
-                class FauxInterface:
-                    def demander_parametres(self, _):
-                        return {"m": m, "p": p, "t": t, "c": c}
-
-                #  2. On remplace temporairement FenetreInteraction
-                #from src.projet_sessionE2025.airfoil import Airfoil
-                from projet_sessionE2025.airfoil import Airfoil
-
-                Airfoil.FenetreInteraction = lambda: FauxInterface()
-
-                # 3. Génération classique
-                profil = Airfoil.Airfoil(nom_profil, coordonnees=[])
-                x_up, y_up, x_low, y_low, _, c = profil.naca4_profil()
-
-                # 4. Enregistrement
+                # 2. Enregistrement
                 #dossier = f"{BASE_DIR}/data/profils_manuels"
                 dossier = os.path.join(BASE_DIR, "data", "profils_manuels")
                 os.makedirs(dossier, exist_ok=True)
@@ -220,12 +202,12 @@ elif mode == "Générer":
                     nom_fichier=f"{nom_profil}_coord_profil.dat"
                 )
 
-                # 5. Stocker
+                # 3. Stocker
                 st.session_state.profil = profil
                 st.session_state.nom = nom_profil
                 st.session_state.chemin_dat = chemin_dat
 
-                # 6. Affichage
+                # 4. Affichage
                 fig, ax = plt.subplots()
                 ax.plot(x_up, y_up, label="Extrados")
                 ax.plot(x_low, y_low, label="Intrados")
@@ -243,28 +225,19 @@ elif mode == "Générer":
 elif mode == "Depuis la BaseDonnees":
     import os
 
-    fichiers = os.listdir(f"{BASE_DIR}/data/profils_manuels") + os.listdir(f"{BASE_DIR}/data/profils_importes")
-    noms = sorted(set(f.split("_coord")[0] for f in fichiers if f.endswith(".dat")))
+    noms = gestion.lister_profils(types=["manuel", "importe"])
 
     choix = st.selectbox("Choisissez un profil disponible :", noms)
 
     if st.button("Charger"):
-        chemin = None
-        for dossier in [f"{BASE_DIR}/data/profils_importes", f"{BASE_DIR}/data/profils_manuels"]:
-            chemin_test = os.path.join(dossier, f"{choix}_coord_profil.dat")
-            if os.path.exists(chemin_test):
-                chemin = chemin_test
-                break
+        entree = gestion.profil(choix)
+        chemin = entree["fichier_coord_dat"] if entree else None
+        if chemin and not os.path.exists(chemin):
+            chemin = None
 
         if chemin:
             # Lire le fichier .dat pour extraire les coordonnées
-            coordonnees = []
-            with open(chemin, "r") as f:
-                lignes = f.readlines()
-                for ligne in lignes[1:]:  # ignorer le nom en première ligne
-                    if ligne.strip():
-                        x_str, y_str = ligne.strip().split()
-                        coordonnees.append((float(x_str), float(y_str)))
+            _, coordonnees = lire_dat(chemin)
 
             # Créer l'objet Airfoil avec les coordonnées
             profil = Airfoil(nom=choix, coordonnees=coordonnees)
@@ -277,8 +250,8 @@ elif mode == "Depuis la BaseDonnees":
             st.success(f" Profil {choix} chargé depuis la BaseDonnees")
 
             # Affichage du contour
-            x = [pt[0] for pt in coordonnees]
-            y = [pt[1] for pt in coordonnees]
+            x = coordonnees[:, 0]
+            y = coordonnees[:, 1]
             fig, ax = plt.subplots()
             ax.plot(x, y)
             ax.set_aspect("equal")
@@ -299,6 +272,7 @@ if st.session_state.profil and st.session_state.chemin_dat:
 
     # Ajout : checkbox pour forcer la régénération
     forcer_xfoil = st.checkbox(" Forcer la régénération XFOIL")
+    arret_decrochage = st.checkbox(" Arrêter XFOIL dès le décrochage", value=False)
 
     if st.button("Lancer l'aérodynamique"):
         aero = Aerodynamique(st.session_state.nom)
@@ -320,16 +294,24 @@ if st.session_state.profil and st.session_state.chemin_dat:
                     os.remove(chemin_polaire)
                     st.info("Ancien fichier supprimé. Nouvelle analyse XFOIL en cours...")
 
-                chemin_polaire = aero.run_xfoil(
+                # Tracé progressif : chaque angle convergé est affiché dès sa sortie de XFOIL
+                graphique = st.empty()
+                points = []
+                for point in aero.run_xfoil_en_continu(
                     dat_file=st.session_state.chemin_dat,
                     reynolds=reynolds,
                     mach=mach,
-                    output_file=chemin_polaire
-                )
+                    output_file=chemin_polaire,
+                    arret_decrochage=arret_decrochage,
+                    cache=cache_polaires,
+                    forcer=forcer_xfoil
+                ):
+                    points.append(point)
+                    graphique.line_chart(pd.DataFrame(points).set_index("alpha")[["CL", "CD", "CM"]])
 
                 #print('CHEMIN RESULT XFOIL', chemin_polaire)
 
-                df = aero.lire_txt_et_convertir_dataframe(chemin_polaire)
+                df = aero.donnees
                 print(df)
                 st.success(" Analyse XFOIL terminée.")
 
@@ -404,10 +386,9 @@ if "df_polaires" in st.session_state and st.session_state.df_polaires is not Non
 
 # Étape 5 : Calcul finesse
     if st.checkbox("Calculer finesse (CL/CD max)"):
-        df = st.session_state.df_polaires
-        df["finesse"] = df["CL"] / df["CD"]
-        max_f = df["finesse"].max()
-        st.write(f"### Finesse max : {max_f:.2f}")
+        metriques = calculer_metriques({st.session_state.nom: st.session_state.df_polaires})
+        st.write(f"### Finesse max : {metriques['finesse_max'].iloc[0]:.2f}")
+        st.dataframe(metriques)
 
 
 # Étape : Conditions de vol (si un profil est chargé)
@@ -437,24 +418,14 @@ if st.session_state.profil and st.session_state.chemin_dat:
         couche_id = couche.split(" ")[0]
 
         if st.button(" Générer une nouvelle liste de vols filtrés") or "df_vols_ok" not in st.session_state:
-            vols = asyncio.run(fetch_vols(limit=100))
-            rows = [{
-                "icao24": v.icao24,
-                "callsign": (v.callsign or "").strip(),
-                "origin_country": v.origin_country,
-                "altitude_m": v.geo_altitude or 0.0,
-                "vitesse_m_s": v.velocity or 0.0,
-                "latitude": v.latitude,
-                "longitude": v.longitude
-            } for v in vols]
-            df = pd.DataFrame(rows)
+            index = obtenir_service_vols().index()
 
             if couche_id == "1":
-                df_filt = df[df["altitude_m"] < 11000]
+                df_filt = index.rechercher(limite=100, altitude_max=11000)
             elif couche_id == "2":
-                df_filt = df[df["altitude_m"] >= 11000]
+                df_filt = index.rechercher(limite=100, altitude_min=11000)
             else:
-                df_filt = df
+                df_filt = index.rechercher(limite=100)
 
             if df_filt.empty:
                 st.warning(" Aucun vol trouvé pour ce filtre. Essayez à nouveau.")
@@ -472,11 +443,9 @@ if st.session_state.profil and st.session_state.chemin_dat:
         if st.session_state.get("df_vols_ok", False):
             df_vols = st.session_state.df_vols_proposee
             idx = st.number_input("Sélectionnez le vol (index)", min_value=0, max_value=len(df_vols)-1, step=1, key="idx_vol")
-            row = df_vols.loc[idx]
+            row = conditions_vols(df_vols.loc[[idx]], corde=1.0).iloc[0]
             alt = row["altitude_m"]
-            vit = row["vitesse_m_s"]
-            Tstd = 288.15 - 0.0065 * alt
-            mach = vit / ((1.4 * 287.05 * Tstd) ** 0.5)
+            mach = row["mach"]
             angle = st.number_input("Angle d’attaque (°)", value=2.0, key="angle_reel")
             lat = row["latitude"]
             lon = row["longitude"]
@@ -492,15 +461,16 @@ if st.session_state.profil and st.session_state.chemin_dat:
     corde = st.number_input("Longueur de corde (m)", value=0.3)
     st.session_state.conditions_pretes = []
 
-    for tag, alt, mach, angle, lat, lon in conditions:
+    deltas_isa = delta_isa_conditions(conditions, API_KEY)
+    for (tag, alt, mach, angle, lat, lon), delta_isa in zip(conditions, deltas_isa):
         st.markdown(f"###  Résumé pour : **{'Vol réel' if tag == 'vol_reel' else 'Vol perso'}**")
         cond = ConditionVol(
             altitude_m=alt,
             mach=mach,
             angle_deg=angle,
-            delta_isa=calcul_delta_isa(lat or 0, lon or 0, alt, API_KEY) or 0
+            delta_isa=delta_isa
         )
-        vitesse = mach * (1.4 * 287.05 * cond.temperature_K) ** 0.5
+        vitesse = mach * cond.vitesse_son_ms
         reynolds = cond.calculer_reynolds(
             vitesse_m_s=vitesse,
             corde_m=corde,
@@ -554,16 +524,16 @@ if st.session_state.profil and st.session_state.chemin_dat:
             print("fichier_dat", fichier_dat)
 
             try:
-                aero.run_xfoil(
-                    dat_file=fichier_dat,
-                    reynolds=reynolds,
-                    mach=mach,
-                    alpha_start=-15,
-                    alpha_end=15,
-                    alpha_step=1,
-                    output_file=txt_out
-                )
-                df = aero.lire_txt_et_convertir_dataframe(txt_out)
+                # Polaire interpolée depuis le cache si l'erreur estimée est faible, sinon XFOIL
+                df = surface_polaires.run_xfoil_lot(aero, [{
+                    "dat_file": fichier_dat,
+                    "reynolds": reynolds,
+                    "mach": mach,
+                    "alpha_start": -15,
+                    "alpha_end": 15,
+                    "alpha_step": 1,
+                    "output_file": txt_out
+                }])[0]
                 aero.donnees = df
 
                 #  Affichage séparé
@@ -646,54 +616,67 @@ with col2:
 if "simulation_effectuee" not in st.session_state:
     st.session_state.simulation_effectuee = False
 
-def charger_et_simuler(nom_profil, reynolds, mach, alpha_start, alpha_end, alpha_step, forcer=False):
-    chemin =  None
-    for dossier in chemins:
-        test = os.path.join(dossier, f"{nom_profil}_coord_profil.dat")
-        if os.path.exists(test):
-            chemin = test
-            break
-    if not chemin:
-        st.error(f" Fichier .dat introuvable pour {nom_profil}")
+@st.cache_resource
+def obtenir_pool_xfoil():
+    """
+    Pool de processus XFOIL gardés au chaud, partagé par toutes les sessions Streamlit du serveur.
+    """
+    try:
+        return PoolXfoil(n_sessions=min(4, os.cpu_count() or 1))
+    except Exception as e:  # OSError, SubprocessError, RuntimeError... : les simulations restent possibles
+        print(f"[ERREUR] Impossible de démarrer le pool XFOIL, lancement à la demande : {e}")
         return None
 
-    coordonnees = []
-    with open(chemin, "r") as f:
-        for ligne in f.readlines()[1:]:
-            if ligne.strip():
-                try:
-                    x, y = map(float, ligne.strip().split())
-                    coordonnees.append((x, y))
-                except:
-                    continue
-
-    profil = Airfoil(nom_profil, coordonnees)
-    aero = Aerodynamique(nom_profil)
-
-    dossier = os.path.join(BASE_DIR, "data", "profils_importes")
-    txt_path = os.path.join(dossier, f"{nom_profil}_simule_coef_aero.txt")
-    aero.fichier_resultat = txt_path
-
-    if forcer and os.path.exists(txt_path):
-        os.remove(txt_path)
+def charger_et_simuler(noms_profils, reynolds, mach, alpha_start, alpha_end, alpha_step, forcer=False):
+    """
+    Simule en parallèle (un processus XFOIL par profil) les profils demandés dans les mêmes conditions.
+
+    Returns:
+        list[Aerodynamique | None]: Un objet par profil, dans l'ordre de ``noms_profils``.
+    """
+    aeros = []
+    taches = []
+    for nom_profil in noms_profils:
+        chemin =  None
+        for dossier in chemins:
+            test = os.path.join(dossier, f"{nom_profil}_coord_profil.dat")
+            if os.path.exists(test):
+                chemin = test
+                break
+        if not chemin:
+            st.error(f" Fichier .dat introuvable pour {nom_profil}")
+            aeros.append(None)
+            continue
+
+        aero = Aerodynamique(nom_profil)
+
+        dossier = os.path.join(BASE_DIR, "data", "profils_importes")
+        txt_path = os.path.join(dossier, f"{nom_profil}_simule_coef_aero.txt")
+        aero.fichier_resultat = txt_path
+
+        if forcer and os.path.exists(txt_path):
+            os.remove(txt_path)
+
+        aeros.append(aero)
+        taches.append({
+            "dat_file": chemin,
+            "reynolds": reynolds,
+            "mach": mach,
+            "alpha_start": alpha_start,
+            "alpha_end": alpha_end,
+            "alpha_step": alpha_step,
+            "output_file": txt_path
+        })
 
-    try:
-        aero.run_xfoil(
-            dat_file=chemin,
-            reynolds=reynolds,
-            mach=mach,
-            alpha_start=alpha_start,
-            alpha_end=alpha_end,
-            alpha_step=alpha_step,
-            output_file=txt_path
-        )
-        df = aero.lire_txt_et_convertir_dataframe(txt_path)
-        aero.donnees = df
-    except Exception as e:
-        st.error(f" Erreur XFOIL pour {nom_profil} : {e}")
-        aero.donnees = None
+    a_simuler = [aero for aero in aeros if aero is not None]
+    if a_simuler:
+        dfs = a_simuler[0].run_xfoil_lot(taches, cache=cache_polaires, forcer=forcer, pool=obtenir_pool_xfoil())
+        for aero, df in zip(a_simuler, dfs):
+            aero.donnees = df
+            if df is None:
+                st.error(f" Erreur XFOIL pour {aero.nom}")
 
-    return aero
+    return aeros
 
 if choix_mode == "Conditions personnalisées":
     st.markdown("### Paramètres pour XFoil")
@@ -706,8 +689,7 @@ if choix_mode == "Conditions personnalisées":
     forcer_xfoil = st.checkbox(" Forcer la régénération des résultats XFOIL", value=False)
 
     if st.button("Simuler et comparer", key="simuler_comparer_btn"):
-        aero1 = charger_et_simuler(profil1_nom, Re, Mach, alpha_start, alpha_end, alpha_step, forcer=forcer_xfoil)
-        aero2 = charger_et_simuler(profil2_nom, Re, Mach, alpha_start, alpha_end, alpha_step, forcer=forcer_xfoil)
+        aero1, aero2 = charger_et_simuler([profil1_nom, profil2_nom], Re, Mach, alpha_start, alpha_end, alpha_step, forcer=forcer_xfoil)
         st.session_state.simulation_effectuee = True
 
 elif choix_mode == "VOL REEL OPENSKY":
@@ -719,8 +701,7 @@ elif choix_mode == "VOL REEL OPENSKY":
         mach, alt, angle, Re, alpha_start, alpha_end, alpha_step, forcer_xfoil = resultats
 
     if st.button("Simuler et comparer", key="simuler_comparer_reel"):
-        aero1 = charger_et_simuler(profil1_nom, Re, mach, alpha_start, alpha_end, alpha_step, forcer=forcer_xfoil)
-        aero2 = charger_et_simuler(profil2_nom, Re, mach, alpha_start, alpha_end, alpha_step, forcer=forcer_xfoil)
+        aero1, aero2 = charger_et_simuler([profil1_nom, profil2_nom], Re, mach, alpha_start, alpha_end, alpha_step, forcer=forcer_xfoil)
         st.session_state.simulation_effectuee = True
 
 if 'aero1' in locals() and 'aero2' in locals() and aero1 and aero2 and aero1.donnees is not None and aero2.donnees is not None:
@@ -773,8 +754,7 @@ elif st.session_state.get("simulation_effectuee", False):
 
 st.subheader("Comparaison de deux profils NACA")
 
-profils_disponibles = sorted(set(f.split("_coord")[0] for dossier in [f"{BASE_DIR}/data/profils_importes", f"{BASE_DIR}/data/profils_manuels"]
-                                 for f in os.listdir(dossier) if f.endswith(".dat")))
+profils_disponibles = gestion.lister_profils(types=["importe", "manuel"])
 
 profil_1 = st.selectbox("Choisissez le 1er profil", profils_disponibles, key="profil1")
 profil_2 = st.selectbox("Choisissez le 2e profil", profils_disponibles, key="profil2")
@@ -782,21 +762,19 @@ profil_2 = st.selectbox("Choisissez le 2e profil", profils_disponibles, key="pro
 if st.button("Comparer les deux profils"):
     try:
         def charger_coord(nom):
-            for dossier in [f"{BASE_DIR}/data/profils_importes", f"{BASE_DIR}/data/profils_manuels"]:
-                chemin = os.path.join(dossier, f"{nom}_coord_profil.dat")
-                if os.path.exists(chemin):
-                    with open(chemin, "r") as f:
-                        lignes = f.readlines()[1:]  # sauter la première ligne
-                        return [(float(x), float(y)) for x, y in (ligne.strip().split() for ligne in lignes)]
+            entree = gestion.profil(nom)
+            chemin = entree["fichier_coord_dat"] if entree else None
+            if chemin and os.path.exists(chemin):
+                return lire_dat(chemin)[1]
             return None
 
         coords1 = charger_coord(profil_1)
         coords2 = charger_coord(profil_2)
 
-        if coords1 and coords2:
+        if coords1 is not None and coords2 is not None:
             fig, ax = plt.subplots()
-            x1, y1 = zip(*coords1)
-            x2, y2 = zip(*coords2)
+            x1, y1 = coords1[:, 0], coords1[:, 1]
+            x2, y2 = coords2[:, 0], coords2[:, 1]
             ax.plot(x1, y1, label=profil_1, linewidth=2)
             ax.plot(x2, y2, label=profil_2, linestyle="--", linewidth=2)
             ax.set_title("Superposition des contours des profils")
@@ -859,16 +837,12 @@ if st.button("Lancer simulation givrage"):
 
         # === Récupérer le profil à givrer ===
         if choix == "Profil depuis la base":
-            essais = gestion.chercher_nom(nom_profil)
             profil_a_givrer = None
-            for noms in essais:
-                chemin = os.path.join(BASE_DIR, "data", "profils_importes", f"{noms}_coord_profil.dat")
-                if os.path.exists(chemin):
-                    with open(chemin, "r") as f:
-                        coord = [(float(x), float(y)) for x, y in [line.strip().split() for line in f.readlines()[1:]]]
-                        profil_a_givrer = Airfoil(nom_profil, coord)
-                        chemin_dat = chemin
-                        break
+            chemin, _ = gestion.trouver_profil(nom_profil)
+            if chemin is not None and os.path.exists(chemin):
+                _, coord = lire_dat(chemin)
+                profil_a_givrer = Airfoil(nom_profil, coord)
+                chemin_dat = chemin
         else:
             profil_a_givrer = st.session_state.profil
             chemin_dat = st.session_state.chemin_dat
@@ -886,7 +860,8 @@ if st.button("Lancer simulation givrage"):
                 os.remove(txt_givre)
 
             aero_givre.run_xfoil(dat_file=dat_givre, reynolds=reynolds_givre, mach=mach_givre,
-                                 alpha_start=-15, alpha_end=15, alpha_step=1, output_file=txt_givre)
+                                 alpha_start=-15, alpha_end=15, alpha_step=1, output_file=txt_givre,
+                                 cache=cache_polaires, forcer=forcer_xfoil)
 
             # === Simulation du profil normal ===
             txt_normal = os.path.join(BASE_DIR, "data", "polaires_importees", f"{nom_profil}_coef_aero_normal.txt")
@@ -895,20 +870,19 @@ if st.button("Lancer simulation givrage"):
                 os.remove(txt_normal)
 
             aero_normal.run_xfoil(dat_file=chemin_dat, reynolds=reynolds_givre, mach=mach_givre,
-                                      alpha_start=-15, alpha_end=15, alpha_step=1, output_file=txt_normal)
+                                      alpha_start=-15, alpha_end=15, alpha_step=1, output_file=txt_normal,
+                                      cache=cache_polaires, forcer=forcer_xfoil)
             if not os.path.exists(txt_normal):
                 st.error("⚠ Le fichier XFoil normal n’a pas été généré.")
             else:
                 st.success(" Fichier XFoil normal bien généré.")
             # === Tracer les contours ===
             import matplotlib.pyplot as plt
-            with open(chemin_dat, "r") as f:
-                coords_norm = [(float(x), float(y)) for x, y in [l.strip().split() for l in f.readlines()[1:]]]
-            with open(dat_givre, "r") as f:
-                coords_givre = [(float(x), float(y)) for x, y in [l.strip().split() for l in f.readlines()[1:]]]
+            _, coords_norm = lire_dat(chemin_dat)
+            _, coords_givre = lire_dat(dat_givre)
 
-            x_norm, y_norm = zip(*coords_norm)
-            x_givre, y_givre = zip(*coords_givre)
+            x_norm, y_norm = coords_norm[:, 0], coords_norm[:, 1]
+            x_givre, y_givre = coords_givre[:, 0], coords_givre[:, 1]
 
             plt.figure(figsize=(8, 3))
             plt.plot(x_norm, y_norm, label="Profil normal", linewidth=2)
@@ -961,4 +935,103 @@ if st.button("Lancer simulation givrage"):
             else:
                 st.error("Données givrées ou normales invalides.")
     except Exception as e:
-        st.error(f"Erreur pendant la simulation : {e}")
\ No newline at end of file
+        st.error(f"Erreur pendant la simulation : {e}")
+
+# === Étude paramétrique du givrage (épaisseurs × zones × formes) ===
+with st.expander("Étude paramétrique du givrage"):
+    epaisseurs_etude = st.text_input("Épaisseurs (séparées par ;)", "0.005;0.01;0.02", key="etude_givre_ep")
+    debuts_etude = st.text_input("Débuts de zone x0 (séparés par ;)", "0;0.1;0.3", key="etude_givre_x0")
+    fins_etude = st.text_input("Fins de zone x1 (séparées par ;)", "0.2;0.45", key="etude_givre_x1")
+    formes_etude = st.multiselect("Formes", list(FORMES_GIVRE), default=list(FORMES_GIVRE), key="etude_givre_formes")
+    alpha_croisiere = st.number_input("Angle de croisière (°)", value=2.0, step=0.5, key="etude_givre_alpha")
+
+    if st.button("Lancer l'étude paramétrique"):
+        try:
+            def lire_liste(texte):
+                return [float(v) for v in texte.replace(",", ".").replace(" ", "").split(";") if v]
+
+            grille = grille_givrage(lire_liste(epaisseurs_etude), lire_liste(debuts_etude), lire_liste(fins_etude),
+                                    formes_etude)
+            if choix == "Profil depuis la base":
+                chemin, _ = gestion.trouver_profil(nom_profil)
+                coordonnees_etude = lire_dat(chemin)[1] if chemin is not None and os.path.exists(chemin) else None
+            else:
+                profil_etude = st.session_state.profil
+                coordonnees_etude = profil_etude.coordonnees if profil_etude is not None else None
+
+            if coordonnees_etude is None:
+                st.error("Profil non trouvé.")
+            elif grille.empty:
+                st.error("Aucune combinaison valide (x0 doit être inférieur à x1).")
+            else:
+                etude = EtudeGivrage(nom_profil, coordonnees_etude, float(reynolds_givre), float(mach_givre),
+                                     alpha_croisiere=alpha_croisiere)
+                with st.spinner(f"{len(grille)} profils givrés en cours de simulation..."):
+                    resultats = etude.executer(grille, pool=obtenir_pool_xfoil(), cache=cache_polaires)
+                propre = resultats.attrs["propre"]
+                st.write(f"Profil propre : CL_max = {propre['cl_max']:.3f}, "
+                         f"α décrochage = {propre['alpha_decrochage']:.1f}°, CD croisière = {propre['cd_croisiere']:.5f}")
+                st.dataframe(resultats.sort_values("delta_cl_max"))
+        except Exception as e:
+            st.error(f"Erreur pendant l'étude de givrage : {e}")
+
+# === Analyse Monte-Carlo de la rugosité de surface ===
+with st.expander("Analyse Monte-Carlo de la rugosité de surface"):
+    n_realisations = st.number_input("Nombre de réalisations", min_value=1, value=200, step=50, key="rugosite_m")
+    amplitude_rugosite = st.number_input("Amplitude du bruit (fraction de corde)", min_value=0.0, value=0.001,
+                                         step=0.0005, format="%.4f", key="rugosite_amplitude")
+    mode_rugosite = st.selectbox("Loi du bruit", ["gaussien", "uniforme"], key="rugosite_mode")
+    zone_rugosite = st.slider("Zone bruitée (x/c)", 0.0, 1.0, (0.0, 0.3), key="rugosite_zone")
+    graine_rugosite = st.number_input("Graine", min_value=0, value=0, step=1, key="rugosite_graine")
+
+    if st.button("Lancer l'analyse de rugosité"):
+        try:
+            if choix == "Profil depuis la base":
+                chemin, _ = gestion.trouver_profil(nom_profil)
+                coordonnees_etude = lire_dat(chemin)[1] if chemin is not None and os.path.exists(chemin) else None
+            else:
+                profil_etude = st.session_state.profil
+                coordonnees_etude = profil_etude.coordonnees if profil_etude is not None else None
+
+            if coordonnees_etude is None:
+                st.error("Profil non trouvé.")
+            else:
+                etude = EtudeRugosite(nom_profil, coordonnees_etude, float(reynolds_givre), float(mach_givre),
+                                      amplitude=amplitude_rugosite, mode=mode_rugosite, zone=zone_rugosite,
+                                      graine=int(graine_rugosite))
+                with st.spinner(f"{int(n_realisations)} profils rugueux en cours de simulation..."):
+                    bandes = etude.executer(int(n_realisations), pool=obtenir_pool_xfoil())
+                if bandes.attrs["n_polaires"] == 0:
+                    st.error("Aucune polaire obtenue pour les profils rugueux.")
+                else:
+                    st.write(f"{bandes.attrs['n_polaires']} polaires agrégées.")
+                    st.pyplot(tracer_bandes(bandes))
+                    st.dataframe(bandes)
+        except Exception as e:
+            st.error(f"Erreur pendant l'analyse de rugosité : {e}")
+
+# === Recherche dans toutes les polaires de la base (jeu Parquet) ===
+with st.expander("Recherche dans les polaires de la base"):
+    plage_reynolds = st.slider("Reynolds", 1e4, 1e7, (2e5, 1e6), step=1e4, format="%.0f", key="entrepot_re")
+    plage_mach = st.slider("Mach", 0.0, 0.7, (0.0, 0.3), step=0.01, key="entrepot_mach")
+    finesse_min_base = st.number_input("Finesse CL/CD minimale", min_value=0.0, value=50.0, step=5.0,
+                                       key="entrepot_finesse")
+
+    if st.button("Rechercher", key="entrepot_rechercher"):
+        try:
+            # Seules les polaires nouvelles ou recalculées depuis la dernière recherche sont relues
+            with st.spinner("Mise à jour du jeu de polaires..."):
+                n_points = gestion.ingerer_polaires()
+            if n_points:
+                st.write(f"{n_points} point(s) de polaire ingéré(s).")
+            points = gestion.requete_polaires(reynolds_min=plage_reynolds[0], reynolds_max=plage_reynolds[1],
+                                              mach_min=plage_mach[0], mach_max=plage_mach[1],
+                                              finesse_min=finesse_min_base)
+            if points.empty:
+                st.info("Aucun point de polaire ne correspond à ces critères.")
+            else:
+                meilleurs = points.sort_values("finesse", ascending=False).drop_duplicates(["profil", "reynolds", "mach"])
+                st.write(f"{len(points)} point(s), {points['profil'].nunique()} profil(s).")
+                st.dataframe(meilleurs[["profil", "reynolds", "mach", "alpha", "CL", "CD", "finesse", "source"]])
+        except Exception as e:
+            st.error(f"Erreur pendant la recherche de polaires : {e}")
@@ -1,6 +1,7 @@
 import numpy as np
 import os
 import requests
+from collections import namedtuple
 
 """
 Module : ConditionVol
@@ -9,12 +10,26 @@ Ce module définit la classe ConditionVol, qui permet de calculer les **paramèt
 selon l'altitude, le Mach et un écart à l'atmosphère standard (ΔISA), en se basant sur le modèle ISA.
 
 Fonctionnalités principales :
+- Calcul vectorisé de l'atmosphère standard (toutes les couches jusqu'à 86 km) pour des tableaux d'altitudes.
 - Calcul de la température, densité et viscosité de l’air selon l'altitude.
 - Affichage formaté des paramètres de vol.
 - Calcul du nombre de Reynolds pour un profil donné.
 
+Fonctions :
+-----------
+atmosphere_isa(altitude_m, delta_isa=0, geopotentielle=False):
+    Température, pression, densité, viscosités et vitesse du son pour un tableau d'altitudes.
+
+calculer_conditions(altitude_m, corde_m, vitesse_m_s=None, mach=None, ...):
+    Mach, vitesse vraie, Reynolds et pression dynamique pour des tableaux de conditions.
+conditions_vols(df, corde, ...):
+    Ajoute ces grandeurs à un DataFrame d'états OpenSky en une seule passe vectorisée.
+
 Classes :
 ---------
+TableAtmosphere:
+    Table ISA précalculée et interpolée, utilisable à la place d'atmosphere_isa (même signature).
+
 ConditionVol:
     Représente une condition de vol (altitude, Mach, angle d’attaque, ΔISA) et calcule
     les paramètres nécessaires aux simulations aérodynamiques.
@@ -26,8 +41,10 @@ Attributs :
 - angle_deg (float)        : Angle d’attaque en degrés.
 - delta_isa (float)        : Ecart de température par rapport à l’atmosphère standard (K).
 - temperature_K (float)    : Température réelle de l’air (K).
+- pression_Pa (float)      : Pression statique (Pa).
 - densite_kgm3 (float)     : Densité de l’air (kg/m³).
 - viscosite_kgms (float)   : Viscosité dynamique de l’air (kg/(m·s)).
+- vitesse_son_ms (float)   : Vitesse du son (m/s).
 
 Méthodes :
 ----------
@@ -35,12 +52,353 @@ Méthodes :
 - afficher()                 : Affiche les paramètres de vol calculés.
 - calculer_reynolds(...)     : Calcule le nombre de Reynolds à partir des conditions de vol.
 """
+
+# Constantes de l'atmosphère standard (ISA / US Standard Atmosphere 1976)
+G0 = 9.80665            # Gravité (m/s²)
+R_AIR = 287.05287       # Constante des gaz parfaits de l'air sec (J/kg·K)
+GAMMA = 1.4             # Rapport des chaleurs spécifiques
+RAYON_TERRE = 6356766.0  # Rayon terrestre utilisé pour l'altitude géopotentielle (m)
+T0 = 288.15             # Température au sol (K)
+P0 = 101325.0           # Pression au sol (Pa)
+
+# Couches : altitude géopotentielle de base (m) et gradient thermique (K/m)
+ALTITUDES_COUCHES = np.array([0.0, 11000.0, 20000.0, 32000.0, 47000.0, 51000.0, 71000.0])
+GRADIENTS_COUCHES = np.array([-0.0065, 0.0, 0.001, 0.0028, 0.0, -0.0028, -0.002])
+ALTITUDE_MAX_GEOPOTENTIELLE = 84852.0  # 86 km géométriques
+
+
+def _bases_couches():
+    """Température et pression à la base de chaque couche, obtenues en intégrant les couches successives."""
+    temperatures = [T0]
+    pressions = [P0]
+    for i in range(len(ALTITUDES_COUCHES) - 1):
+        T_b, P_b, L = temperatures[-1], pressions[-1], GRADIENTS_COUCHES[i]
+        dh = ALTITUDES_COUCHES[i + 1] - ALTITUDES_COUCHES[i]
+        T = T_b + L * dh
+        P = P_b * (T_b / T) ** (G0 / (R_AIR * L)) if L != 0 else P_b * np.exp(-G0 * dh / (R_AIR * T_b))
+        temperatures.append(T)
+        pressions.append(P)
+    return np.array(temperatures), np.array(pressions)
+
+
+TEMPERATURES_COUCHES, PRESSIONS_COUCHES = _bases_couches()
+
+EtatAtmosphere = namedtuple("EtatAtmosphere", ["T", "P", "rho", "mu", "a", "nu"])
+EtatAtmosphere.__doc__ = """État de l'atmosphère : température (K), pression (Pa), densité (kg/m³),
+viscosité dynamique (kg/(m·s)), vitesse du son (m/s) et viscosité cinématique (m²/s)."""
+
+
+def altitude_geopotentielle(altitude_m):
+    """
+    Convertit une altitude géométrique en altitude géopotentielle.
+
+    Args:
+        altitude_m (float | np.ndarray): Altitude géométrique (m).
+
+    Returns:
+        float | np.ndarray: Altitude géopotentielle (m).
+    """
+    z = np.asarray(altitude_m, dtype=np.float64)
+    return RAYON_TERRE * z / (RAYON_TERRE + z)
+
+
+def viscosite_sutherland(T):
+    """
+    Viscosité dynamique de l'air (formule de Sutherland).
+
+    Args:
+        T (float | np.ndarray): Température (K).
+
+    Returns:
+        float | np.ndarray: Viscosité dynamique (kg/(m·s)).
+    """
+    return 1.458e-6 * T * np.sqrt(T) / (T + 110.4)
+
+
+def atmosphere_isa(altitude_m, delta_isa=0.0, geopotentielle=False):
+    """
+    Calcule l'atmosphère standard pour un tableau d'altitudes en une seule passe vectorisée.
+
+    Les sept couches de l'ISA jusqu'à 86 km sont traitées. Le ΔISA décale la température sans modifier
+    la pression (convention de l'altitude-pression) ; la densité, les viscosités et la vitesse du son
+    sont calculées avec la température réelle. Les altitudes au-delà de 86 km donnent NaN.
+
+    Args:
+        altitude_m (float | array-like): Altitudes (m), géométriques par défaut.
+        delta_isa (float | array-like, optional): Écart(s) de température à l'ISA (K), diffusé(s) avec l'altitude.
+        geopotentielle (bool, optional): True si les altitudes sont déjà géopotentielles.
+
+    Returns:
+        EtatAtmosphere: Tableaux (ou scalaires) T, P, rho, mu, a, nu de même forme que l'entrée.
+
+    Example:
+        >>> etat = atmosphere_isa(np.array([0, 11000, 35000]), delta_isa=10)
+        >>> etat.rho
+    """
+    h = np.asarray(altitude_m, dtype=np.float64)
+    if not geopotentielle:
+        h = altitude_geopotentielle(h)
+    h, delta_isa = np.broadcast_arrays(h, np.asarray(delta_isa, dtype=np.float64))
+
+    couche = np.clip(np.searchsorted(ALTITUDES_COUCHES, h, side="right") - 1, 0, len(ALTITUDES_COUCHES) - 1)
+    H_b = ALTITUDES_COUCHES[couche]
+    T_b = TEMPERATURES_COUCHES[couche]
+    P_b = PRESSIONS_COUCHES[couche]
+    L = GRADIENTS_COUCHES[couche]
+
+    dh = h - H_b
+    T_isa = T_b + L * dh
+    isotherme = L == 0
+    L_sur = np.where(isotherme, 1.0, L)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        P = np.where(isotherme,
+                     P_b * np.exp(-G0 * dh / (R_AIR * T_b)),
+                     P_b * (T_b / T_isa) ** (G0 / (R_AIR * L_sur)))
+    P = np.where(h > ALTITUDE_MAX_GEOPOTENTIELLE, np.nan, P)
+
+    T = np.where(np.isnan(P), np.nan, T_isa + delta_isa)
+    rho = P / (R_AIR * T)
+    mu = viscosite_sutherland(T)
+    a = np.sqrt(GAMMA * R_AIR * T)
+    return EtatAtmosphere(T[()], P[()], rho[()], mu[()], a[()], (mu / rho)[()])
+
+
+class TableAtmosphere:
+    """
+    Atmosphère standard précalculée sur une grille régulière d'altitudes géopotentielles, puis interpolée.
+
+    La température ISA et la pression sont tabulées ; l'indice de la maille est obtenu par simple division
+    (pas de recherche), puis l'interpolation est linéaire, ou cubique d'Hermite avec la dérivée exacte
+    dP/dh = -g0 P / (R T). La température ISA étant linéaire par couche, son interpolation linéaire est exacte
+    dès que les bases des couches tombent sur la grille (cas des valeurs par défaut). Le ΔISA est appliqué
+    analytiquement sur la température, puis densité, viscosités et vitesse du son sont déduites de (T, P).
+    Les altitudes hors de la table sont calculées par le modèle exact.
+
+    Erreur relative maximale sur la pression (donc sur rho et nu) par rapport à ``atmosphere_isa``, entre
+    0 et 20 km, quel que soit le ΔISA (T, mu et a sont exacts) :
+
+    ============  ===========  ===========
+    pas (m)       linéaire     cubique
+    ============  ===========  ===========
+    10            3e-7         2e-14
+    100           3e-5         2e-10
+    1000          3e-3         2e-6
+    ============  ===========  ===========
+
+    ``erreur_max()`` mesure l'erreur pour la configuration choisie.
+
+    Attributes:
+        altitude_min, altitude_max (float): Domaine tabulé (m géopotentiels).
+        pas_m (float): Résolution de la table.
+        interpolation (str): 'lineaire' ou 'cubique'.
+
+    Example:
+        >>> table = TableAtmosphere(pas_m=50, interpolation="cubique")
+        >>> etat = table(altitudes, delta_isa=8)
+        >>> cond = ConditionVol(10000, 0.78, 2, atmosphere=table)
+    """
+    def __init__(self, altitude_min=-1000.0, altitude_max=20000.0, pas_m=100.0, interpolation="lineaire"):
+        if interpolation not in ("lineaire", "cubique"):
+            raise ValueError("interpolation doit valoir 'lineaire' ou 'cubique'.")
+        self.altitude_min = float(altitude_min)
+        self.pas_m = float(pas_m)
+        n_mailles = int(np.ceil((min(altitude_max, ALTITUDE_MAX_GEOPOTENTIELLE) - self.altitude_min) / self.pas_m))
+        self.altitude_max = self.altitude_min + n_mailles * self.pas_m
+        self.interpolation = interpolation
+
+        h = self.altitude_min + self.pas_m * np.arange(n_mailles + 1)
+        etat = atmosphere_isa(h, geopotentielle=True)
+        self._T = etat.T
+        self._P = etat.P
+        self._dP = -G0 * etat.P / (R_AIR * etat.T) * self.pas_m  # dérivée par maille (Hermite)
+
+    def __call__(self, altitude_m, delta_isa=0.0, geopotentielle=False):
+        """
+        Même signature et même résultat (à l'erreur d'interpolation près) qu'``atmosphere_isa``.
+
+        Hors du domaine tabulé, le modèle exact est utilisé.
+
+        Returns:
+            EtatAtmosphere: T, P, rho, mu, a, nu (scalaires pour une altitude scalaire).
+
+        Example:
+            >>> table = TableAtmosphere(altitude_max=20000)
+            >>> bool(abs(table(30000.).T - atmosphere_isa(30000.).T) < 1e-9)
+            True
+        """
+        h = np.asarray(altitude_m, dtype=np.float64)
+        if not geopotentielle:
+            h = altitude_geopotentielle(h)
+        h, delta_isa = np.broadcast_arrays(h, np.asarray(delta_isa, dtype=np.float64))
+
+        u = (h - self.altitude_min) / self.pas_m
+        hors_table = ~((u >= 0) & (u <= len(self._T) - 1))
+        i = np.clip(np.nan_to_num(u).astype(np.intp), 0, len(self._T) - 2)
+        t = u - i
+
+        Ta, Tb = self._T[i], self._T[i + 1]
+        Pa, Pb = self._P[i], self._P[i + 1]
+        T = Ta + t * (Tb - Ta) + delta_isa
+        if self.interpolation == "cubique":
+            t2 = t * t
+            t3 = t2 * t
+            P = ((2 * t3 - 3 * t2 + 1) * Pa + (t3 - 2 * t2 + t) * self._dP[i]
+                 + (3 * t2 - 2 * t3) * Pb + (t3 - t2) * self._dP[i + 1])
+        else:
+            P = Pa + t * (Pb - Pa)
+
+        if hors_table.any():
+            # Entrée scalaire : T et P sont des np.float64, non indexables
+            forme = h.shape
+            hors_table = np.atleast_1d(hors_table)
+            T = np.atleast_1d(T).astype(float, copy=True)
+            P = np.atleast_1d(P).astype(float, copy=True)
+            exact = atmosphere_isa(np.atleast_1d(h)[hors_table], np.atleast_1d(delta_isa)[hors_table],
+                                   geopotentielle=True)
+            T[hors_table] = exact.T
+            P[hors_table] = exact.P
+            T, P = T.reshape(forme), P.reshape(forme)
+
+        rho = P / (R_AIR * T)
+        mu = viscosite_sutherland(T)
+        a = np.sqrt(GAMMA * R_AIR * T)
+        return EtatAtmosphere(T[()], P[()], rho[()], mu[()], a[()], (mu / rho)[()])
+
+    def erreur_max(self, n_points=100001, delta_isa=0.0):
+        """
+        Mesure l'erreur relative maximale de la table par rapport au modèle exact sur son domaine.
+
+        Args:
+            n_points (int, optional): Nombre d'altitudes de contrôle (réparties uniformément).
+            delta_isa (float, optional): ΔISA des points de contrôle.
+
+        Returns:
+            dict: Erreur relative maximale pour chaque grandeur ('T', 'P', 'rho', 'mu', 'a', 'nu').
+        """
+        h = np.linspace(self.altitude_min, self.altitude_max, n_points)
+        exact = atmosphere_isa(h, delta_isa, geopotentielle=True)
+        approche = self(h, delta_isa, geopotentielle=True)
+        return {nom: float(np.max(np.abs(getattr(approche, nom) / getattr(exact, nom) - 1)))
+                for nom in EtatAtmosphere._fields}
+
+
+_table_defaut = None
+
+
+def table_atmosphere_defaut():
+    """
+    Retourne la table d'atmosphère partagée (-1 à 20 km, pas de 100 m, interpolation cubique), créée au premier appel.
+
+    Returns:
+        TableAtmosphere: Table utilisable comme backend de ConditionVol.
+    """
+    global _table_defaut
+    if _table_defaut is None:
+        _table_defaut = TableAtmosphere(interpolation="cubique")
+    return _table_defaut
+
+
+def calculer_conditions(altitude_m, corde_m, vitesse_m_s=None, mach=None, delta_isa=0.0, atmosphere=None):
+    """
+    Calcule les conditions aérodynamiques d'un ensemble de points de vol en une seule passe vectorisée.
+
+    La vitesse est donnée soit directement (vitesse vraie), soit par le nombre de Mach.
+
+    Args:
+        altitude_m (array-like): Altitudes géométriques (m).
+        corde_m (float | array-like): Corde(s) du profil (m).
+        vitesse_m_s (array-like, optional): Vitesses vraies (m/s).
+        mach (array-like, optional): Nombres de Mach (si la vitesse n'est pas donnée).
+        delta_isa (float | array-like, optional): Écart(s) à l'ISA (K).
+        atmosphere (callable, optional): ``atmosphere_isa`` (défaut) ou une TableAtmosphere.
+
+    Returns:
+        dict[str, np.ndarray]: temperature_K, pression_Pa, densite_kgm3, viscosite_kgms, vitesse_son_ms,
+        vitesse_vraie_m_s, mach, reynolds et pression_dynamique_Pa.
+
+    Raises:
+        ValueError: Si ni la vitesse ni le Mach ne sont fournis.
+    """
+    etat = (atmosphere or atmosphere_isa)(altitude_m, delta_isa)
+    if vitesse_m_s is not None:
+        vitesse = np.asarray(vitesse_m_s, dtype=np.float64)
+        mach = vitesse / etat.a
+    elif mach is not None:
+        mach = np.asarray(mach, dtype=np.float64)
+        vitesse = mach * etat.a
+    else:
+        raise ValueError("Il faut fournir la vitesse ou le nombre de Mach.")
+
+    return {
+        "temperature_K": etat.T,
+        "pression_Pa": etat.P,
+        "densite_kgm3": etat.rho,
+        "viscosite_kgms": etat.mu,
+        "vitesse_son_ms": etat.a,
+        "vitesse_vraie_m_s": vitesse,
+        "mach": mach,
+        "reynolds": vitesse * np.asarray(corde_m, dtype=np.float64) / etat.nu,
+        "pression_dynamique_Pa": 0.5 * etat.rho * vitesse**2,
+    }
+
+
+def _colonne_ou_valeur(df, valeur):
+    """Nom de colonne, fonction du DataFrame, tableau ou scalaire -> tableau aligné sur ``df``."""
+    if isinstance(valeur, str):
+        return df[valeur].to_numpy(dtype=np.float64)
+    if callable(valeur):
+        return np.asarray(valeur(df), dtype=np.float64)
+    return np.asarray(valeur, dtype=np.float64)
+
+
+def conditions_vols(df, corde, delta_isa=0.0, atmosphere=None, colonne_altitude="altitude_m",
+                    colonne_vitesse="vitesse_m_s"):
+    """
+    Ajoute Mach, vitesse vraie, Reynolds et pression dynamique à un DataFrame d'états de vols OpenSky.
+
+    OpenSky ne fournit que la vitesse sol : sans donnée de vent, elle est prise comme vitesse vraie.
+    Les altitudes manquantes valent NaN dans les colonnes calculées.
+
+    Args:
+        df (pd.DataFrame): États des vols (une ligne par avion), avec au moins l'altitude et la vitesse.
+        corde (float | str | array-like | callable): Modèle de corde : valeur unique, nom de colonne,
+            tableau aligné sur ``df``, ou fonction ``corde(df) -> tableau`` (ex : selon la vitesse ou la catégorie).
+        delta_isa (float | str | array-like | callable, optional): ΔISA, avec les mêmes possibilités.
+        atmosphere (callable, optional): ``atmosphere_isa`` (défaut) ou une TableAtmosphere.
+        colonne_altitude (str, optional): Colonne des altitudes géométriques (m).
+        colonne_vitesse (str, optional): Colonne des vitesses (m/s).
+
+    Returns:
+        pd.DataFrame: Copie de ``df`` avec les colonnes corde_m, temperature_K, densite_kgm3, viscosite_kgms,
+        vitesse_son_ms, vitesse_vraie_m_s, mach, reynolds et pression_dynamique_Pa.
+
+    Example:
+        >>> df = conditions_vols(df_vols, corde=lambda d: np.where(d["vitesse_m_s"] > 150, 4.0, 1.5))
+        >>> taches = [{"reynolds": r, "mach": m, ...} for r, m in zip(df["reynolds"], df["mach"])]
+    """
+    resultat = df.copy()
+    corde_m = np.broadcast_to(_colonne_ou_valeur(df, corde), (len(df),))
+    conditions = calculer_conditions(
+        _colonne_ou_valeur(df, colonne_altitude),
+        corde_m,
+        vitesse_m_s=_colonne_ou_valeur(df, colonne_vitesse),
+        delta_isa=_colonne_ou_valeur(df, delta_isa),
+        atmosphere=atmosphere,
+    )
+    resultat["corde_m"] = corde_m
+    for nom in ("temperature_K", "densite_kgm3", "viscosite_kgms", "vitesse_son_ms", "vitesse_vraie_m_s",
+                "mach", "reynolds", "pression_dynamique_Pa"):
+        resultat[nom] = np.broadcast_to(conditions[nom], (len(df),))
+    return resultat
+
+
 class ConditionVol:
-    def __init__(self, altitude_m, mach, angle_deg, delta_isa=0):
+    def __init__(self, altitude_m, mach, angle_deg, delta_isa=0, atmosphere=None):
         self.altitude_m = altitude_m          # Altitude en mètres
         self.mach = mach                      # Nombre de Mach
         self.angle_deg = angle_deg            # Angle d'attaque (°)
         self.delta_isa = delta_isa            # Écart par rapport à l'atmosphère standard (K ou °C)
+        self.atmosphere = atmosphere or atmosphere_isa  # Modèle exact, ou TableAtmosphere
 
         # Calcul des paramètres atmosphériques
         self.temperature_K, self.densite_kgm3, self.viscosite_kgms = self._calculer_parametres_isa()
@@ -48,39 +406,20 @@ class ConditionVol:
     def _calculer_parametres_isa(self):
 
         """
-                Calcule les paramètres atmosphériques basés sur le modèle ISA (Standard Atmosphere).
-
-                Le modèle ISA fournit des estimations de la température, pression, densité et viscosité
-                de l'air en fonction de l'altitude. Cette méthode applique la formule de la troposphère
-                si l'altitude est ≤ 11 000 m, sinon celle de la stratosphère (température constante).
-
-                Returns:
-                    T (float): Température de l'air en Kelvin.
-                    rho (float): Densité de l'air en kg/m³.
-                    mu (float): Viscosité dynamique de l'air en kg/(m·s).
-                """
-        # Constantes
-        T0 = 288.15      # Température au sol (K)
-        P0 = 101325      # Pression au sol (Pa)
-        g = 9.80665      # Gravité (m/s²)
-        R = 287.05       # Constante des gaz parfaits (J/kg·K)
-        L = 0.0065       # Gradient thermique (K/m)
-
-        if self.altitude_m <= 11000:
-            # Troposphère : température diminue avec l'altitude
-            T_ISA = T0 - L * self.altitude_m
-            T = T_ISA + self.delta_isa
-            P = P0 * ((T_ISA) / T0) ** (g / (R * L))
-        else:
-            # Stratosphère (T constante, P chute exponentiellement)
-            T_ISA = 216.65
-            T = T_ISA + self.delta_isa
-            P = 22632.06 * np.exp(-g * (self.altitude_m - 11000) / (R * T))
+        Calcule les paramètres atmosphériques basés sur le modèle ISA (Standard Atmosphere).
 
-        rho = P / (R * T)
-        mu = 1.458e-6 * T**1.5 / (T + 110.4)  # Formule de Sutherland
+        Délègue au modèle ``self.atmosphere`` (``atmosphere_isa`` par défaut, ou une TableAtmosphere) ;
+        la pression et la vitesse du son sont conservées dans ``pression_Pa`` et ``vitesse_son_ms``.
 
-        return T, rho, mu
+        Returns:
+            T (float): Température de l'air en Kelvin.
+            rho (float): Densité de l'air en kg/m³.
+            mu (float): Viscosité dynamique de l'air en kg/(m·s).
+        """
+        etat = self.atmosphere(self.altitude_m, self.delta_isa)
+        self.pression_Pa = etat.P
+        self.vitesse_son_ms = etat.a
+        return etat.T, etat.rho, etat.mu
 
     def afficher(self):
         print(f"Altitude        : {self.altitude_m} m")
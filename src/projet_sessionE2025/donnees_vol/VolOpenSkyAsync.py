@@ -1,9 +1,13 @@
 #import sys
 #print("Python exécuté :", sys.executable)
 import asyncio
-import requests
+import numpy as np
+import pandas as pd
 from python_opensky import OpenSky, StatesResponse
 import os
+
+from projet_sessionE2025.donnees_vol.ConditionVol import calculer_conditions
+from projet_sessionE2025.donnees_vol.meteo_isa import client_delta_isa_defaut
 """
 Script pour récupérer les données de vols en temps réel via l’API OpenSky 
 et afficher les détails aérodynamiques, incluant le calcul du delta ISA 
@@ -12,6 +16,7 @@ via l’API OpenWeather.
 Fonctionnalités :
 - Connexion asynchrone à OpenSky pour récupérer les vols en temps réel.
 - Affichage d'une liste de vols avec altitude et vitesse.
+- Conversion des états en DataFrame (une ligne par avion).
 - Calcul du Mach et du delta ISA basé sur la température atmosphérique réelle.
 - Utilisation de l’API OpenWeather pour estimer la température observée.
 
@@ -27,6 +32,8 @@ def calcul_delta_isa(lat: float, lon: float, alt_m: float, api_key: str) -> floa
 
        Cette fonction interroge OpenWeather pour obtenir la température au sol, puis extrapole
        la température à l’altitude donnée selon un gradient thermique standard (0.0065 K/m).
+       La requête passe par le client partagé de meteo_isa (cache par maille, délai maximal) ; pour
+       plusieurs vols, utiliser directement ``ClientDeltaIsa.delta_isa_lot``.
 
        Args:
            lat (float): Latitude du vol.
@@ -37,26 +44,8 @@ def calcul_delta_isa(lat: float, lon: float, alt_m: float, api_key: str) -> floa
        Returns:
            float | None: Écart ΔISA en Kelvin si calcul réussi, sinon None.
        """
-    url = "https://api.openweathermap.org/data/2.5/weather"
-    params = {"lat": lat, "lon": lon, "appid": api_key}
-    resp = requests.get(url, params=params)
-
-    # Vérifier le statut HTTP
-    if resp.status_code != 200:
-        print(f"[OPENWEATHER ERROR] HTTP {resp.status_code} — {resp.text}")
-        return None
-
-    data = resp.json()
-    #  Vérifier que main.temp existe
-    if "main" not in data or "temp" not in data["main"]:
-        print(f"[OPENWEATHER ERROR] réponse inattendue : {data}")
-        return None
-
-    T_sol_K = data["main"]["temp"]
-    lapse = 0.0065  # K/m
-    T_obs = T_sol_K - lapse * alt_m
-    T_isa = 288.15 - lapse * alt_m
-    return T_obs - T_isa
+    delta = client_delta_isa_defaut(api_key).delta_isa_lot([lat], [lon])[0]
+    return None if np.isnan(delta) else float(delta)
 
 async def fetch_vols(limit: int = 20):
     """
@@ -72,6 +61,28 @@ async def fetch_vols(limit: int = 20):
         states: StatesResponse = await api.get_states()
         return states.states[:limit]  # liste d'objets State
 
+def etats_vers_dataframe(vols):
+    """
+    Convertit les états OpenSky en DataFrame (une ligne par avion).
+
+    Args:
+        vols (list[State]): États retournés par ``fetch_vols``.
+
+    Returns:
+        pd.DataFrame: Colonnes icao24, callsign, origin_country, altitude_m (géométrique), vitesse_m_s,
+        latitude et longitude.
+    """
+    return pd.DataFrame([{
+        "icao24": v.icao24,
+        "callsign": (v.callsign or "").strip(),
+        "origin_country": v.origin_country,
+        "altitude_m": v.geo_altitude or 0.0,
+        "vitesse_m_s": v.velocity or 0.0,
+        "latitude": v.latitude,
+        "longitude": v.longitude
+    } for v in vols], columns=["icao24", "callsign", "origin_country", "altitude_m", "vitesse_m_s",
+                               "latitude", "longitude"])
+
 def afficher_liste(vols):
     """
        Affiche une liste formatée des vols récupérés : callsign, pays d’origine,
@@ -88,11 +99,8 @@ def afficher_liste(vols):
 def afficher_details(s):
     lat, lon = s.latitude, s.longitude
     alt = s.geo_altitude or 0
-    # Mach
-    gamma, R = 1.4, 287.05
-    T_std = 288.15 - 0.0065 * alt
-    vitesse_son = (gamma * R * T_std) ** 0.5
-    mach = (s.velocity or 0) / vitesse_son
+    # Mach (atmosphère standard)
+    mach = float(calculer_conditions(alt, 1.0, vitesse_m_s=s.velocity or 0)["mach"])
     # ΔISA (optionnel)
     delta = calcul_delta_isa(lat, lon, alt, API_KEY_OPENWEATHER)
 
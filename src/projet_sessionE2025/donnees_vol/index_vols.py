@@ -0,0 +1,131 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+from projet_sessionE2025.donnees_vol.ConditionVol import calculer_conditions
+
+"""
+Module : index_vols
+
+Index spatial et en altitude d'un instantané des états de vols, pour les requêtes du type
+« vols à moins de 200 km d'un point, entre FL250 et FL390, à Mach > 0.7 ».
+
+- position : arbre k-d (scipy cKDTree) sur les coordonnées cartésiennes du point sur la sphère unité ; une
+  distance orthodromique d correspond à une corde 2·sin(d / 2R), la recherche par rayon est donc exacte ;
+- altitude : altitudes triées, un intervalle est résolu par deux recherches dichotomiques ;
+- Mach : filtre vectorisé sur les candidats restants.
+
+Construire l'index d'une dizaine de milliers d'avions prend quelques millisecondes et une requête moins d'une
+dixième de milliseconde ; ServiceIngestion.index() ne le reconstruit que quand le tampon a changé.
+"""
+
+PIED_M = 0.3048
+RAYON_MOYEN_TERRE = 6371008.8  # Rayon moyen (m) pour les distances orthodromiques
+
+
+def altitude_niveau_vol(niveau):
+    """
+    FL250 -> 7620 m (niveau de vol en centaines de pieds, atmosphère standard).
+    """
+    return niveau * 100 * PIED_M
+
+
+def _sphere_unite(lat, lon):
+    lat, lon = np.radians(lat), np.radians(lon)
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+class IndexVols:
+    """
+    Index d'un instantané de vols (colonnes de ``etats_vers_dataframe``).
+
+    Attributes:
+        df (pd.DataFrame): Instantané indexé (colonne ``mach`` ajoutée si absente).
+    """
+    def __init__(self, df):
+        """
+        Args:
+            df (pd.DataFrame): États des vols ; ``latitude``, ``longitude``, ``altitude_m`` et ``vitesse_m_s``
+                (ou ``mach``) sont utilisées.
+        """
+        df = df.reset_index(drop=True)
+        altitude = df["altitude_m"].to_numpy(dtype=np.float64, na_value=np.nan)
+        if "mach" not in df:
+            vitesse = df["vitesse_m_s"].to_numpy(dtype=np.float64, na_value=np.nan)
+            df = df.assign(mach=calculer_conditions(altitude, 1.0, vitesse_m_s=vitesse)["mach"])
+        self.df = df
+        self._mach = df["mach"].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        lat = df["latitude"].to_numpy(dtype=np.float64, na_value=np.nan)
+        lon = df["longitude"].to_numpy(dtype=np.float64, na_value=np.nan)
+        self._positionnes = np.flatnonzero(np.isfinite(lat) & np.isfinite(lon))
+        self._arbre = cKDTree(_sphere_unite(lat[self._positionnes], lon[self._positionnes]))
+
+        # Altitudes triées (les NaN, placés en fin par argsort, sont exclus)
+        ordre = np.argsort(altitude, kind="stable")
+        n_valides = int(np.isfinite(altitude).sum())
+        self._ordre_altitude = ordre[:n_valides]
+        self._altitudes_triees = altitude[self._ordre_altitude]
+
+    def __len__(self):
+        return len(self.df)
+
+    def indices(self, lat=None, lon=None, rayon_km=None, altitude_min=None, altitude_max=None,
+                mach_min=None, mach_max=None):
+        """
+        Positions (dans ``df``) des vols qui satisfont tous les critères fournis, en ordre croissant.
+
+        Args:
+            lat, lon (float, optional): Centre de la recherche (°).
+            rayon_km (float, optional): Distance orthodromique maximale au centre.
+            altitude_min, altitude_max (float, optional): Intervalle d'altitude [min, max[ (m).
+            mach_min, mach_max (float, optional): Intervalle de Mach [min, max].
+
+        Returns:
+            np.ndarray: Positions des vols retenus.
+        """
+        candidats = None
+        if altitude_min is not None or altitude_max is not None:
+            debut = 0 if altitude_min is None else np.searchsorted(self._altitudes_triees, altitude_min, "left")
+            fin = len(self._altitudes_triees) if altitude_max is None else \
+                np.searchsorted(self._altitudes_triees, altitude_max, "left")
+            candidats = np.sort(self._ordre_altitude[debut:fin])
+
+        if rayon_km is not None:
+            corde = 2.0 * np.sin(min(rayon_km * 1e3 / RAYON_MOYEN_TERRE, np.pi) / 2.0)
+            voisins = self._arbre.query_ball_point(_sphere_unite(lat, lon)[0], corde, return_sorted=True)
+            proches = self._positionnes[np.asarray(voisins, dtype=np.intp)]
+            candidats = proches if candidats is None else \
+                np.intersect1d(candidats, proches, assume_unique=True)
+
+        if candidats is None:
+            candidats = np.arange(len(self.df))
+        if mach_min is not None or mach_max is not None:
+            mach = self._mach[candidats]
+            garde = np.ones(len(candidats), dtype=bool)
+            if mach_min is not None:
+                garde &= mach >= mach_min
+            if mach_max is not None:
+                garde &= mach <= mach_max
+            candidats = candidats[garde]
+        return candidats
+
+    def rechercher(self, limite=None, **criteres):
+        """
+        Vols qui satisfont les critères de ``indices``, dans l'ordre de l'instantané.
+
+        Args:
+            limite (int, optional): Nombre maximal de vols retournés.
+            **criteres: Voir ``indices``.
+
+        Returns:
+            pd.DataFrame: Lignes retenues de ``df``.
+
+        Example:
+            >>> index.rechercher(lat=45.5, lon=-73.6, rayon_km=200, altitude_min=altitude_niveau_vol(250),
+            ...                  altitude_max=altitude_niveau_vol(390), mach_min=0.7)
+        """
+        positions = self.indices(**criteres)
+        if limite is not None:
+            positions = positions[:limite]
+        return self.df.iloc[positions]
@@ -0,0 +1,363 @@
+import os
+import time
+import asyncio
+import threading
+
+import numpy as np
+import pandas as pd
+
+"""
+Module : ingestion_opensky
+
+Service d'ingestion continue des états de vols OpenSky.
+
+Une boucle asyncio, exécutée dans un thread d'arrière-plan, interroge la source à cadence fixe avec une
+session HTTP unique et range les états reçus dans un tampon circulaire colonnaire (TamponEtats) : une ligne
+par avion (icao24), les ``profondeur`` derniers états de chaque avion sur les colonnes. ``choisir_vols`` et
+les pages Streamlit lisent un instantané de ce tampon au lieu de relancer une requête OpenSky à chaque
+interaction.
+
+Deux sources sont disponibles :
+- SourceOpenSky : l'API OpenSky (l'appel sans zone coûte 4 crédits ; 400 crédits par jour en anonyme) ;
+- SourceRejeu : des instantanés enregistrés (CSV ou Parquet) rejoués dans l'ordre, pour travailler hors ligne.
+
+La variable d'environnement OPENSKY_REJEU (chemin d'un fichier enregistré) fait utiliser le rejeu par
+``service_defaut()``.
+"""
+
+COLONNES_TEXTE = ["callsign", "origin_country"]
+COLONNES_NUMERIQUES = ["horodatage", "altitude_m", "vitesse_m_s", "latitude", "longitude"]
+COLONNES_ETATS = ["icao24", "callsign", "origin_country", "altitude_m", "vitesse_m_s", "latitude", "longitude",
+                  "horodatage"]
+
+
+class TamponEtats:
+    """
+    Tampon circulaire colonnaire des derniers états de chaque avion.
+
+    Chaque grandeur numérique est un tableau (avions, profondeur) ; la ligne d'un avion est retrouvée par
+    son icao24 et réutilisée quand l'avion n'a plus été vu depuis ``retention_s``. Les insertions sont
+    vectorisées et protégées par un verrou (lecture depuis les sessions Streamlit, écriture depuis la boucle).
+
+    Attributes:
+        profondeur (int): Nombre d'états conservés par avion.
+        retention_s (float): Durée après laquelle un avion absent est oublié.
+        version (int): Incrémenté à chaque lot ajouté (permet de savoir si un index est à jour).
+    """
+    def __init__(self, profondeur=32, capacite=4096, retention_s=900.0):
+        self.profondeur = profondeur
+        self.retention_s = retention_s
+        self._verrou = threading.Lock()
+        self.version = 0
+        self._lignes = {}
+        self._libres = []
+        self._allouer(capacite)
+
+    def _allouer(self, capacite):
+        """Crée (ou agrandit) les tableaux pour ``capacite`` avions."""
+        ancienne = len(self._icao24) if hasattr(self, "_icao24") else 0
+        numeriques = {nom: np.full((capacite, self.profondeur), np.nan) for nom in COLONNES_NUMERIQUES}
+        textes = {nom: np.full(capacite, "", dtype=object) for nom in COLONNES_TEXTE}
+        tete = np.zeros(capacite, dtype=np.intp)
+        compte = np.zeros(capacite, dtype=np.intp)
+        icao24 = np.full(capacite, "", dtype=object)
+        if ancienne:
+            for nom in COLONNES_NUMERIQUES:
+                numeriques[nom][:ancienne] = self._numeriques[nom]
+            for nom in COLONNES_TEXTE:
+                textes[nom][:ancienne] = self._textes[nom]
+            tete[:ancienne] = self._tete
+            compte[:ancienne] = self._compte
+            icao24[:ancienne] = self._icao24
+        self._numeriques, self._textes = numeriques, textes
+        self._tete, self._compte, self._icao24 = tete, compte, icao24
+        self._libres.extend(range(capacite - 1, ancienne - 1, -1))
+
+    def _ligne(self, icao24):
+        ligne = self._lignes.get(icao24)
+        if ligne is None:
+            if not self._libres:
+                self._allouer(2 * len(self._icao24))
+            ligne = self._libres.pop()
+            self._lignes[icao24] = ligne
+            self._icao24[ligne] = icao24
+        return ligne
+
+    def __len__(self):
+        return len(self._lignes)
+
+    def ajouter(self, etats):
+        """
+        Ajoute un lot d'états (un par avion au plus ; en cas de doublon, le dernier l'emporte).
+
+        Args:
+            etats (pd.DataFrame): Colonnes COLONNES_ETATS ; ``horodatage`` (s, epoch) vaut l'heure courante s'il manque.
+        """
+        if etats is None or etats.empty:
+            return
+        etats = etats.drop_duplicates("icao24", keep="last")
+        if "horodatage" not in etats:
+            etats = etats.assign(horodatage=time.time())
+
+        with self._verrou:
+            lignes = np.fromiter((self._ligne(i) for i in etats["icao24"]), dtype=np.intp, count=len(etats))
+            positions = self._tete[lignes]
+            for nom in COLONNES_NUMERIQUES:
+                self._numeriques[nom][lignes, positions] = pd.to_numeric(etats[nom], errors="coerce").to_numpy(
+                    dtype=np.float64, na_value=np.nan)
+            for nom in COLONNES_TEXTE:
+                self._textes[nom][lignes] = etats[nom].fillna("").to_numpy(dtype=object)
+            self._tete[lignes] = (positions + 1) % self.profondeur
+            self._compte[lignes] = np.minimum(self._compte[lignes] + 1, self.profondeur)
+            self._purger(np.nanmax(self._numeriques["horodatage"][lignes, positions]))
+            self.version += 1
+
+    def _purger(self, maintenant):
+        """Libère les lignes des avions absents depuis plus de ``retention_s``."""
+        actives = np.flatnonzero(self._compte > 0)
+        derniers = self._numeriques["horodatage"][actives, (self._tete[actives] - 1) % self.profondeur]
+        for ligne in actives[derniers < maintenant - self.retention_s]:
+            del self._lignes[self._icao24[ligne]]
+            self._compte[ligne] = 0
+            self._tete[ligne] = 0
+            for nom in COLONNES_NUMERIQUES:
+                self._numeriques[nom][ligne] = np.nan
+            self._libres.append(ligne)
+
+    def instantane(self, limite=None):
+        """
+        Dernier état connu de chaque avion.
+
+        Args:
+            limite (int, optional): Nombre maximal d'avions retournés (les plus récemment vus d'abord).
+
+        Returns:
+            pd.DataFrame: Une ligne par avion, colonnes COLONNES_ETATS (mêmes noms qu'``etats_vers_dataframe``).
+        """
+        with self._verrou:
+            actives = np.flatnonzero(self._compte > 0)
+            derniers = (self._tete[actives] - 1) % self.profondeur
+            donnees = {"icao24": self._icao24[actives]}
+            for nom in COLONNES_TEXTE:
+                donnees[nom] = self._textes[nom][actives]
+            for nom in COLONNES_NUMERIQUES:
+                donnees[nom] = self._numeriques[nom][actives, derniers]
+
+        df = pd.DataFrame(donnees, columns=COLONNES_ETATS)
+        df = df.sort_values("horodatage", ascending=False, kind="stable").reset_index(drop=True)
+        return df.head(limite) if limite is not None else df
+
+    def historique(self, icao24):
+        """
+        États récents d'un avion, du plus ancien au plus récent.
+
+        Args:
+            icao24 (str): Identifiant de l'avion.
+
+        Returns:
+            pd.DataFrame: Colonnes COLONNES_NUMERIQUES (vide si l'avion est inconnu).
+        """
+        with self._verrou:
+            ligne = self._lignes.get(icao24)
+            if ligne is None:
+                return pd.DataFrame(columns=COLONNES_NUMERIQUES)
+            n = self._compte[ligne]
+            ordre = (self._tete[ligne] - n + np.arange(n)) % self.profondeur
+            return pd.DataFrame({nom: self._numeriques[nom][ligne, ordre] for nom in COLONNES_NUMERIQUES})
+
+
+class SourceOpenSky:
+    """
+    Source d'états OpenSky ; la session HTTP est ouverte une fois et réutilisée à chaque lecture.
+
+    Attributes:
+        zone (BoundingBox, optional): Zone géographique interrogée (moins de crédits consommés).
+    """
+    def __init__(self, zone=None):
+        self.zone = zone
+        self._api = None
+
+    async def lire(self):
+        """
+        Returns:
+            pd.DataFrame: États courants (COLONNES_ETATS).
+        """
+        from python_opensky import OpenSky
+        from projet_sessionE2025.donnees_vol.VolOpenSkyAsync import etats_vers_dataframe
+
+        if self._api is None:
+            self._api = OpenSky()
+        reponse = await self._api.get_states(bounding_box=self.zone)
+        df = etats_vers_dataframe(reponse.states)
+        df["horodatage"] = [float(v.time_position or v.last_contact or reponse.time) for v in reponse.states]
+        return df
+
+    async def fermer(self):
+        if self._api is not None:
+            await self._api.close()
+            self._api = None
+
+
+class SourceRejeu:
+    """
+    Rejoue des instantanés enregistrés, un par lecture, dans l'ordre de leur colonne ``horodatage``.
+
+    Attributes:
+        boucle (bool): Recommence au premier instantané après le dernier.
+    """
+    def __init__(self, donnees, boucle=True):
+        """
+        Args:
+            donnees (str | pd.DataFrame): Fichier .csv/.parquet ou DataFrame (COLONNES_ETATS, plusieurs
+                horodatages).
+            boucle (bool, optional): Recommence au début une fois tous les instantanés rejoués.
+        """
+        if isinstance(donnees, str):
+            donnees = pd.read_parquet(donnees) if donnees.endswith(".parquet") else pd.read_csv(donnees)
+        self._instantanes = [groupe for _, groupe in donnees.groupby("horodatage", sort=True)]
+        self.boucle = boucle
+        self._position = 0
+
+    async def lire(self):
+        """
+        Returns:
+            pd.DataFrame | None: Instantané suivant, ou None quand le rejeu est terminé.
+        """
+        if self._position >= len(self._instantanes):
+            if not self.boucle or not self._instantanes:
+                return None
+            self._position = 0
+        instantane = self._instantanes[self._position]
+        self._position += 1
+        return instantane
+
+    async def fermer(self):
+        pass
+
+
+class ServiceIngestion:
+    """
+    Boucle d'ingestion en arrière-plan : lit la source à cadence fixe et alimente un TamponEtats.
+
+    Example:
+        >>> service = ServiceIngestion(SourceRejeu("vols.parquet"), cadence_s=1).demarrer()
+        >>> df = service.instantane(limite=100)
+    """
+    def __init__(self, source, cadence_s=60.0, tampon=None):
+        self.source = source
+        self.cadence_s = cadence_s
+        self.tampon = tampon if tampon is not None else TamponEtats()
+        self.derniere_mise_a_jour = None
+        self._index = (-1, None)
+        self._premier_lot = threading.Event()
+        self._attente_expiree = False  # le premier lot s'est déjà fait attendre : on n'attend plus
+        self._arret = threading.Event()
+        self._thread = None
+
+    async def _boucle(self):
+        try:
+            while not self._arret.is_set():
+                debut = time.monotonic()
+                try:
+                    etats = await self.source.lire()
+                except Exception as e:  # réseau, quota OpenSky... : on retente au prochain cycle
+                    print(f"[ERREUR] Ingestion OpenSky : {e}")
+                else:
+                    if etats is not None:
+                        self.tampon.ajouter(etats)
+                        self.derniere_mise_a_jour = time.time()
+                        self._premier_lot.set()
+                await asyncio.sleep(max(0.0, self.cadence_s - (time.monotonic() - debut)))
+        finally:
+            await self.source.fermer()
+
+    def demarrer(self):
+        """
+        Lance la boucle dans un thread d'arrière-plan (sans effet si elle tourne déjà).
+
+        Returns:
+            ServiceIngestion: Le service, pour chaîner les appels.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._arret.clear()
+            self._thread = threading.Thread(target=asyncio.run, args=(self._boucle(),), daemon=True,
+                                            name="ingestion-opensky")
+            self._thread.start()
+        return self
+
+    def arreter(self, timeout=None):
+        """
+        Demande l'arrêt de la boucle (effectif à la fin du cycle en cours).
+        """
+        self._arret.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _attendre_premier_lot(self, attente_s):
+        """
+        Attend le premier lot au plus une fois : si la source ne répond pas, les appels suivants rendent la main
+        tout de suite (instantané vide) au lieu de bloquer à chaque fois.
+        """
+        if self._premier_lot.is_set() or self._attente_expiree:
+            return
+        if not self._premier_lot.wait(attente_s):
+            self._attente_expiree = True
+            print(f"[INFO] Aucun état de vol reçu après {attente_s:g} s ; les vols apparaîtront dès le premier lot.")
+
+    def instantane(self, limite=None, attente_s=30.0):
+        """
+        Dernier état de chaque avion, sans requête réseau.
+
+        Args:
+            limite (int, optional): Nombre maximal d'avions.
+            attente_s (float, optional): Attente maximale du premier lot si le service vient de démarrer
+                (une seule fois : si elle expire, les appels suivants n'attendent plus).
+
+        Returns:
+            pd.DataFrame: Une ligne par avion (vide si aucun lot n'a encore été reçu).
+        """
+        self._attendre_premier_lot(attente_s)
+        return self.tampon.instantane(limite)
+
+    def index(self, attente_s=30.0):
+        """
+        Index spatial et en altitude du dernier instantané, reconstruit seulement si le tampon a changé.
+
+        Args:
+            attente_s (float, optional): Attente maximale du premier lot si le service vient de démarrer
+                (une seule fois : si elle expire, les appels suivants n'attendent plus).
+
+        Returns:
+            IndexVols: Index de tous les avions du tampon.
+        """
+        from projet_sessionE2025.donnees_vol.index_vols import IndexVols
+
+        self._attendre_premier_lot(attente_s)
+        version, index = self._index
+        if index is None or version != self.tampon.version:
+            version = self.tampon.version
+            index = IndexVols(self.tampon.instantane())
+            self._index = (version, index)
+        return index
+
+
+_service_defaut = None
+_verrou_service = threading.Lock()
+
+
+def service_defaut(cadence_s=60.0):
+    """
+    Retourne le service d'ingestion partagé, démarré au premier appel.
+
+    La source est le rejeu du fichier désigné par OPENSKY_REJEU s'il est défini, sinon l'API OpenSky.
+
+    Returns:
+        ServiceIngestion: Service en cours d'exécution.
+    """
+    global _service_defaut
+    with _verrou_service:
+        if _service_defaut is None:
+            rejeu = os.environ.get("OPENSKY_REJEU")
+            source = SourceRejeu(rejeu) if rejeu else SourceOpenSky()
+            _service_defaut = ServiceIngestion(source, cadence_s=cadence_s).demarrer()
+    return _service_defaut
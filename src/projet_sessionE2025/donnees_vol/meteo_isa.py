@@ -0,0 +1,205 @@
+import os
+import time
+import asyncio
+import threading
+
+import numpy as np
+import aiohttp
+
+"""
+Module : meteo_isa
+
+Client asynchrone OpenWeather pour l'écart à l'atmosphère standard (ΔISA) d'un grand nombre de vols.
+
+La température au sol est demandée une seule fois par maille de la grille lat/lon (``resolution_deg``) et par
+période de cache (``ttl_s``) :
+- les vols d'un lot sont regroupés par maille avant toute requête ;
+- une maille déjà demandée par une autre coroutine n'est pas redemandée, on attend la même réponse ;
+- les requêtes partagent une session HTTP (connexions réutilisées), un délai maximal et un nombre maximal
+  de requêtes simultanées.
+
+Le gradient standard (0.0065 K/m) étant appliqué aux deux températures, ΔISA = T_sol - 288.15 K ne dépend que
+de la maille et pas de l'altitude.
+
+L'URL du service peut être redirigée (paramètre ``url`` ou variable d'environnement OPENWEATHER_URL), par
+exemple vers un serveur local qui imite OpenWeather pour les essais.
+"""
+
+URL_OPENWEATHER = "https://api.openweathermap.org/data/2.5/weather"
+T0_ISA = 288.15
+
+
+class ClientDeltaIsa:
+    """
+    Client ΔISA avec regroupement par maille, cache à durée de vie et concurrence bornée.
+
+    Attributes:
+        api_key (str): Clé OpenWeather (sans clé, aucune requête n'est envoyée et ΔISA vaut NaN).
+        url (str): URL du service météo.
+        resolution_deg (float): Taille de la maille lat/lon en degrés.
+        ttl_s (float): Durée de validité d'une température en cache.
+
+    Example:
+        >>> client = ClientDeltaIsa(api_key, resolution_deg=1.0)
+        >>> deltas = client.delta_isa_lot(df["latitude"], df["longitude"])
+    """
+    def __init__(self, api_key, url=None, resolution_deg=1.0, ttl_s=1800.0, max_requetes=8, timeout_s=10.0):
+        self.api_key = api_key
+        self.url = url or os.environ.get("OPENWEATHER_URL", URL_OPENWEATHER)
+        self.resolution_deg = resolution_deg
+        self.ttl_s = ttl_s
+        self.max_requetes = max_requetes
+        self.timeout_s = timeout_s
+        self.requetes = 0
+        self._cache = {}      # maille -> (instant d'expiration, T_sol en K)
+        self._en_cours = {}   # maille -> tâche de la requête en cours
+        self._session = None
+        self._semaphore = None
+        self._verrou_lot = threading.Lock()  # un seul delta_isa_lot (donc une seule boucle) à la fois
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.fermer()
+
+    async def fermer(self):
+        if self._session is not None:
+            await self._session.close()
+        self._session, self._semaphore, self._en_cours = None, None, {}
+
+    def _ouvrir(self):
+        """
+        Crée la session HTTP et le sémaphore ; tous deux sont liés à la boucle asyncio en cours.
+        """
+        self._session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self.timeout_s),
+            connector=aiohttp.TCPConnector(limit=self.max_requetes))
+        self._semaphore = asyncio.Semaphore(self.max_requetes)
+
+    def mailles(self, lat, lon):
+        """
+        Indices entiers de maille des positions (tableaux (n, 2)).
+        """
+        lat = np.nan_to_num(np.asarray(lat, dtype=np.float64).ravel())
+        lon = np.nan_to_num(np.asarray(lon, dtype=np.float64).ravel())
+        return np.round(np.column_stack((lat, lon)) / self.resolution_deg).astype(np.int64)
+
+    async def _requete(self, maille):
+        lat, lon = maille[0] * self.resolution_deg, maille[1] * self.resolution_deg
+        params = {"lat": f"{lat:.4f}", "lon": f"{lon:.4f}", "appid": self.api_key}
+        try:
+            async with self._semaphore:
+                self.requetes += 1
+                async with self._session.get(self.url, params=params) as resp:
+                    if resp.status != 200:
+                        print(f"[OPENWEATHER ERROR] HTTP {resp.status} — {await resp.text()}")
+                        return None
+                    data = await resp.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"[OPENWEATHER ERROR] {type(e).__name__} : {e}")
+            return None
+
+        if "main" not in data or "temp" not in data["main"]:
+            print(f"[OPENWEATHER ERROR] réponse inattendue : {data}")
+            return None
+        T_sol = float(data["main"]["temp"])
+        self._cache[maille] = (time.monotonic() + self.ttl_s, T_sol)  # les échecs ne sont pas mis en cache
+        return T_sol
+
+    async def temperature_sol(self, maille):
+        """
+        Température au sol (K) d'une maille : cache, requête déjà en cours, ou nouvelle requête.
+
+        Returns:
+            float | None: Température, ou None si OpenWeather n'a pas répondu correctement.
+        """
+        maille = (int(maille[0]), int(maille[1]))
+        entree = self._cache.get(maille)
+        if entree is not None and entree[0] > time.monotonic():
+            return entree[1]
+        if not self.api_key:
+            return None
+
+        if self._session is None:
+            self._ouvrir()
+
+        tache = self._en_cours.get(maille)
+        if tache is None:
+            tache = asyncio.ensure_future(self._requete(maille))
+            self._en_cours[maille] = tache
+            tache.add_done_callback(lambda _: self._en_cours.pop(maille, None))
+        return await tache
+
+    async def delta_isa(self, lat, lon):
+        """
+        ΔISA (K) de chaque position, une requête au plus par maille distincte.
+
+        Args:
+            lat (array-like): Latitudes (°).
+            lon (array-like): Longitudes (°).
+
+        Returns:
+            np.ndarray: ΔISA par position (NaN si la température de la maille n'est pas disponible).
+        """
+        mailles = self.mailles(lat, lon)
+        uniques, inverse = np.unique(mailles, axis=0, return_inverse=True)
+        temperatures = await asyncio.gather(*(self.temperature_sol(m) for m in uniques))
+        deltas = np.array([np.nan if t is None else t - T0_ISA for t in temperatures], dtype=np.float64)
+        return deltas[inverse.ravel()]
+
+    def delta_isa_lot(self, lat, lon):
+        """
+        Version bloquante de ``delta_isa`` (pour les scripts et Streamlit).
+
+        Chaque appel tourne dans sa propre boucle asyncio : la session HTTP et le sémaphore y sont créés puis
+        fermés, seul le cache est conservé d'un appel à l'autre. Les appels concurrents (threads Streamlit) sont
+        exécutés l'un après l'autre.
+        """
+        async def _lot():
+            self._ouvrir()
+            try:
+                return await self.delta_isa(lat, lon)
+            finally:
+                await self.fermer()
+
+        with self._verrou_lot:
+            return asyncio.run(_lot())
+
+
+_clients = {}
+_verrou_clients = threading.Lock()
+
+
+def client_delta_isa_defaut(api_key):
+    """
+    Retourne le client ΔISA partagé pour une clé donnée (un cache commun à toute l'application).
+
+    Args:
+        api_key (str): Clé OpenWeather.
+
+    Returns:
+        ClientDeltaIsa: Client partagé.
+    """
+    with _verrou_clients:
+        if api_key not in _clients:
+            _clients[api_key] = ClientDeltaIsa(api_key)
+        return _clients[api_key]
+
+
+def delta_isa_conditions(conditions, api_key):
+    """
+    ΔISA des conditions de vol ``(tag, alt, mach, angle, lat, lon)`` en un seul lot de requêtes.
+
+    Les conditions sans position (vol personnalisé) sont évaluées en (0, 0), comme auparavant ; un ΔISA
+    indisponible vaut 0.
+
+    Returns:
+        list[float]: ΔISA (K) de chaque condition.
+    """
+    if not conditions:
+        return []
+    lat = [c[4] or 0 for c in conditions]
+    lon = [c[5] or 0 for c in conditions]
+    deltas = client_delta_isa_defaut(api_key).delta_isa_lot(lat, lon)
+    return np.nan_to_num(deltas).tolist()
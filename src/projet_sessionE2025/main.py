@@ -1,14 +1,20 @@
 import os
+import sqlite3
 import pandas as pd
-import asyncio
 import matplotlib.pyplot as plt
 import streamlit as st
 
-from projet_sessionE2025.airfoil.Airfoil import Airfoil
+from projet_sessionE2025.airfoil.Airfoil import Airfoil, FORMES_GIVRE
 from projet_sessionE2025.BaseDonnees.gestion_base import GestionBase
+from projet_sessionE2025.BaseDonnees.bibliotheque_profils import lire_dat, ecrire_dat
 from projet_sessionE2025.aero.aerodynamique import Aerodynamique
-from projet_sessionE2025.donnees_vol.ConditionVol import ConditionVol
-from projet_sessionE2025.donnees_vol.VolOpenSkyAsync import *
+from projet_sessionE2025.aero.cache_polaires import CachePolaires
+from projet_sessionE2025.aero.surface_polaires import SurfacePolaires
+from projet_sessionE2025.aero.etude_givrage import EtudeGivrage, grille_givrage
+from projet_sessionE2025.aero.etude_rugosite import EtudeRugosite, tracer_bandes
+from projet_sessionE2025.donnees_vol.ConditionVol import ConditionVol, conditions_vols
+from projet_sessionE2025.donnees_vol.ingestion_opensky import service_defaut
+from projet_sessionE2025.donnees_vol.meteo_isa import delta_isa_conditions
 from projet_sessionE2025.Interface.interaction_graphique import FenetreInteraction
 
 #streamlit run src/projet_sessionE2025/app.py
@@ -78,27 +84,16 @@ def comparer_polaires(profiles: dict[str, pd.DataFrame]):
     plt.show()
     return fig
 
-def choisir_vols(limit: int = 100, sample_n: int = 20) -> pd.DataFrame:
+def choisir_vols(limit: int = 100, sample_n: int = 20, corde: float = 1.0) -> pd.DataFrame:
     """
-    Récupère via fetch_vols(limit), construit un DataFrame,
-    filtre selon la troposphère/stratosphère, prélève un échantillon aléatoire,
+    Interroge l'index des vols du service d'ingestion (service_defaut, sans requête réseau) pour filtrer
+    selon la troposphère/stratosphère, prélève un échantillon aléatoire, calcule Mach, Reynolds et
+    pression dynamique de l'échantillon en une passe (conditions_vols),
     et répète jusqu'à ce que l'utilisateur valide la liste.
     """
     while True:
-        # 1) fetch et DataFrame
-        vols = asyncio.run(fetch_vols(limit=limit))
-        rows = []
-        for v in vols:
-            rows.append({
-                "icao24":          v.icao24,
-                "callsign":        (v.callsign or "").strip(),
-                "origin_country":  v.origin_country,
-                "altitude_m":      v.geo_altitude or 0.0,
-                "vitesse_m_s":     v.velocity or 0.0,
-                "latitude":        v.latitude,
-                "longitude":       v.longitude
-            })
-        df = pd.DataFrame(rows)
+        # 1) index des vols du dernier instantané
+        index = service_defaut().index()
 
         # # 2) choix du filtre — entrée robuste
         # while True:
@@ -115,11 +110,11 @@ def choisir_vols(limit: int = 100, sample_n: int = 20) -> pd.DataFrame:
                                                 ["1", "2", "3"])
 
         if choix == "1":
-            df_filt = df[df["altitude_m"] < 11000]
+            df_filt = index.rechercher(limite=limit, altitude_max=11000)
         elif choix == "2":
-            df_filt = df[df["altitude_m"] >= 11000]
+            df_filt = index.rechercher(limite=limit, altitude_min=11000)
         else:
-            df_filt = df
+            df_filt = index.rechercher(limite=limit)
 
         if df_filt.empty:
             print("Aucun vol ne correspond à ce filtre, on recommence.")
@@ -127,13 +122,13 @@ def choisir_vols(limit: int = 100, sample_n: int = 20) -> pd.DataFrame:
 
         # 3) prélèvement aléatoire
         n = min(sample_n, len(df_filt))
-        df_sample = df_filt.sample(n=n).reset_index(drop=True)
+        df_sample = conditions_vols(df_filt.sample(n=n), corde=corde).reset_index(drop=True)
 
         interface.msgbox(f"\nVoir la liste des vols dans la console.", titre="Indication")
 
         # 4) affichage
         print(df_sample[[
-            "icao24", "callsign", "origin_country", "altitude_m", "vitesse_m_s"
+            "icao24", "callsign", "origin_country", "altitude_m", "vitesse_m_s", "mach", "reynolds"
         ]].to_string(index=True))
 
         # 5) validation — entrée robuste
@@ -166,6 +161,9 @@ if __name__ == "__main__":
     API_KEY = ""
     #Initialisation de la BaseDonnees de données des profils
     gestion = GestionBase()
+    # Cache des polaires XFOIL (clé : géométrie + conditions de calcul)
+    cache_polaires = CachePolaires()
+    surface_polaires = SurfacePolaires(cache_polaires)
     # on réserve les variables pour stocker chacun des trois objets Aerodynamique
     aero_import = None
     aero_manuel = None
@@ -199,17 +197,9 @@ if __name__ == "__main__":
 
         chemin_csv = profil_obj_import.sauvegarder_coordonnees(f"{nom_profil}_coord_profil.csv")
 
-        # Construire le chemin .dat à partir du même nom
-        chemin_dat = chemin_csv.replace("_coord_profil.csv", "_coord_profil.dat")
-
-        # Ouvrir le CSV, lire x,y puis écrire le .dat
-        with open(chemin_csv, "r") as f_csv, open(chemin_dat, "w") as f_dat:
-            lignes = f_csv.readlines()
-            # la première ligne est l'en-tête "x,y", on l'ignore :
-            f_dat.write(f"{nom_profil}\n")
-            for ligne in lignes[1:]:
-                x_str, y_str = ligne.strip().split(",")
-                f_dat.write(f"{float(x_str):.6f} {float(y_str):.6f}\n")
+        # Construire le chemin .dat à partir du même nom et écrire les coordonnées
+        chemin_dat = ecrire_dat(chemin_csv.replace("_coord_profil.csv", "_coord_profil.dat"),
+                                profil_obj_import.coordonnees, nom_profil)
 
         tracer = interface.demander_choix("Voulez-vous afficher le profil ?", ["Oui", "Non"])
 
@@ -351,7 +341,7 @@ if __name__ == "__main__":
                 os.remove(output_file)
 
             #aero.telecharger_et_sauvegarder_txtrun_xfoil(f"{nom_profil}_coord_profil.dat", reynolds, mach, alpha_start=-15, alpha_end=15, alpha_step=1, output_file=output_file)
-            output_file = aero_manuel.run_xfoil(acces_fichier_dat, reynolds, mach, alpha_start=-10, alpha_end=10, alpha_step=0.25,output_file=output_file)
+            output_file = aero_manuel.run_xfoil(acces_fichier_dat, reynolds, mach, alpha_start=-10, alpha_end=10, alpha_step=0.25,output_file=output_file, cache=cache_polaires)
 
             chemin_txt = output_file
 
@@ -383,13 +373,10 @@ if __name__ == "__main__":
 
     elif generation == "BaseDonnees":
 
-        #Lecture des dossiers de la BaseDonnees pour lister leur contenu
-        dossier_database_import = "data/profils_importes"
-        dossier_database_genere = "data/profils_manuels"
-
+        #Lecture du catalogue de la BaseDonnees pour lister son contenu
         try:
-            contenu_import = os.listdir(dossier_database_import)
-            contenu_genere = os.listdir(dossier_database_genere)
+            contenu_import = gestion.lister_profils(types=["importe"])
+            contenu_genere = gestion.lister_profils(types=["manuel"])
 
             # Vérifier si les deux dossiers sont vides
             if not contenu_import and not contenu_genere:
@@ -398,10 +385,8 @@ if __name__ == "__main__":
             else:
                 base_vide = False
 
-        except FileNotFoundError:
-            print(f"Erreur : Le dossier n'existe pas.")
-        except PermissionError:
-            print(f"Erreur : Accès refusé au dossier.")
+        except sqlite3.Error as e:
+            print(f"Erreur : lecture du catalogue impossible ({e}).")
 
         if base_vide == True:
             pass
@@ -415,51 +400,11 @@ if __name__ == "__main__":
 
             nom_profil = interface.demander_texte("Rentrez le nom du profil NACA que vous souhaitez utiliser").strip().lower()
 
-            essais = gestion.chercher_nom(nom_profil)
-
-            for noms in essais:
-                chemin_fichier = f"data/profils_importes/{noms}_coord_profil.dat"
-                if os.path.exists(chemin_fichier):
-                    for nom_polaire in essais:
-                        if os.path.exists(f"data/polaires_importees/{nom_polaire}_coef_aero.txt"):
-                            polaire_profil_base = f"{nom_polaire}_coef_aero.txt"
-                    coord_profil_base = f"{noms}_coord_profil.dat"
-                else:
-                    chemin_fichier = f"data/profils_manuels/{noms}_coord_profil.dat"
-                    if os.path.exists(chemin_fichier):
-                        polaire_profil_base = f"{noms}_coef_aero.txt"
-                        coord_profil_base = f"{noms}_coord_profil.dat"
-                    else:
-                        pass
-
-            dossiers_possibles = [
-                "data/profils_importes",
-                "data/profils_manuels"
-            ]
-
-            # On va cherche le chemin qui mène au fichier : coord_profil_base
-            chemin_dat = None
-            for dossier in dossiers_possibles:
-                chemin_possible = os.path.join(dossier, coord_profil_base)
-                if os.path.exists(chemin_possible):
-                    chemin_dat = chemin_possible
-                    break
-
-            # On refait la même chose pour avoir les fichiers de performances aero
-            dossiers_possibles = [
-                "data/polaires_importees",
-                "data/polaires_xfoil",
-            ]
-            # On va cherche le chemin qui mène au fichier : polaire_profil_base
-            chemin_txt = None
-            for dossier in dossiers_possibles:
-                chemin_possible = os.path.join(dossier, polaire_profil_base)
-                if os.path.exists(chemin_possible):
-                    chemin_txt = chemin_possible
-                    break
+            # Recherche par l'index de la base (coordonnées et polaire) au lieu de tester chaque variante du nom
+            chemin_dat, chemin_txt = gestion.trouver_profil(nom_profil)
 
             if chemin_txt is None:
-                interface.msgbox(f"Le fichier '{polaire_profil_base}' n'a pas été trouvé dans la BaseDonnees de données, les performances n'ont peut être pas été générées.")
+                interface.msgbox(f"Aucune polaire de '{nom_profil}' n'a été trouvée dans la BaseDonnees de données, les performances n'ont peut être pas été générées.")
 
             aero_base = Aerodynamique(nom_profil)
 
@@ -496,8 +441,14 @@ if __name__ == "__main__":
             interface.msgbox(f"\nAucun fichier polaire importé trouvé : {chemin_txt}", titre="Erreur")
             #print(f"\nAucun fichier polaire importé trouvé : {chemin_txt}")
         else:
-            finesse, finesse_max = aero.calculer_finesse(chemin_txt)
-            interface.msgbox(f"\nLa finesse maximale de votre profil est : {finesse_max}", titre="Finesse maximale")
+            m = aero.metriques(chemin_txt)
+            interface.msgbox(f"\nLa finesse maximale de votre profil est : {m['finesse_max']:.2f} "
+                             f"(alpha = {m['alpha_finesse_max']:.1f}°)\n"
+                             f"CL max : {m['cl_max']:.3f} (décrochage à {m['alpha_decrochage']:.1f}°)\n"
+                             f"Pente de portance : {m['pente_portance_rad']:.2f} /rad, "
+                             f"alpha de portance nulle : {m['alpha_portance_nulle']:.2f}°\n"
+                             f"CL^1.5/CD max : {m['endurance_max']:.1f}, CD min : {m['cd_min']:.5f}",
+                             titre="Finesse maximale")
 
     elif calcul_finesse.lower() == "non":
         pass
@@ -518,8 +469,11 @@ if __name__ == "__main__":
 
     # 1) On collecte les conditions dans une liste
     conditions = []
+    if choix_mode in ("1", "2", "3"):
+        corde = interface.demander_parametres({"corde": "Longueur de corde (m)"})["corde"]
+
     if choix_mode in ("1", "3"):
-        df_vols = choisir_vols(limit=100, sample_n=20)
+        df_vols = choisir_vols(limit=100, sample_n=20, corde=corde)
         # l'index en tête de chaque ligne est déjà celui qu'on affichera
 
         selection = interface.demander_parametres({
@@ -531,9 +485,7 @@ if __name__ == "__main__":
         #sel = int(input("\nSélectionnez le vol (numéro) : ").strip())
         row = df_vols.loc[sel]
         alt =row["altitude_m"]
-        vit =row["vitesse_m_s"]
-        Tstd = 288.15 - 0.0065 * alt
-        mach = vit / ((1.4 * 287.05 * Tstd) ** 0.5)
+        mach = row["mach"]
         lat = row["latitude"]
         lon = row["longitude"]
         angle = 2  # ou input()
@@ -557,23 +509,20 @@ if __name__ == "__main__":
         # angle = float(input("Angle d’attaque perso (°) : "))
         conditions.append(("vol_perso", alt, mach, angle, None, None))
 
-    # Exécution XFoil pour chaque condition
-    for tag, alt, mach, angle, lat, lon in conditions:
-        cond = ConditionVol(altitude_m=alt, mach=mach, angle_deg=angle,
-                            delta_isa=calcul_delta_isa(lat or 0, lon or 0, alt, API_KEY) or 0)
+    # Préparation d'une tâche XFoil par condition
+    taches_xfoil = []
+    deltas_isa = delta_isa_conditions(conditions, API_KEY)  # une requête OpenWeather par maille au plus
+    for (tag, alt, mach, angle, lat, lon), delta_isa in zip(conditions, deltas_isa):
+        cond = ConditionVol(altitude_m=alt, mach=mach, angle_deg=angle, delta_isa=delta_isa)
         cond.afficher()
-        corde = 10
-
-        #reynolds = cond.calculer_reynolds(vitesse_m_s=mach * (1.4 * 287.05 * cond.temperature_K) ** 0.5, corde_m=corde, viscosite_kgms=cond.viscosite_kgms, densite_kgm3=cond.densite_kgm3)
 
-        reynolds = 100000
+        reynolds = cond.calculer_reynolds(vitesse_m_s=mach * cond.vitesse_son_ms, corde_m=corde,
+                                          viscosite_kgms=cond.viscosite_kgms, densite_kgm3=cond.densite_kgm3)
 
         print("Re = ", reynolds)
 
         #print("nom_profil pour conditions", nom_profil)
 
-        aero_cond = Aerodynamique(nom_profil)
-
         suffix = '_vol_reel' if tag == 'vol_reel' else '_vol_perso'
 
         # Définir le dossier de sortie selon le mode
@@ -595,22 +544,27 @@ if __name__ == "__main__":
         elif generation == "générer":
             acces_fichier_dat = os.path.join("data", "profils_manuels", f"{nom_profil}_coord_profil.dat")
         elif generation == "BaseDonnees":
-            candidats = [
-                os.path.join("data", "profils_importes", f"{nom_profil}_coord_profil.dat"),
-                os.path.join("data", "profils_manuels", f"{nom_profil}_coord_profil.dat")
-            ]
-            acces_fichier_dat = None
-            for chemin in candidats:
-                if os.path.exists(chemin):
-                    acces_fichier_dat = chemin
-                    break
+            # Recherche par l'index de la base, indépendante du dossier courant
+            acces_fichier_dat, _ = gestion.trouver_profil(nom_profil)
             if acces_fichier_dat is None:
                 raise FileNotFoundError(f"[ERREUR] Le fichier .dat du profil '{nom_profil}' est introuvable.")
 
-        aero_cond.run_xfoil(acces_fichier_dat, reynolds, mach, alpha_start=-15, alpha_end=15, alpha_step=1, output_file=txt_out)
+        taches_xfoil.append({
+            "dat_file": acces_fichier_dat,
+            "reynolds": reynolds,
+            "mach": mach,
+            "alpha_start": -15,
+            "alpha_end": 15,
+            "alpha_step": 1,
+            "output_file": txt_out
+        })
 
-        df_cond = aero_cond.lire_txt_et_convertir_dataframe(txt_out)
+    # Polaires interpolées depuis le cache quand c'est fiable, XFoil en parallèle pour les autres conditions
+    aero_cond = Aerodynamique(nom_profil)
+    dfs_cond = surface_polaires.run_xfoil_lot(aero_cond, taches_xfoil)
 
+    for (tag, *_), df_cond in zip(conditions, dfs_cond):
+        aero_cond = Aerodynamique(nom_profil)
         aero_cond.donnees = df_cond
         aero_cond.tracer_polaires_depuis_txt()
 
@@ -701,73 +655,19 @@ if __name__ == "__main__":
             #demander le nom
             nom_profil = interface.demander_texte("Rentrez le nom du profil de la BaseDonnees à givrer (ex : naca2412)").strip().lower()
 
-            essais = gestion.chercher_nom(nom_profil)
-
-            for noms in essais:
-                chemin_fichier = f"data/profils_importes/{noms}_coord_profil.dat"
-                if os.path.exists(chemin_fichier):
-                    for nom_polaire in essais:
-                        if os.path.exists(f"data/polaires_importees/{nom_polaire}_coef_aero.txt"):
-                            polaire_profil_base = f"{nom_polaire}_coef_aero.txt"
-                    coord_profil_base = f"{noms}_coord_profil.dat"
-                else:
-                    chemin_fichier = f"data/profils_manuels/{noms}_coord_profil.dat"
-                    if os.path.exists(chemin_fichier):
-                        polaire_profil_base = f"{noms}_coef_aero.txt"
-                        coord_profil_base = f"{noms}_coord_profil.dat"
-                    else:
-                        pass
-
-            # ON a normalement récupéré le nom du fichier pour les coord du profil et sa polaire
-
-            # print("coord_profil_base",coord_profil_base)
-            # print("polaire_profil_base",polaire_profil_base)
-            #Donne les bons chemins
-
-            dossiers_possibles = [
-                "data/profils_importes",
-                "data/profils_manuels"
-            ]
-
-            # On va cherche le chemin qui mène au fichier : coord_profil_base
-            chemin_dat = None
-            for dossier in dossiers_possibles:
-                chemin_possible = os.path.join(dossier, coord_profil_base)
-                #print(chemin_possible)
-                if os.path.exists(chemin_possible):
-                    chemin_dat = chemin_possible
-                    break
+            # Recherche par l'index de la base (coordonnées et polaire) au lieu de tester chaque variante du nom
+            chemin_dat, chemin_txt = gestion.trouver_profil(nom_profil)
 
             # Charger les coordonnées depuis le fichier .dat
-            coordonnees_profil = []
-            with open(chemin_dat, "r") as f_dat:
-                lignes = f_dat.readlines()[1:]  # Ignorer l'entête (nom du profil)
-                for ligne in lignes:
-                    parts = ligne.strip().split()
-                    if len(parts) == 2:
-                        x_str, y_str = parts
-                        coordonnees_profil.append((float(x_str), float(y_str)))
+            _, coordonnees_profil = lire_dat(chemin_dat)
 
             # Création de l'objet Airfoil avec les coordonnées récupérées
             profil_a_givrer = Airfoil(nom_profil, coordonnees_profil)
             nom_profil_givre = nom_profil
 
-            # On refait la même chose pour avoir les fichiers de performances aero
-            dossiers_possibles = [
-                "data/polaires_importees",
-                "data/polaires_xfoil",
-            ]
-            # On va cherche le chemin qui mène au fichier : polaire_profil_base
-            chemin_txt = None
-            for dossier in dossiers_possibles:
-                chemin_possible = os.path.join(dossier, polaire_profil_base)
-                if os.path.exists(chemin_possible):
-                    chemin_txt = chemin_possible
-                    break
-
             if chemin_txt is None:
                 interface.msgbox(
-                    f"Le fichier '{polaire_profil_base}' n'a pas été trouvé dans la BaseDonnees de données, les performances n'ont peut être pas été générées.")
+                    f"Aucune polaire de '{nom_profil}' n'a été trouvée dans la BaseDonnees de données, les performances n'ont peut être pas été générées.")
 
             aero_base = Aerodynamique(nom_profil)
             df_base = aero_base.lire_txt_et_convertir_dataframe(chemin_txt)
@@ -810,7 +710,7 @@ if __name__ == "__main__":
 
         #  Simulation XFoil sur profil givré
         aero_givre = Aerodynamique(nom_profil_givre + "-givre")
-        aero_givre.run_xfoil(dat_file=dat_givre, reynolds=reynolds_givre, mach=mach_givre, alpha_start=-5, alpha_end=12, alpha_step=1,output_file=txt_givre)
+        aero_givre.run_xfoil(dat_file=dat_givre, reynolds=reynolds_givre, mach=mach_givre, alpha_start=-5, alpha_end=12, alpha_step=1,output_file=txt_givre, cache=cache_polaires)
 
         # df_givre = aero_givre.lire_txt_et_convertir_dataframe(txt_givre)
         # aero_givre.donnees = df_givre
@@ -856,6 +756,57 @@ if __name__ == "__main__":
         elif affiche_polaire == "non":
             pass
 
+        while True:
+            etude_givre = interface.demander_choix(
+                "Voulez-vous lancer une étude paramétrique du givrage (épaisseurs, zones et formes) ?", ["Oui", "Non"]
+            ).strip().lower()
+            if etude_givre in ("oui", "non"):
+                break
+
+        if etude_givre == "oui":
+            def lire_liste(message, defaut):
+                texte = interface.demander_texte(message) or defaut
+                return [float(v) for v in texte.replace(" ", "").split(";") if v]
+
+            epaisseurs = lire_liste("Épaisseurs séparées par ';' (ex : 0.005;0.01;0.02)", "0.005;0.01;0.02")
+            debuts = lire_liste("Débuts de zone séparés par ';' (ex : 0;0.1;0.3)", "0;0.1;0.3")
+            fins = lire_liste("Fins de zone séparées par ';' (ex : 0.2;0.45)", "0.2;0.45")
+            grille = grille_givrage(epaisseurs, debuts, fins, FORMES_GIVRE)
+
+            etude = EtudeGivrage(nom_profil_givre, profil_a_givrer.coordonnees, reynolds_givre, mach_givre,
+                                 alpha_start=-5, alpha_end=15, alpha_step=0.5)
+            try:
+                resultats = etude.executer(grille, cache=cache_polaires)
+            except RuntimeError as e:
+                interface.msgbox(str(e), titre="Erreur")
+            else:
+                propre = resultats.attrs["propre"]
+                print(f"[OK] Profil propre : CL_max = {propre['cl_max']:.3f}, "
+                      f"alpha décrochage = {propre['alpha_decrochage']:.1f}°, CD croisière = {propre['cd_croisiere']:.5f}")
+                print(resultats.sort_values("delta_cl_max").to_string(index=False, float_format="%.4f"))
+
+        while True:
+            etude_rugosite = interface.demander_choix(
+                "Voulez-vous lancer une analyse Monte-Carlo de la rugosité de surface ?", ["Oui", "Non"]
+            ).strip().lower()
+            if etude_rugosite in ("oui", "non"):
+                break
+
+        if etude_rugosite == "oui":
+            n_realisations = int(interface.demander_texte("Nombre de réalisations (ex : 200)") or 200)
+            amplitude = float((interface.demander_texte("Amplitude du bruit (ex : 0.001)") or "0.001").replace(",", "."))
+            graine = int(interface.demander_texte("Graine du générateur (ex : 0)") or 0)
+
+            etude = EtudeRugosite(nom_profil_givre, profil_a_givrer.coordonnees, reynolds_givre, mach_givre,
+                                  amplitude=amplitude, graine=graine)
+            bandes = etude.executer(n_realisations)
+            if bandes.attrs["n_polaires"] == 0:
+                interface.msgbox("Aucune polaire obtenue pour les profils rugueux.", titre="Erreur")
+            else:
+                print(bandes.filter(regex="^CL_|^CD_").to_string(float_format="%.5f"))
+                tracer_bandes(bandes)
+                plt.show()
+
     else:
         print("Fin du programme, sans simulation de givrage.")
 